@@ -0,0 +1,96 @@
+"""
+Measures log sanitization with template mining against processing every
+line with `process_batch`.
+
+The log mixes a few dozen templates with names, emails, IPs and IDs as
+parameters. Uses `en_core_web_sm` when it is installed, and a blank
+pipeline with an entity ruler otherwise (which makes NER unrealistically
+cheap, so the speed-up is understated). Run it with:
+
+    python examples/benchmark_logs.py [LINES]
+"""
+import random
+import sys
+import time
+
+import spacy
+
+from l8e_beam import PiiAction
+from l8e_beam.logs import LogSanitizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.recognizers import REGEX_RECOGNIZERS
+
+NAMES = ["Jane Doe", "John Smith", "Maria Garcia", "Wei Chen", "Olga Petrova"]
+TEMPLATES = [
+    "{ts} INFO  auth: user {name} logged in from {ip}",
+    "{ts} INFO  auth: session {id} expired",
+    "{ts} WARN  mail: bounce for {email} code={code}",
+    "{ts} INFO  orders: order {id} placed by {name} total={amount}",
+    "{ts} DEBUG cache: hit ratio {amount} over {code} keys",
+    "{ts} ERROR db: query timeout after {code} ms on shard {code}",
+    "{ts} INFO  http: GET /api/v1/items/{id} 200 {code}ms",
+    "{ts} INFO  notify: sms sent to +1 555 {code} 4567 for {name}",
+]
+
+
+def make_log(count: int):
+    rng = random.Random(5)
+    return [
+        rng.choice(TEMPLATES).format(
+            ts=f"2024-05-01T12:{i % 60:02d}:{i % 59:02d}Z",
+            name=rng.choice(NAMES),
+            ip=f"10.0.{rng.randrange(256)}.{rng.randrange(256)}",
+            id=f"{rng.randrange(16 ** 8):08x}",
+            email=f"user{rng.randrange(1000)}@example.com",
+            code=rng.randrange(100, 1000),
+            amount=f"{rng.random() * 100:.2f}",
+        ) + "\n"
+        for i in range(count)
+    ]
+
+
+def load_nlp():
+    try:
+        return spacy.load("en_core_web_sm"), "en_core_web_sm"
+    except OSError:
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": first.lower()}, {"LOWER": last.lower()}]}
+            for first, last in (name.split() for name in NAMES)
+        ])
+        return nlp, "blank pipeline with entity ruler"
+
+
+def main(lines: int = 20_000):
+    nlp, model = load_nlp()
+    processor = PiiProcessor(
+        regex_recognizers=REGEX_RECOGNIZERS,
+        spacy_recognizers=[PersonRecognizer()],
+        nlp=nlp
+    )
+    log = make_log(lines)
+    print(f"lines: {lines}, model: {model}")
+
+    started = time.perf_counter()
+    expected = processor.process_batch(log, PiiAction.REDACT)
+    before = time.perf_counter() - started
+    ner_before = processor.stats.ner_calls
+
+    processor.stats.ner_calls = 0
+    sanitizer = LogSanitizer(processor)
+    started = time.perf_counter()
+    found = list(sanitizer.sanitize_lines(log))
+    after = time.perf_counter() - started
+
+    differing = sum(1 for a, b in zip(expected, found) if a != b)
+    print(f"process_batch: {lines / before:>10,.0f} lines/s  NER calls: {ner_before}")
+    print(
+        f"LogSanitizer:  {lines / after:>10,.0f} lines/s  NER calls: {processor.stats.ner_calls}  "
+        f"({before / after:.1f}x, {len(sanitizer)} templates, {sanitizer.full_scans} full scans, "
+        f"{differing} lines differ)"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
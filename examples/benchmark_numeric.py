@@ -0,0 +1,94 @@
+"""
+Measures the regex stage on number-heavy text (logs, exports, telemetry).
+
+Compares running the card and phone recognizers one by one with their own
+`analyze` against the batched numeric path of `PiiProcessor`, and checks
+that both produce the same findings. Run it with:
+
+    python examples/benchmark_numeric.py [LINES]
+"""
+import random
+import re
+import sys
+import time
+
+import spacy
+
+from l8e_beam.recognizers.base import RegexRecognizer
+from l8e_beam.recognizers.credit_card import CreditCardRecognizer
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.phone import PhoneRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+
+class UnguardedPhoneRecognizer(PhoneRecognizer):
+    """The phone recognizer with its original pattern, as the baseline."""
+    regex = re.compile(r"(\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+
+
+def make_logs(count: int):
+    """Log lines full of timestamps, IDs and amounts, each with a card and a phone number."""
+    rng = random.Random(1)
+    return [
+        f"2024-03-{i % 28 + 1:02d} 12:{i % 60:02d}:01 txn={rng.randrange(10 ** 15, 10 ** 16)} "
+        f"amt={rng.random() * 999:.2f} card 4111 1111 1111 1111 id={rng.randrange(10 ** 12, 10 ** 13)} "
+        f"tel +1 (555) 123-{i % 10000:04d} qty {i % 97} {i % 13}.{i % 7} lat 52.{rng.randrange(10 ** 6)}"
+        for i in range(count)
+    ]
+
+
+def make_telemetry(count: int):
+    """Rows of metrics with short numbers only, and a phone number in one row in a hundred."""
+    rng = random.Random(2)
+    return [
+        f"{i},{rng.randrange(10 ** 6)},{rng.random():.4f},2024-01-{i % 28 + 1:02d} 10:{i % 60:02d}:{i % 59:02d},"
+        f"{rng.randrange(100)}.{rng.randrange(100)},{rng.randrange(10 ** 8)},-{rng.random() * 90:.5f},"
+        + ("+1 555 123 4567" if i % 100 == 0 else f"{rng.randrange(1000)} {rng.randrange(1000)}")
+        for i in range(count)
+    ]
+
+
+def baseline(recognizers, texts):
+    """The previous regex stage: every recognizer scans every text on its own."""
+    all_findings = []
+    for text in texts:
+        findings = []
+        for recognizer in recognizers:
+            RegexRecognizer.analyze(recognizer, text, findings)
+        all_findings.append(findings)
+    return all_findings
+
+
+def best_of(runs: int, run):
+    """Returns the fastest of several runs, and the result of the last one."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def describe(all_findings):
+    return [[(f.text, f.pii_type, f.start, f.end) for f in findings] for findings in all_findings]
+
+
+def main(lines: int = 20_000):
+    recognizers = [EmailRecognizer(), CreditCardRecognizer(), PhoneRecognizer()]
+    processor = PiiProcessor(regex_recognizers=recognizers, spacy_recognizers=[], nlp=spacy.blank("en"))
+    unguarded = [EmailRecognizer(), CreditCardRecognizer(), UnguardedPhoneRecognizer()]
+    print(f"lines: {lines}")
+    for name, make in (("logs", make_logs), ("telemetry", make_telemetry)):
+        texts = make(lines)
+        before, expected = best_of(3, lambda: baseline(unguarded, texts))
+        after, found = best_of(3, lambda: processor.get_findings_batch(texts))
+
+        assert describe(found) == describe(expected), "findings differ"
+        print(
+            f"{name:<10} findings: {sum(map(len, found)):>6}  one by one: {before:.3f} s  "
+            f"numeric path: {after:.3f} s  ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,68 @@
+"""
+Measures the traversal cost of `process_recursive` on a large payload that is
+mostly free of PII (like agent tool results or API responses).
+
+The processor runs the regex recognizers only, so the numbers reflect the
+walk over the structure rather than model inference. Run it with:
+
+    python examples/benchmark_process_recursive.py [RECORDS]
+"""
+import sys
+import time
+import tracemalloc
+
+import spacy
+
+from l8e_beam import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.recognizers import REGEX_RECOGNIZERS
+
+
+def make_payload(records: int) -> dict:
+    """Builds a nested payload where one record in a hundred contains an email."""
+    return {
+        "status": "ok",
+        "items": [
+            {
+                "id": f"item-{i}",
+                "tags": ["alpha", "beta", "gamma"],
+                "metrics": {"count": i, "ratio": i / 7, "labels": ["x", "y"]},
+                "owner": f"user{i}@example.com" if i % 100 == 0 else f"team-{i % 13}",
+            }
+            for i in range(records)
+        ],
+    }
+
+
+def measure(processor: PiiProcessor, payload: dict):
+    """Returns the time, the peak allocations and the allocations kept by the result."""
+    started = time.perf_counter()
+    processor.process_recursive(payload, PiiAction.REDACT)
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = processor.process_recursive(payload, PiiAction.REDACT)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, peak, retained
+
+
+def main(records: int = 50_000):
+    payload = make_payload(records)
+    configurations = {
+        "regex recognizers": REGEX_RECOGNIZERS,
+        "traversal only": [],
+    }
+    print(f"records: {records}")
+    for name, recognizers in configurations.items():
+        processor = PiiProcessor(regex_recognizers=recognizers, spacy_recognizers=[], nlp=spacy.blank("en"))
+        seconds, peak, retained = measure(processor, payload)
+        print(
+            f"{name:<18} time: {seconds:.3f} s  peak: {peak / 1024 / 1024:.1f} MB  "
+            f"retained: {retained / 1024 / 1024:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
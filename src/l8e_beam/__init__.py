@@ -45,19 +45,48 @@ redacted_report = process_report(incident_report)
 
 # Output: {'details': 'Client [REDACTED PERSON] reported an outage in [REDACTED GPE].'}
 """
-from l8e_beam.decorator import redact_pii
+import importlib
+
 from l8e_beam.enums import ModelType, PiiAction
-from l8e_beam.api import sanitize_pii
-from l8e_beam.recognizers.base import Finding, RegexRecognizer, SpacyRecognizer
 from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
 
+# The remaining exports import spaCy, so they are loaded on first access.
+# This keeps lightweight modules such as `l8e_beam.client` cheap to import.
+_LAZY_EXPORTS = {
+    "redact_pii": "l8e_beam.decorator",
+    "sanitize_pii": "l8e_beam.api",
+    "register_model": "l8e_beam.redactor",
+    "MODEL_REGISTRY": "l8e_beam.redactor",
+    "Finding": "l8e_beam.recognizers.base",
+    "RegexRecognizer": "l8e_beam.recognizers.base",
+    "SpacyRecognizer": "l8e_beam.recognizers.base",
+    "DictionaryRecognizer": "l8e_beam.recognizers.base",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'l8e_beam' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
+
 __all__ = [
 "redact_pii",
 "sanitize_pii",
+"register_model",
+"MODEL_REGISTRY",
 "ModelType",
 "PiiAction",
 "DEFAULT_RECOGNIZERS",
 "RegexRecognizer",
 "SpacyRecognizer",
+"DictionaryRecognizer",
 "Finding"
 ]
@@ -1,19 +1,37 @@
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional, Union
 import spacy
+from spacy.tokens import Doc, DocBin
 
 from l8e_beam.enums import PiiAction, ModelType
 from l8e_beam.recognizers.base import Recognizer, RegexRecognizer, SpacyRecognizer
-from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.pii_processor import PiiProcessor, NerPrefilter, ModelRecycler, PathFilter
 from l8e_beam.recognizers.recognizers import REGEX_RECOGNIZERS, SPACY_RECOGNIZERS
 from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
-from l8e_beam.redactor import _get_model
+from l8e_beam.redactor import _get_model, MODEL_REGISTRY
+from l8e_beam.cascade import CascadePiiProcessor
+from l8e_beam.cache import FindingsCache, SegmentCache
+from l8e_beam.batching import DynamicBatcher
+from l8e_beam.client import SidecarClient
+from l8e_beam.deadline import Deadline
+from l8e_beam.vault import TokenVault
 
 def sanitize_pii(
     data: Any,
     action: PiiAction = PiiAction.REDACT,
-    model: ModelType = ModelType.SM,
+    model: Union[ModelType, str] = ModelType.SM,
     custom_recognizers: Optional[List[Recognizer]] = None,
-    disabled_recognizers: Optional[List[DEFAULT_RECOGNIZERS]] = None
+    disabled_recognizers: Optional[List[DEFAULT_RECOGNIZERS]] = None,
+    ner_prefilter: bool = True,
+    escalate_to: Optional[ModelType] = None,
+    cache: Optional[FindingsCache] = None,
+    recycler: Optional[ModelRecycler] = None,
+    batcher: Optional[DynamicBatcher] = None,
+    client: Optional[SidecarClient] = None,
+    deadline: Optional[Deadline] = None,
+    paths: Optional[PathFilter] = None,
+    vault: Optional[TokenVault] = None,
+    segment_cache: Optional[SegmentCache] = None,
+    doc_labels: Optional[Iterable[str]] = None
 ) -> Any:
     """
     A direct API for processing data with fine-grained control over recognizers.
@@ -23,11 +41,56 @@ def sanitize_pii(
     non-decorator workflows where you need full control.
 
     Args:
-        data: The data to process (e.g., a string, dictionary, list).
-        action: The PII action to perform (`REDACT`, `ANONYMIZE`, or `IGNORE`).
-        model: The spaCy model to use for NER (`SM` or `TRF`).
+        data: The data to process (e.g., a string, dictionary, list). A
+            spaCy `Doc` or `DocBin` parsed by an earlier pipeline stage is
+            also accepted: if `doc_labels` vouches for its pipeline (see
+            `PiiProcessor.accepts_doc`), its entities are used instead of
+            running NER again. Either way the sanitized text (or, for a `DocBin`,
+            the list of texts) is returned. Not supported with `client` or
+            `batcher`.
+        action: The PII action to perform (`REDACT`, `ANONYMIZE`, `TOKENIZE`
+            or `IGNORE`).
+        model: The spaCy model to use for NER (`SM` or `TRF`), or the name of
+            a model registered with `register_model`.
         custom_recognizers: A list of user-defined recognizer instances to add.
         disabled_recognizers: A list of default recognizers to disable.
+        ner_prefilter: If `True` (default), strings that cannot contain named
+            entities (numbers, UUIDs, timestamps, single lowercase tokens) skip
+            the spaCy model. Set to `False` to run NER on every string.
+        escalate_to: If set (e.g., `ModelType.TRF`), enables cascade mode:
+            every text is run through `model` first, and only the sentences
+            it flags as entity-bearing are re-run through this model.
+        cache: An optional persistent `FindingsCache`. Strings whose findings
+            are already cached (for the same model and recognizer set) are
+            not scanned again.
+        recycler: An optional `ModelRecycler`, shared between calls, that
+            replaces the registry's model with a pristine copy after a number
+            of documents or bytes. Keeps memory flat in long-running processes.
+        batcher: An optional `DynamicBatcher` shared by concurrent callers.
+            The strings are then scanned in batches together with those of
+            other callers, using the batcher's processor; the model and
+            recognizer arguments are ignored.
+        client: An optional `SidecarClient`. The data is then sanitized by a
+            running `l8e-beam serve` sidecar, which shares its loaded models
+            with all processes on the host. The data must be JSON-compatible,
+            and custom recognizers, `cache`, `segment_cache`, `recycler` and
+            `vault` are not supported.
+        deadline: An optional `Deadline` that bounds the time spent on NER.
+            Regex recognizers always run; strings whose NER does not fit into
+            the budget fall back to the deadline's policy, and the number of
+            fallbacks is recorded on the deadline. Not supported together
+            with `client` or `batcher`.
+        paths: An optional `PathFilter` with include/exclude patterns such as
+            `messages.*.content`; only the selected strings are processed.
+        vault: The `TokenVault` of the session, required for (and only
+            accepted with) `PiiAction.TOKENIZE`. Use `vault.restore` to put the original
+            values back into a response. Not supported with `client`.
+        segment_cache: An optional in-memory `SegmentCache`, shared between
+            calls. Texts are split into sentences (or paragraphs), and only
+            the segments not seen before are scanned; useful for emails and
+            tickets that share signatures, disclaimers and templates.
+        doc_labels: The entity labels the pipeline that parsed `Doc` inputs
+            can assign; see `PiiProcessor`. Without it, `Doc`s are re-parsed.
 
     Returns:
         The processed data with PII handled according to the specified action.
@@ -67,6 +130,81 @@ def sanitize_pii(
         # 'Request failed for user_id: [REDACTED UUID]'
         ```
     """
+    if deadline is not None and (client is not None or batcher is not None):
+        raise ValueError("deadline cannot be used with a sidecar client or a batcher.")
+
+    if isinstance(data, (Doc, DocBin)) and (client is not None or batcher is not None):
+        raise ValueError("spaCy Doc and DocBin inputs cannot be used with a sidecar client or a batcher.")
+
+    if action == PiiAction.TOKENIZE and vault is None:
+        raise ValueError("PiiAction.TOKENIZE requires a TokenVault passed as `vault`.")
+    if action != PiiAction.TOKENIZE and vault is not None:
+        raise ValueError("`vault` can only be used with PiiAction.TOKENIZE.")
+
+    if client is not None:
+        if (custom_recognizers or cache is not None or recycler is not None or vault is not None
+                or segment_cache is not None):
+            raise ValueError(
+                "custom_recognizers, cache, segment_cache, recycler and vault cannot be used "
+                "with a sidecar client."
+            )
+        return client.sanitize(
+            data,
+            action=action,
+            model=model,
+            disabled_recognizers=disabled_recognizers,
+            ner_prefilter=ner_prefilter,
+            escalate_to=escalate_to,
+            paths=paths
+        )
+
+    if batcher is not None:
+        return batcher.process_recursive(data, action=action, surrogates=vault, paths=paths)
+
+    processor = build_processor(
+        model=model,
+        custom_recognizers=custom_recognizers,
+        disabled_recognizers=disabled_recognizers,
+        ner_prefilter=ner_prefilter,
+        escalate_to=escalate_to,
+        cache=cache,
+        recycler=recycler,
+        segment_cache=segment_cache,
+        doc_labels=doc_labels
+    )
+
+    if isinstance(data, Doc):
+        return processor.process(data, action=action, surrogates=vault, deadline=deadline)
+    if isinstance(data, DocBin):
+        return processor.process_batch(data, action=action, surrogates=vault, deadline=deadline)
+
+    return processor.process_recursive(
+        data, action=action, surrogates=vault, deadline=deadline, paths=paths
+    )
+
+
+def build_processor(
+    model: Union[ModelType, str] = ModelType.SM,
+    custom_recognizers: Optional[List[Recognizer]] = None,
+    disabled_recognizers: Optional[List[DEFAULT_RECOGNIZERS]] = None,
+    ner_prefilter: bool = True,
+    escalate_to: Optional[ModelType] = None,
+    cache: Optional[FindingsCache] = None,
+    recycler: Optional[ModelRecycler] = None,
+    segment_cache: Optional[SegmentCache] = None,
+    doc_labels: Optional[Iterable[str]] = None
+) -> PiiProcessor:
+    """
+    Builds a `PiiProcessor` for a recognizer policy.
+
+    This is the policy-resolution step of `sanitize_pii`, exposed for
+    components that keep a processor around between calls (conversation,
+    streaming and batch sanitizers). The arguments have the same meaning as
+    in `sanitize_pii`.
+
+    Returns:
+        A `PiiProcessor` (or `CascadePiiProcessor` if `escalate_to` is set).
+    """
     nlp = _get_model(model)
     custom_recognizers = custom_recognizers or []
     disabled_names = {d.value for d in (disabled_recognizers or [])}
@@ -79,18 +217,40 @@ def sanitize_pii(
         r for r in SPACY_RECOGNIZERS if r.name not in disabled_names
     ]
 
-    # Combine the enabled default recognizers with any custom ones
+    # Combine the enabled default recognizers with any custom ones.
+    # Every text-based recognizer (regex, dictionary, ...) runs on the raw string.
     all_regex = enabled_regex + [
-        r for r in custom_recognizers if isinstance(r, RegexRecognizer)
+        r for r in custom_recognizers if not isinstance(r, SpacyRecognizer)
     ]
     all_spacy = enabled_spacy + [
         r for r in custom_recognizers if isinstance(r, SpacyRecognizer)
     ]
 
-    processor = PiiProcessor(
-        regex_recognizers=all_regex,
-        spacy_recognizers=all_spacy,
-        nlp=nlp
-    )
+    prefilter = NerPrefilter() if ner_prefilter else None
+    if escalate_to is not None:
+        processor = CascadePiiProcessor(
+            regex_recognizers=all_regex,
+            spacy_recognizers=all_spacy,
+            nlp=nlp,
+            escalation_nlp=_get_model(escalate_to),
+            ner_prefilter=prefilter,
+            cache=cache,
+            recycler=recycler,
+            segment_cache=segment_cache,
+            doc_labels=doc_labels
+        )
+    else:
+        processor = PiiProcessor(
+            regex_recognizers=all_regex,
+            spacy_recognizers=all_spacy,
+            nlp=nlp,
+            ner_prefilter=prefilter,
+            cache=cache,
+            recycler=recycler,
+            segment_cache=segment_cache,
+            doc_labels=doc_labels
+        )
 
-    return processor.process_recursive(data, action=action)
+    # Recycled models replace the shared registry copies
+    processor.on_model_recycled = MODEL_REGISTRY.replace
+    return processor
@@ -0,0 +1,237 @@
+# src/l8e_beam/batching.py
+
+"""
+Dynamic micro-batching of concurrent sanitization requests.
+
+In threaded and async servers, many small requests arrive at the same time
+and each one would call `nlp(text)` on its own, so the model never sees a
+batch. This matters most for transformer models, whose throughput grows
+with the batch size.
+
+`DynamicBatcher` sits in front of a `PiiProcessor`. Callers submit texts
+and get futures back; a single worker thread drains the queue and runs
+everything it collected through `get_findings_batch` (and therefore
+`nlp.pipe`). A batch is closed when it reaches `max_batch_size` texts or
+when its first text has waited `max_wait_ms`, whichever comes first:
+
+- a larger `max_wait_ms` gives bigger batches and higher throughput, at
+  the cost of up to that much added latency per request;
+- `max_wait_ms=0` only batches what is already queued, so an idle server
+  answers immediately while a busy one still batches.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, MutableMapping, Optional, Tuple
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PathFilter, PiiProcessor
+
+# Tells the worker thread to exit.
+_STOP = object()
+
+
+class DynamicBatcher:
+    """
+    Batches texts from concurrent callers into shared `nlp.pipe` calls.
+
+    The batcher is thread-safe and can be shared by any number of threads
+    and event loops. The worker thread is started on first use; call
+    `close` (or use the batcher as a context manager) to stop it.
+
+    Attributes:
+        processor (PiiProcessor): The processor that scans the batches.
+        max_batch_size (int): The maximum number of texts per batch.
+        max_wait_ms (float): How long the first text of a batch may wait for
+            more texts to arrive.
+        batches (int): Number of batches run so far.
+        texts (int): Number of texts scanned so far.
+    """
+    def __init__(self, processor: PiiProcessor, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        """
+        Initializes the batcher.
+
+        Args:
+            processor: The processor that scans the batches.
+            max_batch_size: The maximum number of texts per batch.
+            max_wait_ms: The maximum time in milliseconds a text waits for a
+                batch to fill up.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.processor = processor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.texts = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def mean_batch_size(self) -> float:
+        """The average number of texts per batch."""
+        return self.texts / self.batches if self.batches else 0.0
+
+    def _enqueue(self, item: Tuple[str, Future]):
+        """Enqueues an item, starting the worker if needed."""
+        # Under the lock, so that `close` cannot enqueue `_STOP` in between
+        # and leave the item's future unresolved; the queue never blocks.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DynamicBatcher is closed.")
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="l8e-beam-batcher", daemon=True
+                )
+                self._worker.start()
+            self._queue.put(item)
+
+    def _collect(self, first) -> Tuple[List[Tuple[str, Future]], bool]:
+        """Collects a batch that starts with `first`; returns it and whether to stop."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stop = self._collect(item)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[str, Future]]):
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        # Identical texts in one batch are scanned once
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            findings_lists = self.processor.get_findings_batch(unique, batch_size=self.max_batch_size)
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.texts += len(unique)
+        by_text = dict(zip(unique, findings_lists))
+        seen = set()
+        for text, future in batch:
+            findings = by_text[text]
+            # Findings are sorted in place by `apply_findings`; give duplicates a copy
+            future.set_result(list(findings) if text in seen else findings)
+            seen.add(text)
+
+    def submit(self, text: str) -> "Future[List]":
+        """
+        Enqueues a text for scanning.
+
+        Args:
+            text: The text to scan.
+
+        Returns:
+            A `concurrent.futures.Future` resolving to the text's findings.
+        """
+        future: Future = Future()
+        self._enqueue((text, future))
+        return future
+
+    def get_findings_many(self, texts: List[str]) -> List[List]:
+        """Scans several texts (possibly across batches) and waits for all findings."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def get_findings(self, text: str) -> List:
+        """Scans a single text and waits for its findings."""
+        return self.submit(text).result()
+
+    def process(
+        self,
+        text: str,
+        action: PiiAction = PiiAction.REDACT,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None
+    ) -> str:
+        """Sanitizes a single string; see `PiiProcessor.process`."""
+        return self.processor.apply_findings(text, self.get_findings(text), action, surrogates=surrogates)
+
+    def process_recursive(
+        self,
+        data: Any,
+        action: PiiAction = PiiAction.REDACT,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+        paths: Optional[PathFilter] = None
+    ) -> Any:
+        """
+        Sanitizes all strings in a data structure; see `PiiProcessor.process_recursive`.
+
+        All strings of the structure are enqueued together, so they share
+        batches with each other and with other callers.
+        """
+        return self.processor.process_recursive_batch(
+            data, action, surrogates=surrogates, findings_batch=self.get_findings_many, paths=paths
+        )
+
+    async def aget_findings_many(self, texts: List[str]) -> List[List]:
+        """Async version of `get_findings_many`; does not block the event loop."""
+        futures = [asyncio.wrap_future(self.submit(text)) for text in texts]
+        return list(await asyncio.gather(*futures))
+
+    async def aprocess(
+        self,
+        text: str,
+        action: PiiAction = PiiAction.REDACT,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None
+    ) -> str:
+        """Async version of `process`."""
+        findings = await asyncio.wrap_future(self.submit(text))
+        return self.processor.apply_findings(text, findings, action, surrogates=surrogates)
+
+    async def aprocess_recursive(
+        self,
+        data: Any,
+        action: PiiAction = PiiAction.REDACT,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+        paths: Optional[PathFilter] = None
+    ) -> Any:
+        """Async version of `process_recursive`."""
+        strings: List[str] = []
+        self.processor._collect_strings(data, strings, paths)
+        findings_lists = await self.aget_findings_many(strings)
+        return self.processor.process_recursive_batch(
+            data, action, surrogates=surrogates, findings_batch=lambda _: findings_lists, paths=paths
+        )
+
+    def close(self):
+        """Stops the worker thread after the queued texts have been scanned."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+            if worker is not None:
+                self._queue.put(_STOP)
+        if worker is not None:
+            worker.join()
+
+    def __enter__(self) -> "DynamicBatcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,542 @@
+# src/l8e_beam/cache.py
+
+"""
+A persistent, content-addressed cache of PII findings.
+
+Batch jobs that re-sanitize overlapping corpora pay for the same NER work
+on every run and in every worker process. `FindingsCache` stores the
+findings of each scanned string in an SQLite database, keyed by a hash of
+the text plus a fingerprint of the processor that produced them. A re-run
+over mostly unchanged data is then dominated by hash lookups.
+
+- **Multi-process safe**: the database runs in WAL mode with a busy
+  timeout, so many processes can read and write concurrently. Each thread
+  (and each forked process) gets its own connection.
+- **Size-bounded**: when the stored payload exceeds `max_bytes`, the least
+  recently used entries are evicted.
+- **Self-invalidating**: the fingerprint covers the spaCy model name and
+  version, every recognizer (class, name, pattern, label, terms) and the
+  NER prefilter settings. Changing any of them changes the key, so stale
+  findings are never returned; they age out through eviction or can be
+  dropped with `purge`.
+
+Only findings are cached, never sanitized output, so the cache works for
+every `PiiAction`.
+
+`SegmentCache` is an in-memory companion for texts that share most of
+their content (signatures, disclaimers, templates): it caches findings per
+sentence or paragraph instead of per string.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from l8e_beam.recognizers.base import Finding
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_accessed ON findings (accessed);
+CREATE INDEX IF NOT EXISTS findings_fingerprint ON findings (fingerprint);
+"""
+
+
+def _describe_nlp(nlp) -> dict:
+    meta = getattr(nlp, "meta", None)
+    if not isinstance(meta, dict):
+        return {"nlp": type(nlp).__qualname__}
+    return {
+        "lang": meta.get("lang"),
+        "name": meta.get("name"),
+        "version": meta.get("version"),
+        "pipeline": list(getattr(nlp, "pipe_names", [])),
+    }
+
+
+def _describe_recognizer(recognizer) -> dict:
+    description = {
+        "class": f"{type(recognizer).__module__}.{type(recognizer).__qualname__}",
+        "name": recognizer.name,
+    }
+    regex = getattr(recognizer, "regex", None)
+    if regex is not None:
+        description["regex"] = [regex.pattern, regex.flags]
+    label = getattr(recognizer, "label", None)
+    if isinstance(label, str):
+        description["label"] = label
+    terms = getattr(recognizer, "terms", None)
+    if terms is not None and not isinstance(terms, str):
+        digest = hashlib.sha256()
+        for term in terms:
+            digest.update(term.encode("utf-8") + b"\0")
+        description["terms"] = digest.hexdigest()
+        description["case_sensitive"] = getattr(recognizer, "case_sensitive", None)
+        description["whole_words"] = getattr(recognizer, "whole_words", None)
+    return description
+
+
+def processor_fingerprint(processor) -> str:
+    """
+    Computes a stable fingerprint of everything that determines a
+    processor's findings.
+
+    Args:
+        processor: A `PiiProcessor` (or subclass).
+
+    Returns:
+        A hex digest.
+    """
+    prefilter = processor.ner_prefilter
+    description = {
+        "processor": type(processor).__qualname__,
+        "nlp": _describe_nlp(processor.nlp),
+        "escalation_nlp": _describe_nlp(processor.escalation_nlp)
+            if getattr(processor, "escalation_nlp", None) is not None else None,
+        "regex": [_describe_recognizer(r) for r in processor.regex_recognizers],
+        "spacy": [_describe_recognizer(r) for r in processor.spacy_recognizers],
+        "prefilter": vars(prefilter) if prefilter is not None else None,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _memoized_fingerprint(memo: "weakref.WeakKeyDictionary", processor) -> str:
+    """
+    Returns `processor_fingerprint(processor)`, memoized in `memo`.
+
+    The memo stores the objects the fingerprint was computed from (models,
+    recognizers, prefilter) and recomputes it when any of them has been
+    replaced on the processor.
+    """
+    state = (
+        processor.nlp,
+        getattr(processor, "escalation_nlp", None),
+        tuple(processor.regex_recognizers),
+        tuple(processor.spacy_recognizers),
+        processor.ner_prefilter,
+    )
+    cached = memo.get(processor)
+    if cached is None or cached[0] != state:
+        cached = (state, processor_fingerprint(processor))
+        memo[processor] = cached
+    return cached[1]
+
+
+class FindingsCache:
+    """
+    An on-disk findings cache shared across processes and restarts.
+
+    Attributes:
+        path (str): The SQLite database file.
+        max_bytes (int): The payload size above which LRU entries are evicted.
+        hits (int): Lookups served from the cache (in this process).
+        misses (int): Lookups not found in the cache (in this process).
+    """
+    # How many writes happen between two size checks.
+    EVICTION_CHECK_INTERVAL = 1000
+    # Access times are only refreshed once they are this many seconds old,
+    # so hot entries don't turn every lookup into a write.
+    ACCESS_RESOLUTION = 60.0
+    # How many entries `evict` deletes per transaction.
+    EVICTION_CHUNK = 1000
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024, timeout: float = 30.0):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path: The SQLite database file.
+            max_bytes: The maximum total payload size before eviction.
+            timeout: Seconds to wait for a lock held by another process.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._writes = 0
+        self._fingerprints = weakref.WeakKeyDictionary()
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection, reconnecting after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def fingerprint(self, processor) -> str:
+        """Returns the (memoized) fingerprint of a processor."""
+        return _memoized_fingerprint(self._fingerprints, processor)
+
+    @staticmethod
+    def _key(fingerprint: str, text: str) -> str:
+        return hashlib.sha256(fingerprint.encode("ascii") + b"\0" + text.encode("utf-8", "surrogatepass")).hexdigest()
+
+    @staticmethod
+    def _encode(findings: List[Finding]) -> str:
+        return json.dumps([
+            [f.pii_type, f.start, f.end, f.score, f.recognizer.name] for f in findings
+        ], separators=(",", ":"))
+
+    @staticmethod
+    def _decode(payload: str, text: str, recognizers: dict) -> Optional[List[Finding]]:
+        findings = []
+        for pii_type, start, end, score, recognizer_name in json.loads(payload):
+            recognizer = recognizers.get(recognizer_name)
+            if recognizer is None:
+                return None
+            findings.append(Finding(
+                text=text[start:end],
+                pii_type=pii_type,
+                start=start,
+                end=end,
+                recognizer=recognizer,
+                score=score
+            ))
+        return findings
+
+    @staticmethod
+    def _recognizers(processor) -> dict:
+        return {r.name: r for r in processor.spacy_recognizers + processor.regex_recognizers}
+
+    def get_many(self, processor, texts: List[str]) -> List[Optional[List[Finding]]]:
+        """
+        Looks up the findings of several texts.
+
+        Args:
+            processor: The processor the findings must have been produced by.
+            texts: The texts to look up.
+
+        Returns:
+            A list with the cached findings, or `None` for misses, per text.
+        """
+        if not texts:
+            return []
+        fingerprint = self.fingerprint(processor)
+        keys = [self._key(fingerprint, text) for text in texts]
+        conn = self._connection()
+        rows = {}
+        # Stay well below SQLite's host parameter limit.
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            for key, payload, accessed in conn.execute(
+                f"SELECT key, payload, accessed FROM findings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ):
+                rows[key] = (payload, accessed)
+
+        recognizers = self._recognizers(processor)
+        results = []
+        now = time.time()
+        stale = set()
+        for key, text in zip(keys, texts):
+            payload, accessed = rows.get(key, (None, None))
+            findings = self._decode(payload, text, recognizers) if payload is not None else None
+            if findings is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if now - accessed >= self.ACCESS_RESOLUTION:
+                    stale.add(key)
+            results.append(findings)
+
+        if stale:
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "UPDATE findings SET accessed = ? WHERE key = ?", [(now, k) for k in stale]
+                )
+        return results
+
+    def get(self, processor, text: str) -> Optional[List[Finding]]:
+        """Looks up the findings of a single text; see `get_many`."""
+        return self.get_many(processor, [text])[0]
+
+    def put_many(self, processor, texts: List[str], findings_lists: List[List[Finding]]):
+        """
+        Stores the findings of several texts in one transaction.
+
+        Args:
+            processor: The processor that produced the findings.
+            texts: The scanned texts.
+            findings_lists: The findings per text.
+        """
+        if not texts:
+            return
+        fingerprint = self.fingerprint(processor)
+        now = time.time()
+        rows = []
+        for text, findings in zip(texts, findings_lists):
+            payload = self._encode(findings)
+            rows.append((self._key(fingerprint, text), fingerprint, payload, len(payload), now))
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO findings (key, fingerprint, payload, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        self._writes += len(rows)
+        if self._writes >= self.EVICTION_CHECK_INTERVAL:
+            self._writes = 0
+            self.evict()
+
+    def put(self, processor, text: str, findings: List[Finding]):
+        """Stores the findings of a single text; see `put_many`."""
+        self.put_many(processor, [text], [findings])
+
+    def size(self) -> int:
+        """Returns the total payload size in bytes."""
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM findings").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM findings").fetchone()[0]
+
+    def evict(self):
+        """
+        Evicts least recently used entries until the payload size is below
+        90% of `max_bytes`. Does nothing if the cache is within its budget.
+
+        Entries are deleted in chunks of `EVICTION_CHUNK`, each in its own
+        transaction, so neither memory nor the write lock grow with the
+        size of the cache.
+        """
+        conn = self._connection()
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        while total > target:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                rows = conn.execute(
+                    "SELECT key, size FROM findings ORDER BY accessed LIMIT ?", (self.EVICTION_CHUNK,)
+                ).fetchall()
+                if not rows:
+                    return
+                doomed = []
+                for key, size in rows:
+                    if total <= target:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM findings WHERE key = ?", doomed)
+
+    def purge(self, keep_processor=None):
+        """
+        Removes cached findings.
+
+        Args:
+            keep_processor: If given, only entries that were *not* produced
+                by this processor's current fingerprint are removed, i.e. all
+                stale entries. Otherwise the cache is cleared.
+        """
+        conn = self._connection()
+        if keep_processor is None:
+            conn.execute("DELETE FROM findings")
+        else:
+            conn.execute(
+                "DELETE FROM findings WHERE fingerprint != ?", (self.fingerprint(keep_processor),)
+            )
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups in this process that were cache hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SegmentCache:
+    """
+    An in-memory LRU cache of the findings of sentences or paragraphs.
+
+    Emails and tickets often share long stretches of signatures,
+    disclaimers and templates, and only differ in a sentence or two. A
+    whole-string cache misses on them, so the model re-reads the shared
+    parts every time. `SegmentCache` splits each text with a cheap rule
+    (sentence ends and line breaks, or blank lines) and caches the findings
+    of each segment under a hash of its text. Only the segments not seen
+    before are scanned, together in one batch, and the findings are shifted
+    back to their offsets in the text.
+
+    NER sees one segment at a time, so an entity that spans a segment
+    break (rare at line breaks and sentence ends) may be missed or split.
+    Segments are cached under a digest, so no text is kept in the cache.
+
+    Attributes:
+        max_segments (int): The number of segments kept; the least recently
+            used ones are evicted beyond that.
+        split (str): `"sentence"` or `"paragraph"`.
+        hits (int): Segments served from the cache.
+        misses (int): Distinct segments that had to be scanned.
+        hit_chars (int): Characters in segments served from the cache.
+        miss_chars (int): Characters in segments that had to be scanned.
+    """
+    SPLITS = {
+        # A sentence end or a line break, like `PiiProcessor._CHUNK_BREAK`.
+        "sentence": re.compile(r"[.!?]+[\"')\]]*\s+|\n"),
+        "paragraph": re.compile(r"\n[^\S\n]*\n\s*"),
+    }
+
+    def __init__(self, max_segments: int = 100_000, split: str = "sentence"):
+        """
+        Initializes the cache.
+
+        Args:
+            max_segments: The maximum number of cached segments.
+            split: `"sentence"` splits after sentence ends and at line
+                breaks; `"paragraph"` only at blank lines.
+        """
+        if split not in self.SPLITS:
+            raise ValueError(f"split must be one of {sorted(self.SPLITS)}.")
+        if max_segments < 1:
+            raise ValueError("max_segments must be at least 1.")
+        self.max_segments = max_segments
+        self.split = split
+        self.hits = 0
+        self.misses = 0
+        self.hit_chars = 0
+        self.miss_chars = 0
+        self._break = self.SPLITS[split]
+        # (fingerprint, digest) -> ((pii_type, start, end, score, recognizer), ...)
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple]" = OrderedDict()
+        self._fingerprints = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def segments(self, text: str) -> List[Tuple[int, str]]:
+        """Splits a text into `(offset, segment)` pieces that cover it."""
+        pieces = []
+        start = 0
+        for match in self._break.finditer(text):
+            pieces.append((start, text[start:match.end()]))
+            start = match.end()
+        if start < len(text):
+            pieces.append((start, text[start:]))
+        return pieces
+
+    @staticmethod
+    def _key(fingerprint: str, segment: str) -> Tuple[str, bytes]:
+        digest = hashlib.blake2b(segment.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return fingerprint, digest
+
+    def _fingerprint(self, processor) -> str:
+        return _memoized_fingerprint(self._fingerprints, processor)
+
+    def get_findings(
+        self,
+        processor,
+        texts: List[str],
+        batch_size: int = 64,
+        deadline=None # Optional[Deadline]
+    ) -> List[List[Finding]]:
+        """
+        Finds all PII in several texts, scanning only unseen segments.
+
+        Called by `PiiProcessor.get_findings` and `get_findings_batch` when
+        the processor has this cache as its `segment_cache`.
+
+        Args:
+            processor: The processor that scans the missing segments.
+            texts: The texts to scan.
+            batch_size: The batch size for the missing segments.
+            deadline: An optional `Deadline`. Segments scanned while it
+                caused fallbacks are not cached.
+
+        Returns:
+            A list of `Finding` lists, one per input text.
+        """
+        fingerprint = self._fingerprint(processor)
+        # (offset, length, key) of the segments of each text, without blank ones
+        keyed = [
+            [(offset, len(segment), self._key(fingerprint, segment))
+             for offset, segment in self.segments(text) if not segment.isspace()]
+            for text in texts
+        ]
+        cached: Dict[Tuple[str, bytes], Tuple] = {}
+        missing: Dict[Tuple[str, bytes], str] = {}
+        with self._lock:
+            for text, pieces in zip(texts, keyed):
+                for offset, length, key in pieces:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        cached[key] = entry
+                    elif key not in missing:
+                        missing[key] = text[offset:offset + length]
+                        self.misses += 1
+                        self.miss_chars += length
+                        continue
+                    # Served from the cache, or repeated within the batch
+                    self.hits += 1
+                    self.hit_chars += length
+
+        if missing:
+            fallbacks = deadline.fallbacks if deadline is not None else 0
+            scanned = processor._cached_findings_batch(list(missing.values()), batch_size, deadline)
+            entries = {
+                key: tuple((f.pii_type, f.start, f.end, f.score, f.recognizer) for f in findings)
+                for key, findings in zip(missing, scanned)
+            }
+            cached.update(entries)
+            # Degraded findings must not be served to later calls
+            if deadline is None or deadline.fallbacks == fallbacks:
+                with self._lock:
+                    self._entries.update(entries)
+                    while len(self._entries) > self.max_segments:
+                        self._entries.popitem(last=False)
+
+        results = []
+        for text, pieces in zip(texts, keyed):
+            findings = []
+            for offset, _, key in pieces:
+                for pii_type, start, end, score, recognizer in cached[key]:
+                    findings.append(Finding(
+                        text=text[offset + start:offset + end],
+                        pii_type=pii_type,
+                        start=offset + start,
+                        end=offset + end,
+                        recognizer=recognizer,
+                        score=score
+                    ))
+            results.append(findings)
+        return results
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of segments that were served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def char_hit_rate(self) -> float:
+        """The fraction of characters that were served from the cache, i.e. of NER work saved."""
+        chars = self.hit_chars + self.miss_chars
+        return self.hit_chars / chars if chars else 0.0
+
+    def clear(self):
+        """Removes all cached segments."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,147 @@
+# src/l8e_beam/cascade.py
+
+"""
+A two-stage model cascade for NER-based PII detection.
+
+Every text is first run through a fast model (usually `ModelType.SM`). Only
+the sentences that the fast model flags as entity-bearing, or that match a
+configurable escalation heuristic, are re-run through an accurate model
+(usually `ModelType.TRF`). In escalated sentences, the accurate model's
+findings win where the two models overlap, and fast-model findings it missed
+are kept, so the cascade never finds less than the fast model alone; all
+other sentences keep the fast model's findings.
+
+Since most sentences in typical agent traffic contain no entities at all,
+this gets close to transformer accuracy for a fraction of its cost.
+"""
+from typing import Callable, Iterable, List, Optional
+
+import spacy
+from spacy.tokens import Span
+
+from l8e_beam.recognizers.pii_processor import PiiProcessor, NerPrefilter, ModelRecycler
+
+
+def has_entities(sent: Span, labels: set) -> bool:
+    """
+    The default escalation heuristic.
+
+    Escalates a sentence if the fast model found any entity whose label is
+    handled by one of the processor's spaCy recognizers.
+    """
+    return any(ent.label_ in labels for ent in sent.ents)
+
+
+def has_entities_or_proper_nouns(sent: Span, labels: set) -> bool:
+    """
+    A more aggressive escalation heuristic.
+
+    In addition to `has_entities`, escalates sentences that contain a
+    capitalized token that is not sentence-initial, which catches most
+    names the fast model missed.
+    """
+    if has_entities(sent, labels):
+        return True
+    return any(tok.is_title and tok.i != sent.start for tok in sent)
+
+
+class CascadePiiProcessor(PiiProcessor):
+    """
+    A `PiiProcessor` that escalates uncertain sentences to a second model.
+
+    Regex recognizers and the NER prefilter behave exactly as in
+    `PiiProcessor`; only the NER stage is cascaded.
+
+    Attributes:
+        escalation_nlp (spacy.Language): The accurate model used for escalated sentences.
+        escalate_when (Callable): A heuristic `(sentence, labels) -> bool` that
+            decides whether a sentence of the fast model's `Doc` is escalated.
+    """
+    model_attributes = ("nlp", "escalation_nlp")
+
+    def __init__(
+        self,
+        regex_recognizers: List, # List[RegexRecognizer]
+        spacy_recognizers: List, # List[SpacyRecognizer]
+        nlp: spacy.Language,
+        escalation_nlp: spacy.Language,
+        ner_prefilter: Optional[NerPrefilter] = NerPrefilter(),
+        escalate_when: Callable[[Span, set], bool] = has_entities,
+        cache=None, # Optional[FindingsCache]
+        recycler: Optional[ModelRecycler] = None,
+        segment_cache=None, # Optional[SegmentCache]
+        doc_labels: Optional[Iterable[str]] = None
+    ):
+        """
+        Initializes the cascade.
+
+        Args:
+            regex_recognizers: A list of instantiated `RegexRecognizer` objects.
+            spacy_recognizers: A list of instantiated `SpacyRecognizer` objects.
+            nlp: The fast spaCy model that sees every text.
+            escalation_nlp: The accurate spaCy model for escalated sentences.
+            ner_prefilter: See `PiiProcessor`.
+            escalate_when: The escalation heuristic, see `has_entities`.
+            cache: See `PiiProcessor`.
+            recycler: See `PiiProcessor`. Both models are recycled together.
+            segment_cache: See `PiiProcessor`.
+            doc_labels: See `PiiProcessor`. Sentences of reused `Doc`s are
+                escalated like those of parsed ones.
+        """
+        # Set before the base initializer so the recycler can snapshot it.
+        self.escalation_nlp = escalation_nlp
+        super().__init__(
+            regex_recognizers=regex_recognizers,
+            spacy_recognizers=spacy_recognizers,
+            nlp=nlp,
+            ner_prefilter=ner_prefilter,
+            cache=cache,
+            recycler=recycler,
+            segment_cache=segment_cache,
+            doc_labels=doc_labels
+        )
+        self.escalate_when = escalate_when
+        self.escalated_sentences = 0
+        self.total_sentences = 0
+
+    def _analyze_doc(self, text: str, doc, findings: List):
+        """
+        Takes the fast model's `Doc`, re-runs escalated sentences through the
+        accurate model and merges the findings.
+
+        Within an escalated sentence, a fast-model finding is only dropped if
+        it overlaps a finding of the accurate model (e.g. `Anna` against
+        `Anna Schmidt`).
+        """
+        labels = {r.label for r in self.spacy_recognizers}
+
+        # Without sentence boundaries the whole document is one "sentence".
+        if doc.has_annotation("SENT_START"):
+            sentences = list(doc.sents)
+        else:
+            sentences = [doc[:]]
+
+        escalated = [s for s in sentences if self.escalate_when(s, labels)]
+        self.total_sentences += len(sentences)
+        self.escalated_sentences += len(escalated)
+
+        fast_findings = []
+        for recognizer in self.spacy_recognizers:
+            recognizer.analyze(doc, fast_findings)
+
+        accurate_findings = []
+        texts = [s.text for s in escalated]
+        for sent, sent_doc in zip(escalated, self.escalation_nlp.pipe(texts)):
+            sent_findings = []
+            for recognizer in self.spacy_recognizers:
+                recognizer.analyze(sent_doc, sent_findings)
+            for finding in sent_findings:
+                finding.start += sent.start_char
+                finding.end += sent.start_char
+                accurate_findings.append(finding)
+
+        # The accurate model wins on overlaps; fast findings it missed are kept.
+        for finding in fast_findings:
+            if not any(f.start < finding.end and finding.start < f.end for f in accurate_findings):
+                findings.append(finding)
+        findings.extend(accurate_findings)
@@ -0,0 +1,117 @@
+# src/l8e_beam/cli.py
+
+"""
+The `l8e-beam` command line interface.
+
+Commands:
+    serve: Runs the sanitization sidecar on a Unix domain socket
+        (see `l8e_beam.server`).
+    evaluate: Scores models and policies on a labeled corpus
+        (see `l8e_beam.evaluation`).
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+from typing import List, Optional
+
+from l8e_beam.client import DEFAULT_SOCKET_PATH
+
+
+def _serve(args: argparse.Namespace) -> int:
+    # Imported here so that `l8e-beam --help` does not load spaCy.
+    from l8e_beam.redactor import MODEL_REGISTRY, _get_model
+    from l8e_beam.server import SidecarServer, _model
+
+    if args.memory_budget_mb is not None:
+        MODEL_REGISTRY.memory_budget_bytes = args.memory_budget_mb * 1024 * 1024
+    for model in args.preload:
+        _get_model(_model(model))
+
+    server = SidecarServer(
+        socket_path=args.socket,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        socket_mode=int(args.socket_mode, 8)
+    )
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so call it from another thread.
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"l8e-beam sidecar listening on {args.socket}", file=sys.stderr, flush=True)
+    server.serve_forever()
+    return 0
+
+
+def _evaluate(args: argparse.Namespace) -> int:
+    from l8e_beam.api import build_processor
+    from l8e_beam.evaluation import compare, format_reports, load_corpus
+    from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+    from l8e_beam.server import _model
+
+    disabled = [DEFAULT_RECOGNIZERS(name) for name in args.disable]
+    configurations = {}
+    for spec in args.config or ["en_core_web_sm-3.7.1"]:
+        # MODEL or MODEL>ESCALATION_MODEL for a cascade
+        model, _, escalate_to = spec.partition(">")
+        configurations[spec] = (
+            lambda model=model, escalate_to=escalate_to: build_processor(
+                model=_model(model),
+                disabled_recognizers=disabled,
+                escalate_to=_model(escalate_to) if escalate_to else None
+            )
+        )
+    label_map = dict(item.split("=", 1) for item in args.label_map)
+    reports = compare(configurations, load_corpus(args.corpus), label_map=label_map, warmup=args.warmup)
+    if args.json:
+        print(json.dumps([r.to_dict() for r in reports], indent=2))
+    else:
+        print(format_reports(reports))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser of the `l8e-beam` command."""
+    parser = argparse.ArgumentParser(prog="l8e-beam", description="l8e-beam PII sanitization tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the sanitization sidecar on a Unix socket.")
+    serve.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="The Unix socket path.")
+    serve.add_argument("--max-batch-size", type=int, default=64,
+                       help="Maximum number of strings per model batch.")
+    serve.add_argument("--max-wait-ms", type=float, default=5.0,
+                       help="How long a string may wait for a batch to fill up.")
+    serve.add_argument("--memory-budget-mb", type=int, default=None,
+                       help="Memory budget for resident models, see MODEL_REGISTRY.")
+    serve.add_argument("--preload", action="append", default=[], metavar="MODEL",
+                       help="Load a model at startup (repeatable), e.g. en_core_web_sm-3.7.1.")
+    serve.add_argument("--socket-mode", default="600", help="Octal permission bits of the socket.")
+    serve.set_defaults(func=_serve)
+
+    evaluate = commands.add_parser("evaluate", help="Score models and policies on a labeled JSONL corpus.")
+    evaluate.add_argument("corpus", help="JSONL file with 'text' and gold 'spans'.")
+    evaluate.add_argument("--config", action="append", metavar="MODEL[>ESCALATION]",
+                          help="A model to evaluate, or a cascade like "
+                               "'en_core_web_sm-3.7.1>en_core_web_trf-3.7.3' (repeatable).")
+    evaluate.add_argument("--disable", action="append", default=[], metavar="RECOGNIZER",
+                          help="A default recognizer to disable, e.g. DATE (repeatable).")
+    evaluate.add_argument("--label-map", action="append", default=[], metavar="GOLD=TYPE",
+                          help="Map a gold label to a PII type, e.g. PER=PERSON (repeatable).")
+    evaluate.add_argument("--warmup", type=int, default=3, help="Untimed documents per configuration.")
+    evaluate.add_argument("--json", action="store_true", help="Print the reports as JSON.")
+    evaluate.set_defaults(func=_evaluate)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the `l8e-beam` command."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# src/l8e_beam/client.py
+
+"""
+A lightweight client for the l8e-beam sanitization sidecar.
+
+When several services run on one host, each of them would otherwise load
+its own copy of the spaCy model. `l8e-beam serve` (see `l8e_beam.server`)
+loads the model once and serves all of them over a Unix domain socket;
+this module is the client side. It only uses the standard library (and
+`msgpack` if it is installed), so importing it does not pull in spaCy.
+
+Wire protocol: every message is one frame consisting of a one-byte codec
+tag (`j` for JSON, `m` for msgpack), a four-byte big-endian payload length
+and the encoded payload. The server answers each request frame with one
+response frame in the same codec.
+
+Data sent to the sidecar must be JSON-compatible: tuples arrive back as
+lists, and objects such as Pydantic models should be converted first.
+"""
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, List, Optional, Union
+
+from l8e_beam.enums import ModelType, PiiAction
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+DEFAULT_SOCKET_PATH = os.environ.get(
+    "L8E_BEAM_SOCKET", os.path.join(tempfile.gettempdir(), "l8e-beam.sock")
+)
+
+# Codec tag and payload length
+FRAME_HEADER = struct.Struct("!cI")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+JSON = b"j"
+MSGPACK = b"m"
+
+
+class SidecarError(RuntimeError):
+    """Raised when the sidecar reports an error or the protocol is violated."""
+
+
+def encode(obj: Any, codec: bytes) -> bytes:
+    """Encodes a message payload with the given codec."""
+    if codec == MSGPACK:
+        if msgpack is None:
+            raise SidecarError("The msgpack codec requires the 'msgpack' package.")
+        return msgpack.packb(obj, use_bin_type=True)
+    if codec == JSON:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    raise SidecarError(f"Unknown codec {codec!r}.")
+
+
+def decode(payload: bytes, codec: bytes) -> Any:
+    """Decodes a message payload with the given codec."""
+    if codec == MSGPACK:
+        if msgpack is None:
+            raise SidecarError("The msgpack codec requires the 'msgpack' package.")
+        return msgpack.unpackb(payload, raw=False)
+    if codec == JSON:
+        return json.loads(payload.decode("utf-8"))
+    raise SidecarError(f"Unknown codec {codec!r}.")
+
+
+def write_frame(sock: socket.socket, obj: Any, codec: bytes):
+    """Sends one frame."""
+    payload = encode(obj, codec)
+    sock.sendall(FRAME_HEADER.pack(codec, len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            if chunks:
+                raise SidecarError("Connection closed in the middle of a frame.")
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(sock: socket.socket):
+    """
+    Receives one frame.
+
+    Returns:
+        A `(codec, message)` tuple, or `None` if the peer closed the connection.
+    """
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    codec, size = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise SidecarError(f"Frame of {size} bytes exceeds the limit of {MAX_FRAME_BYTES}.")
+    payload = _recv_exact(sock, size) if size else b""
+    if payload is None:
+        raise SidecarError("Connection closed in the middle of a frame.")
+    return codec, decode(payload, codec)
+
+
+def _enum_value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+class SidecarClient:
+    """
+    Sends sanitization requests to a running `l8e-beam serve` sidecar.
+
+    The client is thread-safe. It keeps a small pool of connections, so
+    concurrent calls from one process are sent in parallel and can be
+    batched together on the server.
+
+    Attributes:
+        socket_path (str): The sidecar's Unix socket.
+        timeout (Optional[float]): The socket timeout in seconds.
+        codec (bytes): `MSGPACK` if `msgpack` is installed, `JSON` otherwise.
+    """
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        timeout: Optional[float] = 30.0,
+        codec: Optional[bytes] = None
+    ):
+        """
+        Initializes the client. Connections are opened lazily.
+
+        Args:
+            socket_path: The sidecar's Unix socket.
+            timeout: The socket timeout in seconds, or `None` to block.
+            codec: Force a codec (`JSON` or `MSGPACK`).
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.codec = codec or (MSGPACK if msgpack is not None else JSON)
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        give_up = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+                return sock
+            except BlockingIOError:
+                # The server's accept backlog is full; Unix sockets with a
+                # timeout fail at once instead of waiting for room.
+                sock.close()
+                if give_up is not None and time.monotonic() >= give_up:
+                    raise
+                time.sleep(0.001)
+            except OSError:
+                sock.close()
+                raise
+
+    def request(self, message: dict) -> Any:
+        """
+        Sends a raw request and returns the `result` of the response.
+
+        Raises:
+            SidecarError: If the sidecar reports an error.
+        """
+        sock = self._connect()
+        try:
+            write_frame(sock, message, self.codec)
+            frame = read_frame(sock)
+        except BaseException:
+            sock.close()
+            raise
+        if frame is None:
+            sock.close()
+            raise SidecarError("The sidecar closed the connection.")
+        with self._lock:
+            self._idle.append(sock)
+        _, response = frame
+        if not response.get("ok"):
+            raise SidecarError(f"{response.get('type', 'Error')}: {response.get('error')}")
+        return response.get("result")
+
+    def sanitize(
+        self,
+        data: Any,
+        action: PiiAction = PiiAction.REDACT,
+        model: Union[ModelType, str] = ModelType.SM,
+        disabled_recognizers: Optional[List[DEFAULT_RECOGNIZERS]] = None,
+        ner_prefilter: bool = True,
+        escalate_to: Optional[Union[ModelType, str]] = None,
+        paths: Any = None
+    ) -> Any:
+        """
+        Sanitizes JSON-compatible data on the sidecar.
+
+        The arguments have the same meaning as in `sanitize_pii`. Custom
+        recognizers cannot be sent over the wire, so the sidecar only runs
+        the default recognizers; use an in-process processor for others.
+
+        Returns:
+            The processed data.
+        """
+        message = {
+            "op": "sanitize",
+            "data": data,
+            "action": _enum_value(action),
+            "policy": {
+                "model": _enum_value(model),
+                "disabled_recognizers": sorted(_enum_value(d) for d in (disabled_recognizers or [])),
+                "ner_prefilter": bool(ner_prefilter),
+                "escalate_to": _enum_value(escalate_to),
+            },
+        }
+        if paths is not None:
+            # A `PathFilter`; only its patterns are sent.
+            message["paths"] = {"include": list(paths.include), "exclude": list(paths.exclude)}
+        return self.request(message)
+
+    def ping(self) -> bool:
+        """Returns `True` if the sidecar is reachable."""
+        return self.request({"op": "ping"}) == "pong"
+
+    def stats(self) -> dict:
+        """Returns the sidecar's batching and model memory statistics."""
+        return self.request({"op": "stats"})
+
+    def close(self):
+        """Closes all pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+    def __enter__(self) -> "SidecarClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,144 @@
+# src/l8e_beam/conversation.py
+
+"""
+Incremental sanitization of chat histories.
+
+Agents typically resend the whole message history on every turn. Calling
+`sanitize_pii(messages)` each time re-runs NER over turns 1..N-1 again, so
+the total cost grows quadratically over a conversation.
+
+`ConversationSanitizer` understands the chat message list shape
+(`[{"role": ..., "content": ...}, ...]`) and keeps a bounded memo of
+already-sanitized messages per conversation, keyed by a hash of the
+message content. Only messages it has not seen before are processed, so
+per-turn cost is proportional to the new content.
+
+With `PiiAction.ANONYMIZE`, each conversation also keeps a surrogate map so
+that a given PII value is replaced by the same fake value on every turn.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+
+@dataclass
+class _ConversationState:
+    """The memo and surrogate map of a single conversation."""
+    messages: "OrderedDict[str, Dict[str, Any]]" = field(default_factory=OrderedDict)
+    surrogates: Dict[Tuple[str, str], str] = field(default_factory=dict)
+
+
+class ConversationSanitizer:
+    """
+    Sanitizes chat message lists, processing each distinct message only once.
+
+    Message fields listed in `passthrough_keys` (role, ids, ...) are copied
+    as-is; every other field (`content`, `name`, `tool_calls`, ...) is
+    sanitized with `PiiProcessor.process_recursive`.
+
+    Attributes:
+        processor (PiiProcessor): The processor used for new messages.
+        action (PiiAction): The PII action to perform.
+        max_messages (int): The maximum number of memoized messages per conversation.
+        max_conversations (int): The maximum number of conversations kept in memory.
+        hits (int): Number of messages served from the memo.
+        misses (int): Number of messages that had to be processed.
+    """
+    passthrough_keys = ("role", "id", "tool_call_id", "type")
+
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        max_messages: int = 1000,
+        max_conversations: int = 1000
+    ):
+        """
+        Initializes the sanitizer.
+
+        Args:
+            processor: The processor used to sanitize new messages.
+            action: The PII action to perform.
+            max_messages: The memo size per conversation. Older messages are
+                evicted first (least recently used).
+            max_conversations: The number of conversations kept in memory.
+                The least recently used conversation is evicted first.
+        """
+        self.processor = processor
+        self.action = action
+        self.max_messages = max_messages
+        self.max_conversations = max_conversations
+        self._conversations: "OrderedDict[str, _ConversationState]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _message_key(message: Dict[str, Any]) -> str:
+        """Returns a content hash of a message."""
+        encoded = json.dumps(message, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _state(self, conversation_id: str) -> _ConversationState:
+        state = self._conversations.get(conversation_id)
+        if state is None:
+            state = _ConversationState()
+            self._conversations[conversation_id] = state
+            if len(self._conversations) > self.max_conversations:
+                self._conversations.popitem(last=False)
+        else:
+            self._conversations.move_to_end(conversation_id)
+        return state
+
+    def _sanitize_message(self, message: Dict[str, Any], state: _ConversationState) -> Dict[str, Any]:
+        return {
+            key: value if key in self.passthrough_keys else self.processor.process_recursive(
+                value, self.action, surrogates=state.surrogates
+            )
+            for key, value in message.items()
+        }
+
+    def sanitize(self, messages: List[Dict[str, Any]], conversation_id: str = "default") -> List[Dict[str, Any]]:
+        """
+        Sanitizes a full message history, reusing results for known messages.
+
+        The returned message dicts may be shared between calls; treat them
+        as read-only.
+
+        Args:
+            messages: The chat history, a list of message dicts.
+            conversation_id: Identifies the conversation whose memo and
+                surrogates should be used.
+
+        Returns:
+            The sanitized message list, in the same order.
+        """
+        state = self._state(conversation_id)
+        sanitized = []
+        for message in messages:
+            if not isinstance(message, dict):
+                sanitized.append(self.processor.process_recursive(
+                    message, self.action, surrogates=state.surrogates
+                ))
+                continue
+            key = self._message_key(message)
+            cached = state.messages.get(key)
+            if cached is not None:
+                self.hits += 1
+                state.messages.move_to_end(key)
+            else:
+                self.misses += 1
+                cached = self._sanitize_message(message, state)
+                state.messages[key] = cached
+                if len(state.messages) > self.max_messages:
+                    state.messages.popitem(last=False)
+            sanitized.append(cached)
+        return sanitized
+
+    def forget(self, conversation_id: str):
+        """Drops the memo and surrogates of a conversation."""
+        self._conversations.pop(conversation_id, None)
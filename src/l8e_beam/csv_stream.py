@@ -0,0 +1,290 @@
+# src/l8e_beam/csv_stream.py
+
+"""
+Streaming sanitization of large CSV files with per-column policies.
+
+Columns of a CRM or database export differ a lot: IDs and amounts need no
+scanning, email and phone columns only need the regex recognizers, and
+only free-text columns (notes, names) need the spaCy model.
+`CsvStreamSanitizer` applies a `ColumnPolicy` (or a recognizer subset) per
+column and streams the file:
+
+- Rows are read in batches of `batch_rows`. For each batch, the values of
+  all columns that share a policy are scanned together with
+  `get_findings_batch`, so the model sees one `nlp.pipe` call per batch.
+- Each column keeps a bounded LRU memo of the values it has already
+  sanitized. Repeated values (company names, cities, statuses) are never
+  scanned twice, so NER calls scale with the distinct values of the text
+  columns rather than with the number of rows.
+- Rows are written in input order, and memory is bounded by one batch of
+  rows plus the memos, independently of the file size.
+"""
+import copy
+import csv
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence, TextIO, Tuple, Union
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.vault import _BoundedSurrogates
+
+
+class ColumnPolicy(Enum):
+    """
+    How the values of a column are sanitized.
+
+    Attributes:
+        SKIP: Values are copied unchanged.
+        REGEX_ONLY: Only the regex recognizers run; the model is never called.
+        NER: All recognizers of the processor run, including NER.
+    """
+    SKIP = "skip"
+    REGEX_ONLY = "regex_only"
+    NER = "ner"
+
+
+# A column policy, or the names of the recognizers to run on the column.
+ColumnSpec = Union[ColumnPolicy, Sequence[Union[DEFAULT_RECOGNIZERS, str]]]
+
+
+class CsvStreamSanitizer:
+    """
+    Sanitizes a CSV text stream column by column, in bounded batches.
+
+    Columns are identified by header name, or by index when the input has
+    no header row (`has_header=False`). Columns without an entry in
+    `columns` use `default`.
+
+    Attributes:
+        processor (PiiProcessor): The processor for `ColumnPolicy.NER` columns.
+            Other policies use shallow copies of it with fewer recognizers,
+            sharing its model.
+        action (PiiAction): The PII action to perform.
+        columns (Dict[Union[str, int], ColumnSpec]): The per-column policies.
+        default (ColumnSpec): The policy of columns not listed in `columns`.
+        batch_rows (int): The number of rows scanned together.
+        memo_size (int): The maximum number of memoized values per column.
+        has_header (bool): Whether the first row is a header. It is copied unchanged.
+        rows (int): Number of data rows written so far.
+        scanned (int): Number of distinct values sent to the recognizers so far.
+        memo_hits (int): Number of values answered from a column memo so far.
+    """
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        columns: Optional[Dict[Union[str, int], ColumnSpec]] = None,
+        default: ColumnSpec = ColumnPolicy.NER,
+        batch_rows: int = 512,
+        memo_size: int = 10_000,
+        has_header: bool = True,
+        max_surrogates: int = 100_000,
+        surrogates: Optional[Any] = None,
+        **fmtparams
+    ):
+        """
+        Initializes the sanitizer.
+
+        Args:
+            processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+            action: The PII action to perform.
+            columns: Maps a column name (or index) to a `ColumnPolicy`, or to
+                the recognizers to run on it, e.g. `[DEFAULT_RECOGNIZERS.EMAIL]`.
+            default: The policy of all other columns.
+            batch_rows: The number of rows per batch.
+            memo_size: The maximum number of memoized values per column;
+                `0` disables the memo.
+            has_header: Whether the first row is a header row.
+            max_surrogates: The maximum number of surrogates kept for
+                `PiiAction.ANONYMIZE`. A value seen again after its surrogate
+                was evicted may get a different one.
+            surrogates: An optional mapping of `(pii_type, original text)` to
+                replacement, e.g. to share surrogates with other components,
+                or the `TokenVault` required for `PiiAction.TOKENIZE`. It
+                should be bounded itself.
+            **fmtparams: CSV dialect and formatting parameters, passed to
+                both `csv.reader` and `csv.writer`.
+        """
+        if batch_rows < 1:
+            raise ValueError("batch_rows must be at least 1.")
+        self.processor = processor
+        self.action = action
+        self.columns = dict(columns or {})
+        self.default = default
+        self.batch_rows = batch_rows
+        self.memo_size = memo_size
+        self.has_header = has_header
+        self.fmtparams = fmtparams
+        self.rows = 0
+        self.scanned = 0
+        self.memo_hits = 0
+        # Keeps anonymized values consistent across the file.
+        self._surrogates: MutableMapping[Tuple[str, str], str] = (
+            surrogates if surrogates is not None else _BoundedSurrogates(max(max_surrogates, 1))
+        )
+        self._processors: Dict[Tuple, PiiProcessor] = {}
+
+    def _processor_for(self, spec: ColumnSpec) -> Optional[PiiProcessor]:
+        """Returns the processor of a column policy, or `None` for skipped columns."""
+        if spec is ColumnPolicy.SKIP:
+            return None
+        if spec is ColumnPolicy.NER:
+            return self.processor
+        if spec is ColumnPolicy.REGEX_ONLY:
+            key: Tuple = ("regex_only",)
+        else:
+            key = tuple(sorted(n.value if isinstance(n, DEFAULT_RECOGNIZERS) else n for n in spec))
+        processor = self._processors.get(key)
+        if processor is None:
+            processor = copy.copy(self.processor)
+            if spec is ColumnPolicy.REGEX_ONLY:
+                processor.spacy_recognizers = []
+            else:
+                names = set(key)
+                processor.regex_recognizers = [r for r in self.processor.regex_recognizers if r.name in names]
+                processor.spacy_recognizers = [r for r in self.processor.spacy_recognizers if r.name in names]
+            # The copy shares the model, which only the original may recycle.
+            processor.recycler = None
+            self._processors[key] = processor
+        return processor
+
+    def _plan(self, header: Optional[List[str]], width: int) -> List[Optional[PiiProcessor]]:
+        """Resolves the processor of each column."""
+        plan = []
+        for index in range(width):
+            name = header[index] if header is not None and index < len(header) else None
+            if name is not None and name in self.columns:
+                spec = self.columns[name]
+            else:
+                spec = self.columns.get(index, self.default)
+            plan.append(self._processor_for(spec))
+        return plan
+
+    def _sanitize_batch(
+        self,
+        batch: List[List[str]],
+        plan: List[Optional[PiiProcessor]],
+        memos: List["OrderedDict[str, str]"]
+    ):
+        """Sanitizes a batch of rows in place."""
+        # Distinct, not memoized values per processor, with the cells they fill
+        pending: Dict[int, Tuple[PiiProcessor, Dict[str, List[Tuple[int, int]]]]] = {}
+        for row_index, row in enumerate(batch):
+            for column, value in enumerate(row):
+                processor = plan[column] if column < len(plan) else None
+                if processor is None or not value:
+                    continue
+                memo = memos[column]
+                sanitized = memo.get(value)
+                if sanitized is not None:
+                    memo.move_to_end(value)
+                    row[column] = sanitized
+                    self.memo_hits += 1
+                    continue
+                _, cells = pending.setdefault(id(processor), (processor, {}))
+                cells.setdefault(value, []).append((row_index, column))
+
+        for processor, cells in pending.values():
+            texts = list(cells)
+            findings_lists = processor.get_findings_batch(texts, batch_size=self.batch_rows)
+            self.scanned += len(texts)
+            for text, findings in zip(texts, findings_lists):
+                sanitized = processor.apply_findings(text, findings, self.action, surrogates=self._surrogates)
+                for row_index, column in cells[text]:
+                    batch[row_index][column] = sanitized
+                    if self.memo_size:
+                        memo = memos[column]
+                        memo[text] = sanitized
+                        if len(memo) > self.memo_size:
+                            memo.popitem(last=False)
+
+    def sanitize(self, src: Iterable[str], dst: TextIO) -> int:
+        """
+        Reads CSV from `src` and writes the sanitized CSV to `dst`.
+
+        Args:
+            src: A readable text stream, opened with `newline=""`.
+            dst: A writable text stream, opened with `newline=""`.
+
+        Returns:
+            The number of data rows written.
+        """
+        reader = csv.reader(src, **self.fmtparams)
+        writer = csv.writer(dst, **self.fmtparams)
+        header = None
+        if self.has_header:
+            header = next(reader, None)
+            if header is None:
+                return 0
+            writer.writerow(header)
+
+        plan: List[Optional[PiiProcessor]] = []
+        memos: List["OrderedDict[str, str]"] = []
+        count = 0
+        batch: List[List[str]] = []
+        for row in reader:
+            if len(row) > len(plan):
+                plan = self._plan(header, len(row))
+                memos.extend(OrderedDict() for _ in range(len(row) - len(memos)))
+            batch.append(row)
+            if len(batch) >= self.batch_rows:
+                self._sanitize_batch(batch, plan, memos)
+                writer.writerows(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._sanitize_batch(batch, plan, memos)
+            writer.writerows(batch)
+            count += len(batch)
+        self.rows += count
+        return count
+
+
+def sanitize_csv_file(
+    input_path: str,
+    output_path: str,
+    processor: PiiProcessor,
+    action: PiiAction = PiiAction.REDACT,
+    columns: Optional[Dict[Union[str, int], ColumnSpec]] = None,
+    encoding: str = "utf-8",
+    **options
+) -> int:
+    """
+    Sanitizes a (potentially huge) CSV file in a streaming fashion.
+
+    Args:
+        input_path: The CSV file to read.
+        output_path: The file to write the sanitized CSV to.
+        processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+        action: The PII action to perform.
+        columns: The per-column policies, see `CsvStreamSanitizer`.
+        encoding: The encoding of both files.
+        **options: Passed on to `CsvStreamSanitizer`.
+
+    Returns:
+        The number of data rows written.
+
+    Example:
+        ```python
+        from l8e_beam.api import build_processor
+        from l8e_beam.csv_stream import ColumnPolicy, sanitize_csv_file
+        from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+
+        sanitize_csv_file(
+            "crm.csv", "crm.clean.csv", build_processor(),
+            columns={
+                "id": ColumnPolicy.SKIP,
+                "email": [DEFAULT_RECOGNIZERS.EMAIL],
+                "phone": ColumnPolicy.REGEX_ONLY,
+                "notes": ColumnPolicy.NER,
+            },
+            default=ColumnPolicy.SKIP,
+        )
+        ```
+    """
+    sanitizer = CsvStreamSanitizer(processor, action, columns=columns, **options)
+    with open(input_path, encoding=encoding, newline="") as src, \
+            open(output_path, "w", encoding=encoding, newline="") as dst:
+        return sanitizer.sanitize(src, dst)
@@ -0,0 +1,144 @@
+# src/l8e_beam/deadline.py
+
+"""
+Latency budgets for sanitization calls.
+
+A transformer model can take a long time on a long string, which makes the
+latency of `sanitize_pii` unpredictable under load. A `Deadline` bounds it:
+
+- Regex recognizers always run; they are cheap and cover structured PII.
+- NER only runs while budget remains. Long strings are split into chunks at
+  sentence boundaries, and a chunk is only started if the NER throughput
+  measured for the model says it can finish in time. Models that were not
+  measured yet are assumed to be slow.
+- Strings whose NER could not be completed fall back to the deadline's
+  `DeadlinePolicy`.
+
+Fallbacks are counted on the `Deadline` object, which the caller can
+inspect after the call, and in the processor's `stats`.
+"""
+import time
+from enum import Enum
+from typing import Callable, List
+
+from l8e_beam.recognizers.base import Finding, Recognizer
+
+
+class DeadlinePolicy(Enum):
+    """
+    What to do with a string whose NER did not fit into the budget.
+
+    Attributes:
+        REGEX_ONLY: Keep the regex findings (and NER findings of chunks that
+            did finish) and sanitize with those.
+        REDACT_FIELD: Replace the whole string with `[REDACTED FIELD]`.
+        RAISE: Raise `DeadlineExceeded`.
+    """
+    REGEX_ONLY = "regex_only"
+    REDACT_FIELD = "redact_field"
+    RAISE = "raise"
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a deadline with `DeadlinePolicy.RAISE` runs out."""
+
+
+class FieldRedactionRecognizer(Recognizer):
+    """
+    The recognizer behind `DeadlinePolicy.REDACT_FIELD` findings.
+
+    It never detects anything itself; its findings span a whole string and
+    are redacted the same way for every action except `IGNORE`.
+    """
+    name = "FIELD"
+
+    def analyze(self, text: str, findings: List[Finding]):
+        pass
+
+    def anonymize(self, text: str) -> str:
+        return f"[REDACTED {self.name}]"
+
+
+FIELD_REDACTION = FieldRedactionRecognizer()
+
+
+class Deadline:
+    """
+    A latency budget for one sanitization call.
+
+    The clock starts when the object is created, so create it right before
+    the call.
+
+    Attributes:
+        budget_ms (float): The total budget in milliseconds.
+        policy (DeadlinePolicy): The fallback for strings whose NER did not fit.
+        fallbacks (int): The number of strings that fell back to `policy`.
+    """
+    def __init__(
+        self,
+        budget_ms: float,
+        policy: DeadlinePolicy = DeadlinePolicy.REGEX_ONLY,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Starts the deadline.
+
+        Args:
+            budget_ms: The total budget in milliseconds.
+            policy: The fallback for strings whose NER did not fit.
+            clock: A monotonic clock returning seconds.
+        """
+        self.budget_ms = budget_ms
+        self.policy = policy
+        self.fallbacks = 0
+        self._clock = clock
+        self._expires_at = clock() + budget_ms / 1000.0
+
+    def remaining(self) -> float:
+        """Returns the remaining budget in seconds (never negative)."""
+        return max(0.0, self._expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget is used up."""
+        return self.remaining() <= 0.0
+
+    @property
+    def degraded(self) -> bool:
+        """Whether any string fell back to the policy."""
+        return self.fallbacks > 0
+
+    def allows(self, estimated_seconds: float) -> bool:
+        """Whether work with the given estimated cost fits into the remaining budget."""
+        remaining = self.remaining()
+        return remaining > 0.0 and estimated_seconds <= remaining
+
+    def fallback(self, text: str, findings: List[Finding]) -> List[Finding]:
+        """
+        Applies the policy to a string whose NER was not completed.
+
+        Args:
+            text: The string.
+            findings: The findings that were obtained within the budget.
+
+        Returns:
+            The findings to sanitize the string with.
+
+        Raises:
+            DeadlineExceeded: If the policy is `RAISE`.
+        """
+        self.fallbacks += 1
+        if self.policy == DeadlinePolicy.RAISE:
+            raise DeadlineExceeded(
+                f"NER did not finish within the budget of {self.budget_ms} ms."
+            )
+        if self.policy == DeadlinePolicy.REDACT_FIELD:
+            return [Finding(
+                text=text,
+                pii_type=FIELD_REDACTION.name,
+                start=0,
+                end=len(text),
+                recognizer=FIELD_REDACTION,
+                score=1.0
+            )]
+        return findings
@@ -1,12 +1,19 @@
+import inspect
 import spacy
 from functools import wraps
 from importlib import resources
 from l8e_beam.redactor import PiiDecoratorBackend
 # from .redactor import _recursive_redact, _get_model
+from typing import Optional
 from l8e_beam.enums import ModelType, PiiAction
 
 
-def redact_pii(model: ModelType = ModelType.SM, action: PiiAction = PiiAction.REDACT):
+def redact_pii(
+    model: ModelType = ModelType.SM,
+    action: PiiAction = PiiAction.REDACT,
+    escalate_to: Optional[ModelType] = None,
+    stream_batch_size: int = 1
+):
     """
     A decorator to automatically process PII in a function's arguments and return value.
 
@@ -14,6 +21,9 @@ def redact_pii(model: ModelType = ModelType.SM, action: PiiAction = PiiAction.RE
     scans `args` and `kwargs`, processes any strings, dictionaries, lists, or
     Pydantic models, and then does the same for the function's output.
 
+    If the function returns a generator or an async generator, the output is
+    wrapped so that every yielded item is sanitized lazily, as it is consumed.
+
     Args:
         model (ModelType): The spaCy model to use for NER-based PII detection.
             - `ModelType.SM`: A small, fast, general-purpose model.
@@ -22,6 +32,12 @@ def redact_pii(model: ModelType = ModelType.SM, action: PiiAction = PiiAction.RE
             - `PiiAction.REDACT`: Replaces PII with a placeholder (e.g., `[REDACTED PERSON]`).
             - `PiiAction.ANONYMIZE`: Replaces PII with realistic fake data.
             - `PiiAction.IGNORE`: Leaves the PII untouched.
+        escalate_to (Optional[ModelType]): Enables cascade mode. Every value is
+            scanned with `model`, and only entity-bearing sentences are re-run
+            through this (typically `ModelType.TRF`) model.
+        stream_batch_size (int): For generator return values, the number of
+            consecutive yielded strings sanitized together via `nlp.pipe`.
+            The default of 1 sanitizes each item as soon as it is yielded.
 
     Returns:
         The decorated function, which will have its inputs and outputs sanitized.
@@ -47,7 +63,7 @@ def redact_pii(model: ModelType = ModelType.SM, action: PiiAction = PiiAction.RE
         @wraps(func)
         def wrapper(*args, **kwargs):
             # 1. Instantiate the backend. It will handle caching.
-            backend = PiiDecoratorBackend(model=model, action=action)
+            backend = PiiDecoratorBackend(model=model, action=action, escalate_to=escalate_to)
 
             # 2. Process all inputs to the function
             processed_args = backend.process_data(args)
@@ -56,7 +72,12 @@ def redact_pii(model: ModelType = ModelType.SM, action: PiiAction = PiiAction.RE
             # 3. Call the original function with the processed inputs
             result = func(*processed_args, **processed_kwargs)
 
-            # 4. Process the output of the function
+            # 4. Process the output of the function. Generators are wrapped
+            #    so that their items are sanitized lazily.
+            if inspect.isgenerator(result):
+                return backend.process_iterator(result, batch_size=stream_batch_size)
+            if inspect.isasyncgen(result):
+                return backend.aprocess_iterator(result, batch_size=stream_batch_size)
             processed_result = backend.process_data(result)
 
             return processed_result
@@ -22,8 +22,11 @@ class PiiAction(Enum):
         REDACT: Replaces the PII with a placeholder label (e.g., `[PERSON]`).
         ANONYMIZE: Replaces the PII with realistic fake data.
         IGNORE: Takes no action and leaves the original text.
+        TOKENIZE: Replaces the PII with a unique, reversible placeholder
+            (e.g., `[PERSON_1]`) kept in a `l8e_beam.vault.TokenVault`.
     """
 
     REDACT = "redact"
     ANONYMIZE = "anonymize"
-    IGNORE = "ignore"
\ No newline at end of file
+    IGNORE = "ignore"
+    TOKENIZE = "tokenize"
\ No newline at end of file
@@ -0,0 +1,366 @@
+# src/l8e_beam/evaluation.py
+
+"""
+An offline harness for comparing models and recognizer policies.
+
+Choosing between `ModelType.SM`, `ModelType.TRF`, a cascade or a custom
+recognizer set is a trade-off between detection quality and speed. This
+module measures both on a labeled corpus:
+
+- per-type and overall precision, recall and F1, and
+- throughput (docs/s), per-document latency (p50/p95) and peak memory.
+
+The corpus is a JSONL file with one document per line:
+
+    {"text": "Call Jane Doe at 555-867-5309.", "spans": [
+        {"start": 5, "end": 13, "label": "PERSON"},
+        {"start": 17, "end": 29, "label": "PHONE"}]}
+
+Labels are compared with the `pii_type` of findings (recognizer names such
+as `PERSON`, `EMAIL`); `label_map` translates other label schemes.
+Findings are resolved exactly like `PiiProcessor.apply_findings` does
+(earliest start wins on overlap), so the scores reflect the sanitized
+output. Everything runs locally on CPU; nothing is downloaded.
+
+Run it from the command line with `l8e-beam evaluate` (see `l8e_beam.cli`).
+"""
+import json
+import multiprocessing
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from l8e_beam.recognizers.pii_processor import PiiProcessor, _rss_bytes
+
+Span = Tuple[int, int, str]
+
+
+@dataclass
+class Example:
+    """A document with its gold PII spans `(start, end, label)`."""
+    text: str
+    spans: List[Span]
+
+
+@dataclass
+class TypeScores:
+    """
+    Span-level counts and scores for one PII type.
+
+    Attributes:
+        tp (int): Predicted spans that match a gold span.
+        fp (int): Predicted spans without a matching gold span.
+        fn (int): Gold spans that were not predicted.
+    """
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+
+    @property
+    def precision(self) -> float:
+        return self.tp / (self.tp + self.fp) if self.tp + self.fp else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.tp / (self.tp + self.fn) if self.tp + self.fn else 0.0
+
+    @property
+    def f1(self) -> float:
+        p, r = self.precision, self.recall
+        return 2 * p * r / (p + r) if p + r else 0.0
+
+
+@dataclass
+class EvaluationReport:
+    """
+    The quality and performance of one configuration on a corpus.
+
+    Attributes:
+        name (str): The configuration name.
+        per_type (Dict[str, TypeScores]): Scores per PII type.
+        overall (TypeScores): Micro-averaged scores over all types.
+        docs (int): Number of evaluated documents.
+        seconds (float): Total processing time, i.e. the sum of `latencies`;
+            memory sampling and scoring are not included.
+        latencies (List[float]): Per-document processing time in seconds.
+        peak_rss_delta_bytes (Optional[int]): The peak growth of the process
+            RSS over `baseline_rss` (see `evaluate`), or `None` where RSS is
+            unavailable. Through `compare` this includes building the
+            processor and loading its model.
+    """
+    name: str
+    per_type: Dict[str, TypeScores] = field(default_factory=dict)
+    overall: TypeScores = field(default_factory=TypeScores)
+    docs: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    peak_rss_delta_bytes: Optional[int] = None
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.docs / self.seconds if self.seconds else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Returns a latency percentile in seconds (nearest-rank)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, -(-len(ordered) * percentile // 100))
+        return ordered[int(rank) - 1]
+
+    def to_dict(self) -> dict:
+        """Returns a JSON-serializable summary."""
+        def scores(s: TypeScores) -> dict:
+            return {
+                "tp": s.tp, "fp": s.fp, "fn": s.fn,
+                "precision": s.precision, "recall": s.recall, "f1": s.f1,
+            }
+        return {
+            "name": self.name,
+            "overall": scores(self.overall),
+            "per_type": {label: scores(s) for label, s in sorted(self.per_type.items())},
+            "docs": self.docs,
+            "docs_per_second": self.docs_per_second,
+            "latency_p50_ms": self.latency_percentile(50) * 1000,
+            "latency_p95_ms": self.latency_percentile(95) * 1000,
+            "peak_rss_delta_bytes": self.peak_rss_delta_bytes,
+        }
+
+
+def load_corpus(path: str) -> List[Example]:
+    """
+    Loads a JSONL corpus of documents with gold spans.
+
+    Args:
+        path: The JSONL file; see the module docstring for the format.
+
+    Returns:
+        The examples, in file order.
+
+    Raises:
+        ValueError: If a line is malformed or a span is out of range.
+    """
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                text = record["text"]
+                spans = [(s["start"], s["end"], s["label"]) for s in record.get("spans", [])]
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"{path}:{line_number}: invalid record: {exc}") from exc
+            for start, end, _ in spans:
+                if not 0 <= start < end <= len(text):
+                    raise ValueError(f"{path}:{line_number}: span ({start}, {end}) is out of range.")
+            examples.append(Example(text=text, spans=spans))
+    return examples
+
+
+def predicted_spans(processor: PiiProcessor, text: str) -> List[Span]:
+    """
+    Returns the spans a processor would replace in a text.
+
+    Overlapping findings are resolved like `PiiProcessor.apply_findings`.
+    """
+    findings = sorted(processor.get_findings(text), key=lambda f: f.start)
+    spans = []
+    last_end = 0
+    for finding in findings:
+        if finding.start < last_end:
+            continue
+        spans.append((finding.start, finding.end, finding.pii_type))
+        last_end = finding.end
+    return spans
+
+
+def _score(report: EvaluationReport, gold: Iterable[Span], predicted: Iterable[Span]):
+    gold_set: Set[Span] = set(gold)
+    predicted_set: Set[Span] = set(predicted)
+    for start, end, label in predicted_set:
+        scores = report.per_type.setdefault(label, TypeScores())
+        if (start, end, label) in gold_set:
+            scores.tp += 1
+            report.overall.tp += 1
+        else:
+            scores.fp += 1
+            report.overall.fp += 1
+    for span in gold_set - predicted_set:
+        report.per_type.setdefault(span[2], TypeScores()).fn += 1
+        report.overall.fn += 1
+
+
+def evaluate(
+    processor: PiiProcessor,
+    examples: List[Example],
+    name: str = "default",
+    label_map: Optional[Dict[str, str]] = None,
+    warmup: int = 3,
+    baseline_rss: Optional[int] = None
+) -> EvaluationReport:
+    """
+    Evaluates one processor on a corpus.
+
+    Args:
+        processor: The processor to evaluate (its model already loaded).
+        examples: The labeled documents.
+        name: The configuration name used in the report.
+        label_map: Maps gold labels to `pii_type` names. Gold labels mapped
+            to `None` are ignored.
+        warmup: Number of documents processed before timing starts, so
+            one-time initialization does not skew the latencies.
+        baseline_rss: The RSS that `peak_rss_delta_bytes` is measured
+            from, e.g. taken before the processor was built. By default the
+            RSS after the warmup, so only the growth during inference is
+            reported and the model footprint is not.
+
+    Returns:
+        The report.
+    """
+    label_map = label_map or {}
+    for example in examples[:warmup]:
+        processor.get_findings(example.text)
+
+    report = EvaluationReport(name=name)
+    if baseline_rss is None:
+        baseline_rss = _rss_bytes()
+    peak_rss = _rss_bytes()
+    if peak_rss is not None and baseline_rss is not None:
+        peak_rss = max(peak_rss, baseline_rss)
+    for example in examples:
+        began = time.perf_counter()
+        predicted = predicted_spans(processor, example.text)
+        report.latencies.append(time.perf_counter() - began)
+
+        rss = _rss_bytes()
+        if rss is not None and peak_rss is not None:
+            peak_rss = max(peak_rss, rss)
+
+        gold = []
+        for start, end, label in example.spans:
+            label = label_map.get(label, label)
+            if label is not None:
+                gold.append((start, end, label))
+        _score(report, gold, predicted)
+    # Only the model calls are timed, not the memory sampling and scoring
+    report.seconds = sum(report.latencies)
+    report.docs = len(examples)
+    if baseline_rss is not None and peak_rss is not None:
+        report.peak_rss_delta_bytes = peak_rss - baseline_rss
+    return report
+
+
+def _evaluate_configuration(factory, examples, name, label_map, warmup) -> EvaluationReport:
+    """Builds a processor and evaluates it, measuring memory from before the build."""
+    baseline_rss = _rss_bytes()
+    return evaluate(
+        factory(), examples, name=name, label_map=label_map, warmup=warmup, baseline_rss=baseline_rss
+    )
+
+
+def _evaluate_in_child(conn, *args):
+    """The body of an isolated evaluation process; sends back the report or the error."""
+    try:
+        try:
+            result = (True, _evaluate_configuration(*args))
+        except Exception as exc:
+            result = (False, exc)
+        try:
+            conn.send(result)
+        except Exception as exc:
+            # The report or error could not be pickled.
+            conn.send((False, RuntimeError(f"{type(exc).__name__}: {exc}")))
+    finally:
+        conn.close()
+
+
+def _evaluate_isolated(factory, examples, name, label_map, warmup) -> EvaluationReport:
+    """Runs `_evaluate_configuration` in a forked process of its own."""
+    ctx = multiprocessing.get_context("fork")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_evaluate_in_child, args=(sender, factory, examples, name, label_map, warmup)
+    )
+    process.start()
+    sender.close()
+    try:
+        ok, result = receiver.recv()
+    except EOFError:
+        result = None
+    finally:
+        receiver.close()
+        process.join()
+    if result is None:
+        raise RuntimeError(f"Evaluating {name!r} failed (exit code {process.exitcode}).")
+    if not ok:
+        raise result
+    return result
+
+
+def compare(
+    configurations: Dict[str, Callable[[], PiiProcessor]],
+    examples: List[Example],
+    label_map: Optional[Dict[str, str]] = None,
+    warmup: int = 3,
+    isolate: bool = True
+) -> List[EvaluationReport]:
+    """
+    Evaluates several configurations on the same corpus.
+
+    Memory is measured from before each processor is built, so
+    `peak_rss_delta_bytes` includes the model footprint.
+
+    Args:
+        configurations: Maps a configuration name to a factory building its
+            processor, e.g. `lambda: build_processor(model=ModelType.TRF)`.
+            Model loading happens in the factory and is not timed.
+        examples: The labeled documents.
+        label_map: See `evaluate`.
+        warmup: See `evaluate`.
+        isolate: Whether to evaluate each configuration in a forked process
+            of its own. Otherwise models loaded by earlier configurations
+            (and memory the allocator has not returned) stay in the
+            process, and later configurations that reuse them are reported
+            as smaller than they are. Ignored where `fork` is unavailable.
+
+    Returns:
+        One report per configuration, in the given order.
+    """
+    run = _evaluate_configuration
+    if isolate and "fork" in multiprocessing.get_all_start_methods():
+        run = _evaluate_isolated
+    return [
+        run(factory, examples, name, label_map, warmup)
+        for name, factory in configurations.items()
+    ]
+
+
+def format_reports(reports: List[EvaluationReport]) -> str:
+    """Formats reports as a plain-text table, overall scores first, then per type."""
+    lines = [
+        f"{'config':<24} {'P':>6} {'R':>6} {'F1':>6} {'docs/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'peak MB':>8}"
+    ]
+    for report in reports:
+        rss = report.peak_rss_delta_bytes
+        lines.append(
+            f"{report.name:<24} {report.overall.precision:>6.3f} {report.overall.recall:>6.3f} "
+            f"{report.overall.f1:>6.3f} {report.docs_per_second:>9.1f} "
+            f"{report.latency_percentile(50) * 1000:>8.2f} {report.latency_percentile(95) * 1000:>8.2f} "
+            f"{(rss / 1024 / 1024 if rss is not None else float('nan')):>8.1f}"
+        )
+    lines.append("")
+    lines.append(f"{'config':<24} {'type':<16} {'P':>6} {'R':>6} {'F1':>6} {'support':>8}")
+    by_type: Dict[str, List[EvaluationReport]] = defaultdict(list)
+    for report in reports:
+        for label in report.per_type:
+            by_type[label].append(report)
+    for label in sorted(by_type):
+        for report in by_type[label]:
+            s = report.per_type[label]
+            lines.append(
+                f"{report.name:<24} {label:<16} {s.precision:>6.3f} {s.recall:>6.3f} "
+                f"{s.f1:>6.3f} {s.tp + s.fn:>8}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,221 @@
+# src/l8e_beam/file_scanner.py
+
+"""
+Memory-mapped, bytes-level redaction of large files for regex-only policies.
+
+`sanitize_pii` works on Python `str` objects, so redacting a multi-gigabyte
+log file means decoding all of it first. When a policy only uses
+`RegexRecognizer`s, that is unnecessary: this module memory-maps the input,
+runs each recognizer's pattern compiled as a *bytes* pattern, and streams
+the output, copying unchanged byte ranges straight from the map without
+decoding them. Only matched bytes are decoded (to call `validate` and
+`anonymize`).
+
+The file is scanned in windows of `chunk_size` bytes. Each window is
+searched together with a lookahead of `max_match_length` bytes, so a match
+that starts in the window but crosses into the next one is still found in
+full. Matches longer than `max_match_length` are not supported.
+
+Input is assumed to be UTF-8 or another ASCII-compatible encoding. Patterns
+are compiled as bytes patterns, so classes like `\\d` and `\\b` are ASCII-only.
+"""
+import mmap
+import re
+import shutil
+from typing import Iterator, List, Optional
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.base import Finding, Recognizer, RegexRecognizer
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+from l8e_beam.recognizers.pii_processor import replacement_text
+from l8e_beam.recognizers.recognizers import REGEX_RECOGNIZERS
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_MATCH_LENGTH = 1024
+
+
+def compile_bytes_pattern(recognizer: RegexRecognizer) -> "re.Pattern[bytes]":
+    """
+    Compiles a recognizer's `str` pattern as an equivalent `bytes` pattern.
+
+    Args:
+        recognizer: The regex recognizer to convert.
+
+    Returns:
+        The compiled bytes pattern.
+
+    Raises:
+        ValueError: If the pattern cannot be expressed as a bytes pattern.
+    """
+    pattern = recognizer.regex
+    try:
+        return re.compile(pattern.pattern.encode("utf-8"), pattern.flags & ~re.UNICODE)
+    except re.error as exc:
+        raise ValueError(
+            f"Recognizer '{recognizer.name}' cannot be used for bytes-level scanning: {exc}"
+        ) from exc
+
+
+class BytesRegexScanner:
+    """
+    Scans a bytes-like buffer with a set of regex recognizers.
+
+    Attributes:
+        recognizers (List[RegexRecognizer]): The recognizers to run.
+        patterns (List[re.Pattern]): The recognizers' patterns, compiled as bytes.
+        chunk_size (int): The size of each scanned window in bytes.
+        max_match_length (int): The lookahead past each window, in bytes.
+    """
+    def __init__(
+        self,
+        recognizers: List[RegexRecognizer],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_match_length: int = DEFAULT_MAX_MATCH_LENGTH
+    ):
+        """
+        Initializes the scanner and compiles all patterns.
+
+        Args:
+            recognizers: The regex recognizers to run.
+            chunk_size: The size of each scanned window in bytes.
+            max_match_length: The longest match that is guaranteed to be
+                found when it crosses a window boundary.
+        """
+        for recognizer in recognizers:
+            if not isinstance(recognizer, RegexRecognizer):
+                raise ValueError(
+                    f"Recognizer '{recognizer.name}' is not a RegexRecognizer; "
+                    "bytes-level scanning supports regex recognizers only."
+                )
+        self.recognizers = recognizers
+        self.patterns = [compile_bytes_pattern(r) for r in recognizers]
+        self.chunk_size = chunk_size
+        self.max_match_length = max_match_length
+
+    def _window_findings(self, buf, pos: int, window_end: int, scan_end: int) -> List[Finding]:
+        """Collects validated findings that start inside `[pos, window_end)`."""
+        findings = []
+        for recognizer, pattern in zip(self.recognizers, self.patterns):
+            for match in pattern.finditer(buf, pos, scan_end):
+                if match.start() >= window_end:
+                    break
+                if match.end() == match.start():
+                    continue
+                matched_text = match.group(0).decode("utf-8", errors="replace")
+                if recognizer.validate(matched_text):
+                    findings.append(Finding(
+                        text=matched_text,
+                        pii_type=recognizer.name,
+                        start=match.start(),
+                        end=match.end(),
+                        score=0.85,
+                        recognizer=recognizer
+                    ))
+        findings.sort(key=lambda f: f.start)
+        return findings
+
+    def iter_findings(self, buf) -> Iterator[Finding]:
+        """
+        Yields non-overlapping findings over the whole buffer in offset order.
+
+        Offsets are byte offsets into `buf`. Overlaps are resolved the same
+        way as in `PiiProcessor`: the earliest-starting finding wins.
+
+        Args:
+            buf: A bytes-like object (e.g., an `mmap.mmap`).
+        """
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            window_end = min(size, pos + self.chunk_size)
+            scan_end = min(size, window_end + self.max_match_length)
+            last_end = pos
+            for finding in self._window_findings(buf, pos, window_end, scan_end):
+                if finding.start < last_end:
+                    continue
+                yield finding
+                last_end = finding.end
+            # Resume after the window, or after a match that crossed into the next one
+            pos = max(window_end, last_end)
+
+    def redact_to(self, buf, out, action: PiiAction = PiiAction.REDACT) -> int:
+        """
+        Writes `buf` to the binary stream `out` with all findings replaced.
+
+        Unchanged byte ranges are copied from `buf` without decoding.
+
+        Args:
+            buf: A bytes-like object (e.g., an `mmap.mmap`).
+            out: A writable binary file object.
+            action: The PII action to perform.
+
+        Returns:
+            The number of findings that were replaced.
+        """
+        view = memoryview(buf)
+        try:
+            count = 0
+            cursor = 0
+            for finding in self.iter_findings(buf):
+                out.write(view[cursor:finding.start])
+                out.write(replacement_text(finding, action).encode("utf-8"))
+                cursor = finding.end
+                count += 1
+            out.write(view[cursor:])
+            return count
+        finally:
+            view.release()
+
+
+def sanitize_file(
+    input_path: str,
+    output_path: str,
+    action: PiiAction = PiiAction.REDACT,
+    custom_recognizers: Optional[List[Recognizer]] = None,
+    disabled_recognizers: Optional[List[DEFAULT_RECOGNIZERS]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_match_length: int = DEFAULT_MAX_MATCH_LENGTH
+) -> int:
+    """
+    Redacts a (potentially huge) file with regex recognizers only.
+
+    The input is memory-mapped and scanned at the bytes level; the output is
+    written in streaming fashion. spaCy recognizers are never run, so this is
+    suited for regex-only policies on log archives.
+
+    Args:
+        input_path: The file to read.
+        output_path: The file to write the sanitized content to.
+        action: The PII action to perform (`REDACT`, `ANONYMIZE`, or `IGNORE`).
+        custom_recognizers: Additional `RegexRecognizer` instances to run.
+        disabled_recognizers: Default regex recognizers to disable.
+        chunk_size: The size of each scanned window in bytes.
+        max_match_length: The longest match guaranteed to be found across windows.
+
+    Returns:
+        The number of findings that were replaced.
+
+    Example:
+        ```python
+        from l8e_beam.file_scanner import sanitize_file
+
+        replaced = sanitize_file("app.log", "app.redacted.log")
+        ```
+    """
+    disabled_names = {d.value for d in (disabled_recognizers or [])}
+    recognizers = [
+        r for r in REGEX_RECOGNIZERS if r.name not in disabled_names
+    ] + list(custom_recognizers or [])
+    scanner = BytesRegexScanner(
+        recognizers, chunk_size=chunk_size, max_match_length=max_match_length
+    )
+
+    with open(input_path, "rb") as src, open(output_path, "wb") as out:
+        if action == PiiAction.IGNORE:
+            shutil.copyfileobj(src, out)
+            return 0
+        # mmap cannot map empty files
+        if src.seek(0, 2) == 0:
+            return 0
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return scanner.redact_to(buf, out, action)
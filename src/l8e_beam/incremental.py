@@ -0,0 +1,226 @@
+# src/l8e_beam/incremental.py
+
+"""
+Incremental re-sanitization of edited documents.
+
+When a user changes a few words in a long document, running all
+recognizers over the whole text again wastes almost all of the work.
+`resanitize` takes the previous text, its findings and the new text, and:
+
+- finds the changed region as the text between the common prefix and the
+  common suffix of both versions (compared in chunks, at memcmp speed);
+- rescans only a window around it: the changed region plus a context
+  margin, widened to paragraph (or line, or word) boundaries and to any
+  finding that straddles the window;
+- reuses the findings outside the window, shifted by the change in length.
+
+The cost of the recognizers therefore tracks the size of the edit rather
+than the size of the document. With `PiiAction.ANONYMIZE`, pass the
+`surrogates` of the previous result so that unchanged PII keeps its fake
+values.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, MutableMapping, Optional, Sequence, Tuple
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.base import Finding
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+# Characters compared at once when looking for the changed region.
+_CHUNK = 4096
+
+# The smallest context margin: the longest regex match that is guaranteed
+# to be found whole when an edit creates, extends or destroys it (as the
+# default `max_match_length` of `l8e_beam.streaming`).
+MIN_MARGIN = 128
+
+
+@dataclass
+class IncrementalResult:
+    """
+    The outcome of sanitizing one version of a document.
+
+    Attributes:
+        source (str): The text that was sanitized.
+        text (str): The sanitized text.
+        findings (List[Finding]): The findings in `source`, ordered by start.
+        surrogates (Dict): The surrogate map used for the output; pass it
+            back to keep anonymized values stable.
+        rescanned (Tuple[int, int]): The span of `source` the recognizers ran on.
+    """
+    source: str
+    text: str
+    findings: List[Finding]
+    surrogates: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    rescanned: Tuple[int, int] = (0, 0)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Returns the length of the common prefix of two strings."""
+    n = min(len(a), len(b))
+    lo = 0
+    while lo < n:
+        hi = min(n, lo + _CHUNK)
+        if a[lo:hi] != b[lo:hi]:
+            while a[lo] == b[lo]:
+                lo += 1
+            return lo
+        lo = hi
+    return n
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Returns the length of the common suffix of two strings, at most `limit`."""
+    la, lb = len(a), len(b)
+    lo = 0
+    while lo < limit:
+        hi = min(limit, lo + _CHUNK)
+        if a[la - hi:la - lo] != b[lb - hi:lb - lo]:
+            while a[la - lo - 1] == b[lb - lo - 1]:
+                lo += 1
+            return lo
+        lo = hi
+    return limit
+
+
+def _boundary_before(text: str, pos: int, limit: int) -> int:
+    """The start of the paragraph, line or word around `pos`, at most `limit` characters back."""
+    lo = max(0, pos - limit)
+    for separator in ("\n\n", "\n", " "):
+        i = text.rfind(separator, lo, pos)
+        if i != -1:
+            return i + len(separator)
+    return lo
+
+
+def _boundary_after(text: str, pos: int, limit: int) -> int:
+    """The end of the paragraph, line or word around `pos`, at most `limit` characters ahead."""
+    hi = min(len(text), pos + limit)
+    for separator in ("\n\n", "\n", " "):
+        i = text.find(separator, pos, hi)
+        if i != -1:
+            return i
+    return hi
+
+
+def sanitize_document(
+    processor: PiiProcessor,
+    text: str,
+    action: PiiAction = PiiAction.REDACT,
+    surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None
+) -> IncrementalResult:
+    """
+    Sanitizes the first version of a document, keeping what `resanitize` needs.
+
+    Args:
+        processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+        text: The document.
+        action: The PII action to perform.
+        surrogates: An optional surrogate map to use and fill.
+
+    Returns:
+        The sanitized text with its findings.
+    """
+    surrogates = {} if surrogates is None else surrogates
+    findings = sorted(processor.get_findings(text), key=lambda f: f.start)
+    output = processor.apply_findings(text, findings, action, surrogates=surrogates)
+    return IncrementalResult(text, output, findings, surrogates, (0, len(text)))
+
+
+def resanitize(
+    processor: PiiProcessor,
+    old_text: str,
+    old_findings: Sequence[Finding],
+    new_text: str,
+    action: PiiAction = PiiAction.REDACT,
+    surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+    margin: int = 200,
+    max_context: int = 4000
+) -> IncrementalResult:
+    """
+    Sanitizes a new version of a document, rescanning only around the edit.
+
+    Args:
+        processor: The processor that found `old_findings`.
+        old_text: The previous version of the document.
+        old_findings: The findings of the previous version, e.g. from
+            `IncrementalResult.findings`.
+        new_text: The new version of the document.
+        action: The PII action to perform.
+        surrogates: The surrogate map of the previous result, so that
+            anonymized values stay the same.
+        margin: Characters of context rescanned on each side of the edit.
+            Values below `MIN_MARGIN` are raised to it: a smaller window
+            can cut through a match next to the edit and disagree with the
+            findings kept outside it.
+        max_context: How far past the margin to look for a paragraph, line
+            or word boundary.
+
+    Returns:
+        The sanitized new text with its findings.
+
+    Example:
+        ```python
+        from l8e_beam.api import build_processor
+        from l8e_beam.incremental import resanitize, sanitize_document
+
+        processor = build_processor()
+        result = sanitize_document(processor, draft)
+        result = resanitize(processor, result.source, result.findings, edited_draft,
+                            surrogates=result.surrogates)
+        print(result.text)
+        ```
+    """
+    surrogates = {} if surrogates is None else surrogates
+    margin = max(margin, MIN_MARGIN)
+    prefix = _common_prefix(old_text, new_text)
+    suffix = _common_suffix(old_text, new_text, min(len(old_text), len(new_text)) - prefix)
+    old_end = len(old_text) - suffix
+    new_end = len(new_text) - suffix
+    delta = len(new_text) - len(old_text)
+
+    if prefix == len(old_text) == len(new_text):
+        findings = sorted(old_findings, key=lambda f: f.start)
+        output = processor.apply_findings(new_text, findings, action, surrogates=surrogates)
+        return IncrementalResult(new_text, output, findings, surrogates, (prefix, prefix))
+
+    # Old findings in new coordinates; those touching the edit are stretched over it
+    shifted = []
+    for finding in old_findings:
+        if finding.end <= prefix:
+            start, end = finding.start, finding.end
+        elif finding.start >= old_end:
+            start, end = finding.start + delta, finding.end + delta
+        elif finding.start >= prefix and finding.end <= old_end:
+            # Deleted or replaced by the edit
+            continue
+        else:
+            start, end = min(finding.start, prefix), max(finding.end + delta, new_end)
+        shifted.append((start, end, finding))
+
+    window_start = _boundary_before(new_text, max(0, prefix - margin), max_context)
+    window_end = _boundary_after(new_text, min(len(new_text), new_end + margin), max_context)
+    # Never split a finding at the edge of the window
+    widened = True
+    while widened:
+        widened = False
+        for start, end, _ in shifted:
+            if start < window_start < end:
+                window_start, widened = start, True
+            if start < window_end < end:
+                window_end, widened = end, True
+
+    kept = [
+        finding if (start, end) == (finding.start, finding.end)
+        else Finding(finding.text, finding.pii_type, start, end, finding.recognizer, finding.score)
+        for start, end, finding in shifted
+        if end <= window_start or start >= window_end
+    ]
+    window = new_text[window_start:window_end]
+    rescanned = [
+        Finding(f.text, f.pii_type, f.start + window_start, f.end + window_start, f.recognizer, f.score)
+        for f in processor.get_findings(window)
+    ]
+    findings = sorted(kept + rescanned, key=lambda f: f.start)
+    output = processor.apply_findings(new_text, findings, action, surrogates=surrogates)
+    return IncrementalResult(new_text, output, findings, surrogates, (window_start, window_end))
@@ -0,0 +1,341 @@
+# src/l8e_beam/json_stream.py
+
+"""
+Streaming sanitization of very large JSON documents.
+
+`sanitize_pii` needs a document fully parsed into Python objects, which
+costs many times the file size in memory. `JsonStreamSanitizer` instead
+tokenizes the input incrementally and copies it to the output as it reads:
+
+- Structural characters, whitespace, numbers, literals, object keys and
+  strings that are not selected by the `PathFilter` are copied verbatim,
+  so the original formatting is preserved.
+- Selected string values are decoded, collected into batches of
+  `batch_size`, sanitized together with `PiiProcessor.process_batch`
+  (one `nlp.pipe` call per batch) and written back as JSON strings.
+
+Memory is bounded by the read chunk, the current token and one batch of
+strings, independently of the document size. Paths use the same notation
+as `PathFilter` and `process_recursive` (`messages.*.content`).
+
+The input is validated while it is read. On invalid JSON a `ValueError` is
+raised and the output written so far is incomplete.
+"""
+import json
+import re
+from typing import Any, List, MutableMapping, Optional, TextIO, Tuple, Union
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PathFilter, PiiProcessor
+from l8e_beam.vault import _BoundedSurrogates
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null")
+_DELIMITER = re.compile(r"[ \t\r\n,\]}]")
+
+# What the parser expects next inside an object or array
+_KEY, _COLON, _VALUE, _COMMA = "key", "colon", "value", "comma"
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class _Frame:
+    """An open object or array on the parser stack."""
+    __slots__ = ("is_object", "key", "index", "expect", "empty")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key = None
+        self.index = 0
+        self.expect = _KEY if is_object else _VALUE
+        self.empty = True
+
+
+class JsonStreamSanitizer:
+    """
+    Sanitizes a JSON text stream without loading the document into memory.
+
+    Attributes:
+        processor (PiiProcessor): The processor used for string values.
+        action (PiiAction): The PII action to perform.
+        paths (Optional[PathFilter]): Restricts which string values are sanitized.
+        batch_size (int): The number of strings sanitized together.
+        chunk_size (int): The number of characters read at a time.
+        max_buffer_chars (int): The amount of buffered output at which a
+            batch is processed early, even if it is not full.
+        strings (int): Number of string values sanitized so far.
+    """
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        paths: Optional[PathFilter] = None,
+        batch_size: int = 256,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_buffer_chars: int = 16 * 1024 * 1024,
+        max_surrogates: int = 100_000,
+        surrogates: Optional[Any] = None
+    ):
+        """
+        Initializes the sanitizer.
+
+        Args:
+            processor: The processor used for string values.
+            action: The PII action to perform.
+            paths: An optional include/exclude filter for string values.
+            batch_size: The number of strings per `process_batch` call.
+            chunk_size: The number of characters read at a time.
+            max_buffer_chars: The buffered output size that triggers an early batch.
+            max_surrogates: The maximum number of surrogates kept for
+                `PiiAction.ANONYMIZE`. A value seen again after its surrogate
+                was evicted may get a different one.
+            surrogates: An optional mapping of `(pii_type, original text)` to
+                replacement, e.g. to share surrogates with other components,
+                or the `TokenVault` required for `PiiAction.TOKENIZE`. It
+                should be bounded itself.
+        """
+        self.processor = processor
+        self.action = action
+        self.paths = paths
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.max_buffer_chars = max_buffer_chars
+        self.strings = 0
+        # Keeps anonymized values consistent across the document.
+        self._surrogates: MutableMapping[Tuple[str, str], str] = (
+            surrogates if surrogates is not None else _BoundedSurrogates(max(max_surrogates, 1))
+        )
+
+    def sanitize(self, src: TextIO, dst: TextIO) -> int:
+        """
+        Reads JSON from `src` and writes the sanitized JSON to `dst`.
+
+        Args:
+            src: A readable text stream.
+            dst: A writable text stream.
+
+        Returns:
+            The number of string values that were sanitized.
+
+        Raises:
+            ValueError: If the input is not valid JSON.
+        """
+        count = _Run(self, src, dst).run()
+        self.strings += count
+        return count
+
+
+class _Run:
+    """The state of one `JsonStreamSanitizer.sanitize` call."""
+
+    def __init__(self, sanitizer: JsonStreamSanitizer, src: TextIO, dst: TextIO):
+        self.sanitizer = sanitizer
+        self.src = src
+        self.dst = dst
+        self.buf = ""
+        self.pos = 0
+        self.raw_start = 0
+        self.consumed = 0  # characters dropped from the front of `buf`
+        self.eof = False
+        self.stack: List[_Frame] = []
+        # Buffered output: raw text, or the index of a pending string
+        self.parts: List[Union[str, int]] = []
+        self.parts_chars = 0
+        self.pending: List[str] = []
+        self.count = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"Invalid JSON at offset {self.consumed + self.pos}: {message}")
+
+    def fill(self) -> bool:
+        """Reads another chunk; drops the already copied prefix of the buffer."""
+        if self.eof:
+            return False
+        if self.raw_start < self.pos:
+            self.emit(self.buf[self.raw_start:self.pos])
+        self.buf = self.buf[self.pos:]
+        self.consumed += self.pos
+        self.pos = self.raw_start = 0
+        chunk = self.src.read(self.sanitizer.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def emit(self, part: Union[str, int]):
+        self.parts.append(part)
+        if isinstance(part, str):
+            self.parts_chars += len(part)
+        if not self.pending:
+            self.flush()
+        elif (len(self.pending) >= self.sanitizer.batch_size
+              or self.parts_chars >= self.sanitizer.max_buffer_chars):
+            self.flush()
+
+    def flush(self):
+        sanitized = []
+        if self.pending:
+            sanitizer = self.sanitizer
+            sanitized = sanitizer.processor.process_batch(
+                self.pending, sanitizer.action, surrogates=sanitizer._surrogates
+            )
+            self.count += len(self.pending)
+        self.dst.write("".join(
+            part if isinstance(part, str) else json.dumps(sanitized[part], ensure_ascii=False)
+            for part in self.parts
+        ))
+        self.parts = []
+        self.parts_chars = 0
+        self.pending = []
+
+    def skip_whitespace(self) -> bool:
+        """Moves to the next significant character; returns `False` at the end of input."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return True
+            if not self.fill():
+                return False
+
+    def match_string(self) -> "re.Match":
+        """Matches a string token at the cursor, reading until its closing quote."""
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match is not None:
+                return match
+            if not self.fill():
+                raise self.error("unterminated string")
+
+    def match_scalar(self) -> "re.Match":
+        """Matches a number or literal at the cursor, reading until the next delimiter."""
+        while True:
+            delimiter = _DELIMITER.search(self.buf, self.pos)
+            if delimiter is not None or not self.fill():
+                break
+            if _SCALAR.match(self.buf, self.pos) is None and len(self.buf) - self.pos >= 5:
+                # Not even a prefix of a number or literal; fail before reading on.
+                break
+        stop = delimiter.start() if delimiter is not None else len(self.buf)
+        match = _SCALAR.fullmatch(self.buf, self.pos, stop)
+        if match is None:
+            raise self.error("invalid token")
+        return match
+
+    def path(self) -> Tuple:
+        return tuple(frame.key if frame.is_object else frame.index for frame in self.stack)
+
+    def begin_value(self, frame: Optional[_Frame]):
+        if frame is not None and frame.expect != _VALUE:
+            raise self.error(f"expected {frame.expect}")
+
+    def end_value(self, frame: Optional[_Frame]):
+        if frame is not None:
+            frame.expect = _COMMA
+            frame.empty = False
+
+    def run(self) -> int:
+        paths = self.sanitizer.paths
+        seen_root = False
+        while self.skip_whitespace():
+            char = self.buf[self.pos]
+            frame = self.stack[-1] if self.stack else None
+            if frame is None and seen_root:
+                raise self.error("unexpected data after the document")
+
+            if char in "{[":
+                self.begin_value(frame)
+                self.stack.append(_Frame(char == "{"))
+                seen_root = True
+                self.pos += 1
+            elif char in "}]":
+                if (frame is None or frame.is_object != (char == "}")
+                        or not (frame.expect == _COMMA or frame.empty)):
+                    raise self.error(f"unexpected '{char}'")
+                self.stack.pop()
+                self.end_value(self.stack[-1] if self.stack else None)
+                self.pos += 1
+            elif char == ",":
+                if frame is None or frame.expect != _COMMA:
+                    raise self.error("unexpected ','")
+                if frame.is_object:
+                    frame.expect = _KEY
+                else:
+                    frame.expect = _VALUE
+                    frame.index += 1
+                self.pos += 1
+            elif char == ":":
+                if frame is None or frame.expect != _COLON:
+                    raise self.error("unexpected ':'")
+                frame.expect = _VALUE
+                self.pos += 1
+            elif char == '"':
+                match = self.match_string()
+                try:
+                    value = json.loads(match.group(0))
+                except ValueError as exc:
+                    raise self.error(f"invalid string: {exc}") from exc
+                if frame is not None and frame.expect == _KEY:
+                    frame.key = value
+                    frame.expect = _COLON
+                    frame.empty = False
+                else:
+                    self.begin_value(frame)
+                    seen_root = True
+                    if paths is None or paths.selects(self.path()):
+                        if self.raw_start < match.start():
+                            self.emit(self.buf[self.raw_start:match.start()])
+                        self.pending.append(value)
+                        self.raw_start = match.end()
+                        self.emit(len(self.pending) - 1)
+                    self.end_value(frame)
+                self.pos = match.end()
+            else:
+                self.begin_value(frame)
+                match = self.match_scalar()
+                seen_root = True
+                self.end_value(frame)
+                self.pos = match.end()
+
+        if self.stack or not seen_root:
+            raise self.error("unexpected end of input")
+        if self.raw_start < len(self.buf):
+            self.parts.append(self.buf[self.raw_start:])
+        self.flush()
+        return self.count
+
+
+def sanitize_json_file(
+    input_path: str,
+    output_path: str,
+    processor: PiiProcessor,
+    action: PiiAction = PiiAction.REDACT,
+    paths: Optional[PathFilter] = None,
+    **options
+) -> int:
+    """
+    Sanitizes a (potentially huge) JSON file in a streaming fashion.
+
+    Args:
+        input_path: The JSON file to read.
+        output_path: The file to write the sanitized JSON to.
+        processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+        action: The PII action to perform.
+        paths: An optional `PathFilter`, e.g. `PathFilter(include=["messages.*.content"])`.
+        **options: Passed on to `JsonStreamSanitizer`.
+
+    Returns:
+        The number of string values that were sanitized.
+
+    Example:
+        ```python
+        from l8e_beam.api import build_processor
+        from l8e_beam.json_stream import sanitize_json_file
+
+        sanitize_json_file("export.json", "export.clean.json", build_processor())
+        ```
+    """
+    sanitizer = JsonStreamSanitizer(processor, action, paths=paths, **options)
+    with open(input_path, encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as dst:
+        return sanitizer.sanitize(src, dst)
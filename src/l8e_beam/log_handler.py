@@ -0,0 +1,297 @@
+# src/l8e_beam/log_handler.py
+
+"""
+Non-blocking, PII-free logging.
+
+Sanitizing log records in a `logging.Filter` puts NER latency on every
+`logger.info` call in the request thread. `SanitizingQueueListener` moves
+that work off the hot path, following the `QueueHandler`/`QueueListener`
+pattern of the standard library:
+
+- `listener.handler` is attached to loggers. In the calling thread it only
+  merges the message with its args and formats the traceback (so that
+  later changes to the args cannot alter the record), then enqueues it.
+- A worker thread collects records into batches (up to `max_batch_size`
+  records, or whatever arrived within `max_wait_ms`), sanitizes messages
+  and tracebacks with one `PiiProcessor.process_batch` call (and thus one
+  `nlp.pipe` call), and forwards the records to the real handlers.
+- The queue is bounded. When it is full, `OverflowPolicy.BLOCK` makes
+  the caller wait (up to `block_timeout`, then drops the record), and
+  `OverflowPolicy.DROP` drops the record at once. Dropped records are
+  counted in `dropped`.
+- `stop` flushes all queued records before it returns, and is registered
+  with `atexit` while the listener runs. Records logged after `stop` are
+  sanitized and forwarded in the calling thread, so that late logging
+  (e.g. from other `atexit` handlers) neither blocks nor gets lost.
+
+If sanitization fails, records are forwarded with a placeholder message
+rather than their original text.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from enum import Enum
+from typing import List, Optional, Tuple
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+# Tells the worker thread to exit.
+_STOP = object()
+
+# Replaces messages that could not be sanitized.
+FAILED_MESSAGE = "[REDACTED: sanitization failed]"
+
+
+class OverflowPolicy(Enum):
+    """
+    What happens to a record when the queue is full.
+
+    Attributes:
+        BLOCK: The caller waits for space (see `block_timeout`).
+        DROP: The record is dropped immediately.
+    """
+    BLOCK = "block"
+    DROP = "drop"
+
+
+class SanitizingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues log records for a `SanitizingQueueListener`.
+
+    Create it through `SanitizingQueueListener.handler`.
+    """
+    def __init__(self, listener: "SanitizingQueueListener"):
+        super().__init__(listener.queue)
+        self.listener = listener
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Returns a copy of the record with its message and traceback as plain text."""
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        self.listener._put(record)
+
+
+class SanitizingQueueListener:
+    """
+    Sanitizes log records in a background thread and forwards them to handlers.
+
+    Attributes:
+        processor (PiiProcessor): The processor used for the messages.
+        handlers (tuple): The handlers that receive the sanitized records.
+        action (PiiAction): The PII action to perform.
+        policy (OverflowPolicy): What to do with records when the queue is full.
+        block_timeout (Optional[float]): With `OverflowPolicy.BLOCK`, the
+            maximum seconds to wait for space, or `None` to wait forever.
+        max_batch_size (int): The maximum number of records per batch.
+        max_wait_ms (float): How long the first record of a batch may wait
+            for more records.
+        respect_handler_level (bool): Whether handler levels are honored,
+            as in `logging.handlers.QueueListener`.
+        queue (queue.Queue): The bounded queue between handler and worker.
+        handled (int): Number of records forwarded so far.
+        dropped (int): Number of records dropped because the queue was full.
+        batches (int): Number of batches sanitized so far.
+        errors (int): Number of batches whose sanitization failed.
+    """
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        *handlers: logging.Handler,
+        action: PiiAction = PiiAction.REDACT,
+        max_queue_size: int = 10_000,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        block_timeout: Optional[float] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        respect_handler_level: bool = True
+    ):
+        """
+        Initializes the listener.
+
+        Args:
+            processor: The processor used to sanitize the messages.
+            *handlers: The handlers that receive the sanitized records.
+            action: The PII action to perform.
+            max_queue_size: The maximum number of queued records.
+            policy: What to do with records when the queue is full.
+            block_timeout: With `OverflowPolicy.BLOCK`, the maximum seconds
+                to wait for space before dropping the record.
+            max_batch_size: The maximum number of records per batch.
+            max_wait_ms: The maximum time in milliseconds a record waits for
+                a batch to fill up.
+            respect_handler_level: Whether a handler only gets records at or
+                above its level.
+        """
+        if max_queue_size < 1 or max_batch_size < 1:
+            raise ValueError("max_queue_size and max_batch_size must be at least 1.")
+        self.processor = processor
+        self.handlers = handlers
+        self.action = action
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.respect_handler_level = respect_handler_level
+        self.queue: "queue.Queue" = queue.Queue(max_queue_size)
+        self.handled = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self._worker: Optional[threading.Thread] = None
+        self._worker_ident: Optional[int] = None
+        self._handler: Optional[SanitizingQueueHandler] = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        # Callers between their `_stopped` check and the end of their put;
+        # `stop` waits for them, see `_put`.
+        self._putting = 0
+        self._put_done = threading.Condition(self._lock)
+
+    @property
+    def handler(self) -> SanitizingQueueHandler:
+        """The handler to attach to loggers; it feeds this listener."""
+        with self._lock:
+            if self._handler is None:
+                self._handler = SanitizingQueueHandler(self)
+            return self._handler
+
+    def _put(self, record: logging.LogRecord):
+        """Enqueues a record according to the overflow policy."""
+        with self._lock:
+            stopped = self._stopped
+            if not stopped:
+                self._putting += 1
+        if stopped:
+            # Nothing would take the record off the queue any more
+            self._handle([record])
+            return
+        # Records logged by the worker itself (e.g. by the model) must not
+        # wait for the worker, or it would wait for itself.
+        block = self.policy is OverflowPolicy.BLOCK and threading.get_ident() != self._worker_ident
+        try:
+            if block:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        finally:
+            with self._lock:
+                self._putting -= 1
+                self._put_done.notify_all()
+
+    def start(self):
+        """Starts the worker thread."""
+        with self._lock:
+            if self._worker is not None:
+                raise RuntimeError("SanitizingQueueListener is already started.")
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="l8e-beam-logging", daemon=True)
+            self._worker.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Forwards all queued records, then stops the worker thread."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            if worker is None:
+                return
+            self._stopped = True
+        atexit.unregister(self.stop)
+        self.queue.put(_STOP)
+        worker.join()
+        # Records enqueued while the worker was stopping. Callers that
+        # passed the `_stopped` check before it was set may still be putting
+        # (and waiting for space), so drain until all of them are done.
+        late = []
+        with self._put_done:
+            while True:
+                while True:
+                    try:
+                        late.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not self._putting:
+                    break
+                self._put_done.wait(0.01)
+        self._handle([record for record in late if record is not _STOP])
+
+    def __enter__(self) -> "SanitizingQueueListener":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _collect(self, first) -> Tuple[List[logging.LogRecord], bool]:
+        """Collects a batch that starts with `first`; returns it and whether to stop."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self.queue.get(timeout=timeout)
+                else:
+                    item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        self._worker_ident = threading.get_ident()
+        stop = False
+        while not stop:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            batch, stop = self._collect(item)
+            self._handle(batch)
+
+    def _handle(self, records: List[logging.LogRecord]):
+        """Sanitizes records and forwards them to the handlers."""
+        if not records:
+            return
+        self._sanitize(records)
+        for record in records:
+            self._forward(record)
+
+    def _sanitize(self, records: List[logging.LogRecord]):
+        """Sanitizes the messages, tracebacks and stack traces of a batch in place."""
+        fields = [
+            (record, attr)
+            for record in records
+            for attr in ("msg", "exc_text", "stack_info")
+            if getattr(record, attr)
+        ]
+        try:
+            texts = self.processor.process_batch(
+                [getattr(record, attr) for record, attr in fields], self.action
+            )
+        except Exception:
+            self.errors += 1
+            texts = [FAILED_MESSAGE] * len(fields)
+        self.batches += 1
+        for (record, attr), text in zip(fields, texts):
+            setattr(record, attr, text)
+
+    def _forward(self, record: logging.LogRecord):
+        self.handled += 1
+        for handler in self.handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
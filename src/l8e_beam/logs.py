@@ -0,0 +1,419 @@
+# src/l8e_beam/logs.py
+
+"""
+Log sanitization with online template mining.
+
+Application logs are millions of lines printed by a few thousand
+statements: `User 4711 logged in from 10.0.0.7` differs from the next
+line only in its parameters. `LogSanitizer` learns these templates online
+with a Drain-style parse tree and avoids running NER over the constant
+parts of each line:
+
+- Lines are routed through a fixed-depth tree (token count, then the
+  first tokens) to a few candidate templates, and joined with the most
+  similar one. Positions where lines differ become wildcards (`<*>`).
+- The first line of a template is scanned in full. Constant tokens that
+  overlap a finding become wildcards, so the remaining constant tokens are
+  known to be clean.
+- Later lines run the regex recognizers over the whole line, which is
+  cheap and catches matches that straddle constant and variable tokens.
+  Only the variable slots go through NER, and only when the NER
+  prefilter deems them entity-like. Slot results are memoized.
+- Memory is bounded: at most `max_templates` templates are kept (least
+  recently used ones are evicted), each token node of the tree has at most
+  `max_children` children, and the slot memo and the anonymization
+  surrogates hold `memo_size` entries each.
+
+NER sees slots without their surrounding template, so entities that
+need context to be recognized can be missed in variable slots.
+"""
+import copy
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, MutableMapping, Optional, Tuple
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.base import Finding
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.vault import _BoundedSurrogates
+
+WILDCARD = "<*>"
+_TOKEN = re.compile(r"\S+")
+_DIGIT = re.compile(r"\d")
+_MACHINE = re.compile(r"[\d_]")
+
+
+def _machine_token(text: str) -> bool:
+    """Whether a slot is a single lowercase token with digits or underscores, like an ID."""
+    return text.islower() and bool(_MACHINE.search(text)) and not any(c.isspace() for c in text)
+
+
+class _Node:
+    """A node of the parse tree."""
+    __slots__ = ("children", "templates")
+
+    def __init__(self):
+        self.children: Dict = {}
+        self.templates: List["_Template"] = []
+
+
+class _Template:
+    """A learned log template; `tokens` holds constants and wildcards."""
+    __slots__ = ("tokens", "path", "lines", "verified")
+
+    def __init__(self, tokens: List[str], path: List[Tuple[_Node, object]]):
+        self.tokens = tokens
+        # (parent node, key) pairs from the root to the leaf, for pruning
+        self.path = path
+        self.lines = 1
+        self.verified = False
+
+    def __str__(self) -> str:
+        return " ".join(self.tokens)
+
+
+class LogSanitizer:
+    """
+    Sanitizes log lines, running NER only on the variable parts of known templates.
+
+    Attributes:
+        processor (PiiProcessor): The processor used for full scans.
+        action (PiiAction): The PII action to perform.
+        depth (int): The number of leading tokens used to route a line.
+        similarity (float): The minimum fraction of tokens a line must share
+            with a template (wildcards match any token) to join it.
+        max_children (int): The maximum number of children per token node.
+        max_templates (int): The maximum number of templates kept.
+        memo_size (int): The maximum number of memoized slot values and anonymization surrogates.
+        lines (int): Number of non-blank lines sanitized so far.
+        full_scans (int): Lines scanned in full (new or unverified templates).
+        slots (int): Distinct slot values sent to NER so far.
+        memo_hits (int): Slot values answered from the memo.
+        evictions (int): Templates evicted so far.
+    """
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        depth: int = 2,
+        similarity: float = 0.5,
+        max_children: int = 100,
+        max_templates: int = 10_000,
+        memo_size: int = 50_000,
+        surrogates: Optional[Any] = None
+    ):
+        """
+        Initializes the sanitizer.
+
+        Args:
+            processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+            action: The PII action to perform.
+            depth: The number of leading tokens used to route a line.
+            similarity: The minimum fraction of equal tokens to join a template.
+            max_children: The maximum number of children per token node;
+                further tokens are routed to a wildcard child.
+            max_templates: The maximum number of templates kept.
+            memo_size: The maximum number of memoized slot values, and of
+                surrogates kept for `PiiAction.ANONYMIZE`. A value seen again
+                after its surrogate was evicted may get a different one.
+            surrogates: An optional mapping of `(pii_type, original text)` to
+                replacement, e.g. to share surrogates with other components,
+                or the `TokenVault` required for `PiiAction.TOKENIZE`. It
+                should be bounded itself.
+        """
+        if depth < 0:
+            raise ValueError("depth must not be negative.")
+        if max_templates < 1 or max_children < 1:
+            raise ValueError("max_templates and max_children must be at least 1.")
+        self.processor = processor
+        self.action = action
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_templates = max_templates
+        self.memo_size = memo_size
+        self.lines = 0
+        self.full_scans = 0
+        self.slots = 0
+        self.memo_hits = 0
+        self.evictions = 0
+        self._root = _Node()
+        self._templates: "OrderedDict[_Template, None]" = OrderedDict()
+        self._memo: "OrderedDict[str, Tuple]" = OrderedDict()
+        # Keeps anonymized values consistent across lines.
+        self._surrogates: MutableMapping[Tuple[str, str], str] = (
+            surrogates if surrogates is not None else _BoundedSurrogates(max(memo_size, 1))
+        )
+        # Shallow copies sharing the model: one without NER, one without regexes.
+        self._regex_processor = self._variant(spacy_recognizers=[])
+        self._ner_processor = self._variant(regex_recognizers=[])
+        prefilter = self.processor.ner_prefilter
+        if prefilter is not None and prefilter.skip_single_lowercase_tokens:
+            # A slot is often a single token, and a lowercase one in a line
+            # of prose can still be a name.
+            self._ner_processor.ner_prefilter = prefilter.replace(skip_single_lowercase_tokens=False)
+
+    def _variant(self, **recognizers) -> PiiProcessor:
+        processor = copy.copy(self.processor)
+        for attr, value in recognizers.items():
+            setattr(processor, attr, value)
+        # The copy shares the model, which only the original may recycle.
+        processor.recycler = None
+        return processor
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def templates(self) -> List[str]:
+        """Returns the learned templates, most recently used last."""
+        return [str(template) for template in self._templates]
+
+    # --- Template mining ---
+
+    def _route(self, tokens: List[str]) -> Tuple[_Node, List[Tuple[_Node, object]]]:
+        """Walks the tree to the leaf of a line, creating nodes as needed."""
+        node = self._root.children.get(len(tokens))
+        if node is None:
+            node = self._root.children[len(tokens)] = _Node()
+        path: List[Tuple[_Node, object]] = [(self._root, len(tokens))]
+        for token in tokens[:self.depth]:
+            key = WILDCARD if _DIGIT.search(token) else token
+            if key not in node.children:
+                # As in Drain, the last child of a full node is a wildcard
+                # that takes all further tokens.
+                if WILDCARD in node.children:
+                    if len(node.children) >= self.max_children:
+                        key = WILDCARD
+                elif len(node.children) + 1 >= self.max_children:
+                    key = WILDCARD
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = _Node()
+            path.append((node, key))
+            node = child
+        return node, path
+
+    def _match(self, tokens: List[str]) -> _Template:
+        """Returns the template of a line, learning or updating it."""
+        leaf, path = self._route(tokens)
+        best, best_same = None, -1
+        for template in leaf.templates:
+            same = params = 0
+            for constant, token in zip(template.tokens, tokens):
+                if constant == WILDCARD:
+                    params += 1
+                elif constant == token:
+                    same += 1
+            # Wildcards match any token, but among the templates similar
+            # enough, the one with the most equal constants wins.
+            if (same + params) / len(tokens) >= self.similarity and same > best_same:
+                best, best_same = template, same
+
+        if best is not None:
+            best.tokens = [c if c == t else WILDCARD for c, t in zip(best.tokens, tokens)]
+            best.lines += 1
+            self._templates.move_to_end(best)
+            return best
+
+        template = _Template(list(tokens), path)
+        leaf.templates.append(template)
+        self._templates[template] = None
+        while len(self._templates) > self.max_templates:
+            self._evict(self._templates.popitem(last=False)[0])
+        return template
+
+    def _evict(self, template: _Template):
+        """Removes a template and prunes the tree nodes left empty."""
+        self.evictions += 1
+        parent, key = template.path[-1]
+        leaf = parent.children[key]
+        leaf.templates.remove(template)
+        for parent, key in reversed(template.path):
+            node = parent.children[key]
+            if node.children or node.templates:
+                break
+            del parent.children[key]
+
+    # --- Sanitization ---
+
+    @staticmethod
+    def _slots(line: str, spans: List[Tuple[int, int]], template: _Template) -> List[Tuple[int, int]]:
+        """Returns the character spans of runs of wildcard tokens."""
+        slots = []
+        for (start, end), constant in zip(spans, template.tokens):
+            if constant != WILDCARD:
+                continue
+            if slots and line[slots[-1][1]:start].isspace():
+                slots[-1] = (slots[-1][0], end)
+            else:
+                slots.append((start, end))
+        return slots
+
+    def _slot_findings(self, slot_texts: List[str]) -> Dict[str, Tuple]:
+        """Runs NER on slot values, using and filling the memo."""
+        found: Dict[str, Tuple] = {}
+        missing = []
+        for text in slot_texts:
+            if text in found:
+                continue
+            entry = self._memo.get(text)
+            if entry is not None:
+                self._memo.move_to_end(text)
+                found[text] = entry
+                self.memo_hits += 1
+            else:
+                found[text] = ()
+                missing.append(text)
+        if missing:
+            self.slots += len(missing)
+            for text, findings in zip(missing, self._ner_processor.get_findings_batch(missing)):
+                entry = tuple((f.pii_type, f.start, f.end, f.score, f.recognizer) for f in findings)
+                found[text] = entry
+                if self.memo_size:
+                    self._memo[text] = entry
+                    if len(self._memo) > self.memo_size:
+                        self._memo.popitem(last=False)
+        return found
+
+    def sanitize_batch(self, lines: List[str]) -> List[str]:
+        """
+        Sanitizes a batch of log lines.
+
+        Args:
+            lines: The lines, with or without line endings.
+
+        Returns:
+            The sanitized lines, in order.
+        """
+        parsed = []
+        for line in lines:
+            matches = list(_TOKEN.finditer(line))
+            if not matches:
+                parsed.append(None)
+                continue
+            template = self._match([m.group(0) for m in matches])
+            parsed.append((template, [m.span() for m in matches]))
+        self.lines += sum(1 for entry in parsed if entry is not None)
+
+        # The first line of each new template is scanned in full; the other
+        # lines of the batch use the template once it is verified.
+        full, known = [], []
+        first = set()
+        for i, entry in enumerate(parsed):
+            if entry is None:
+                continue
+            template = entry[0]
+            if template.verified or template in first:
+                known.append(i)
+            else:
+                first.add(template)
+                full.append(i)
+        findings: Dict[int, List[Finding]] = {}
+        if full:
+            self.full_scans += len(full)
+            for i, line_findings in zip(full, self.processor.get_findings_batch([lines[i] for i in full])):
+                findings[i] = line_findings
+                template, spans = parsed[i]
+                # Tokens that contain PII can never be trusted as constants
+                for position, (start, end) in enumerate(spans):
+                    if any(f.start < end and start < f.end for f in line_findings):
+                        template.tokens[position] = WILDCARD
+            for i in full:
+                parsed[i][0].verified = True
+
+        if known:
+            regex_findings = self._regex_processor.get_findings_batch([lines[i] for i in known])
+            slots: Dict[int, List[Tuple[int, int]]] = {}
+            for i, line_findings in zip(known, regex_findings):
+                line = lines[i]
+                # Slots inside a regex finding, and machine tokens, need no NER
+                slots[i] = [
+                    (start, end) for start, end in self._slots(line, parsed[i][1], parsed[i][0])
+                    if not _machine_token(line[start:end])
+                    and not any(f.start <= start and end <= f.end for f in line_findings)
+                ] if self.processor.spacy_recognizers else []
+            slot_findings = self._slot_findings(
+                [lines[i][start:end] for i in known for start, end in slots[i]]
+            )
+            for i, line_findings in zip(known, regex_findings):
+                line = lines[i]
+                line_findings = list(line_findings)
+                for start, end in slots[i]:
+                    for pii_type, f_start, f_end, score, recognizer in slot_findings.get(line[start:end], ()):
+                        line_findings.append(Finding(
+                            text=line[start + f_start:start + f_end],
+                            pii_type=pii_type,
+                            start=start + f_start,
+                            end=start + f_end,
+                            recognizer=recognizer,
+                            score=score
+                        ))
+                findings[i] = line_findings
+
+        return [
+            self.processor.apply_findings(line, findings[i], self.action, surrogates=self._surrogates)
+            if i in findings else line
+            for i, line in enumerate(lines)
+        ]
+
+    def sanitize(self, line: str) -> str:
+        """Sanitizes a single log line; see `sanitize_batch`."""
+        return self.sanitize_batch([line])[0]
+
+    def sanitize_lines(self, lines: Iterable[str], batch_size: int = 256) -> Iterator[str]:
+        """
+        Sanitizes a stream of log lines lazily, in batches.
+
+        Args:
+            lines: The lines, e.g. an open log file.
+            batch_size: The number of lines processed together.
+
+        Yields:
+            The sanitized lines, in order.
+        """
+        batch: List[str] = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield from self.sanitize_batch(batch)
+                batch = []
+        if batch:
+            yield from self.sanitize_batch(batch)
+
+
+def sanitize_log_file(
+    input_path: str,
+    output_path: str,
+    processor: PiiProcessor,
+    action: PiiAction = PiiAction.REDACT,
+    encoding: str = "utf-8",
+    **options
+) -> LogSanitizer:
+    """
+    Sanitizes a (potentially huge) log file line by line.
+
+    Args:
+        input_path: The log file to read.
+        output_path: The file to write the sanitized log to.
+        processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+        action: The PII action to perform.
+        encoding: The encoding of both files.
+        **options: Passed on to `LogSanitizer`.
+
+    Returns:
+        The `LogSanitizer`, with its statistics and learned templates.
+
+    Example:
+        ```python
+        from l8e_beam.api import build_processor
+        from l8e_beam.logs import sanitize_log_file
+
+        sanitizer = sanitize_log_file("app.log", "app.clean.log", build_processor())
+        print(len(sanitizer), "templates,", sanitizer.full_scans, "full scans")
+        ```
+    """
+    sanitizer = LogSanitizer(processor, action, **options)
+    with open(input_path, encoding=encoding, newline="") as src, \
+            open(output_path, "w", encoding=encoding, newline="") as dst:
+        dst.writelines(sanitizer.sanitize_lines(src))
+    return sanitizer
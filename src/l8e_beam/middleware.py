@@ -0,0 +1,414 @@
+# src/l8e_beam/middleware.py
+
+"""
+ASGI and WSGI middleware that sanitizes JSON request and response bodies.
+
+Decorating every endpoint (see `examples/integrate_fastapi.py`) is easy
+to forget for a new route. The middleware in this module sanitizes a whole
+application instead, and works with any ASGI (FastAPI, Starlette, ...) or
+WSGI (Flask, Django, ...) framework:
+
+- JSON bodies are parsed once, and all their strings are scanned in one
+  batch with `PiiProcessor.process_recursive_batch` (one `nlp.pipe` call).
+- `RouteRule`s select, per route, whether requests and/or responses are
+  sanitized and which fields (`include`/`exclude`, see `PathFilter`).
+- Bodies that are not JSON, are compressed, or are larger than
+  `max_body_bytes` pass through unchanged, without being buffered beyond
+  the limit. So do JSON bodies that cannot be parsed, `HEAD` requests and
+  responses that have no body (1xx, 204, 304), whose headers describe a
+  body that is never sent.
+- At most `max_concurrency` bodies are sanitized at the same time. The
+  ASGI middleware runs them in a thread pool, so the event loop never
+  blocks on NER.
+"""
+import asyncio
+import fnmatch
+import io
+import json
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PathFilter, PiiProcessor
+
+
+class RouteRule:
+    """
+    Sanitization settings for the routes matching a pattern.
+
+    Attributes:
+        route (str): A glob pattern for the request path (e.g. `/api/*`).
+        paths (Optional[PathFilter]): The JSON fields to sanitize, or `None` for all.
+        request (bool): Whether request bodies are sanitized.
+        response (bool): Whether response bodies are sanitized.
+    """
+    def __init__(
+        self,
+        route: str,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        request: bool = True,
+        response: bool = True
+    ):
+        """
+        Initializes the rule.
+
+        Args:
+            route: A glob pattern for the request path, as in `fnmatch`.
+            include: Path patterns of the JSON fields to sanitize (see `PathFilter`).
+            exclude: Path patterns of the JSON fields to leave untouched.
+            request: Whether request bodies are sanitized.
+            response: Whether response bodies are sanitized.
+        """
+        self.route = route
+        self.paths = PathFilter(include, exclude) if include or exclude else None
+        self.request = request
+        self.response = response
+
+    def matches(self, path: str) -> bool:
+        """Whether the rule applies to a request path."""
+        return fnmatch.fnmatchcase(path, self.route)
+
+
+class _BodySanitizer:
+    """The parts shared by the ASGI and WSGI middleware."""
+
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        action: PiiAction,
+        routes: Sequence[RouteRule],
+        max_body_bytes: int,
+        max_concurrency: int
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.processor = processor
+        self.action = action
+        # Routes without a rule of their own are sanitized in full
+        self.routes = list(routes) + [RouteRule("*")]
+        self.max_body_bytes = max_body_bytes
+        self.max_concurrency = max_concurrency
+        self.sanitized = 0
+        self.passed_through = 0
+
+    def rule_for(self, path: str) -> RouteRule:
+        """Returns the first rule matching a request path."""
+        return next(rule for rule in self.routes if rule.matches(path))
+
+    def accepts(
+        self,
+        content_type: Optional[str],
+        content_encoding: Optional[str] = None,
+        content_length: Optional[str] = None
+    ) -> bool:
+        """Whether a body with these headers should be sanitized."""
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        if not (media_type == "application/json" or media_type.endswith("+json")):
+            return False
+        if content_encoding and content_encoding.strip().lower() != "identity":
+            return False
+        if content_length:
+            try:
+                if int(content_length) > self.max_body_bytes:
+                    return False
+            except ValueError:
+                return False
+        return True
+
+    def sanitize_body(self, body: bytes, rule: RouteRule) -> bytes:
+        """Sanitizes a JSON body; returns it unchanged if it is empty or not valid JSON."""
+        if not body.strip():
+            return body
+        try:
+            data = json.loads(body)
+        except ValueError:
+            self.passed_through += 1
+            return body
+        data = self.processor.process_recursive_batch(data, self.action, paths=rule.paths)
+        self.sanitized += 1
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _bodiless(status: int) -> bool:
+    """Whether responses with this status code never have a body."""
+    return 100 <= status < 200 or status in (204, 304)
+
+
+def _header(headers: Iterable, name: bytes) -> Optional[str]:
+    """Returns an ASGI header value, or `None`."""
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _with_length(headers: Iterable, length: int) -> List:
+    """Returns ASGI headers with the content length replaced."""
+    headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+    headers.append((b"content-length", str(length).encode("latin-1")))
+    return headers
+
+
+class SanitizingASGIMiddleware(_BodySanitizer):
+    """
+    Sanitizes the JSON request and response bodies of an ASGI application.
+
+    Attributes:
+        app: The wrapped ASGI application.
+        processor (PiiProcessor): The processor used for the bodies.
+        action (PiiAction): The PII action to perform.
+        routes (List[RouteRule]): The route rules, first match wins; unmatched
+            routes are sanitized in full.
+        max_body_bytes (int): Larger bodies pass through unchanged.
+        max_concurrency (int): The maximum number of bodies sanitized at once.
+        sanitized (int): Number of bodies sanitized so far.
+        passed_through (int): Number of JSON-typed bodies passed through
+            because they were too large or invalid.
+    """
+    def __init__(
+        self,
+        app: Callable,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        routes: Sequence[RouteRule] = (),
+        max_body_bytes: int = 1 << 20,
+        max_concurrency: int = 4,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initializes the middleware.
+
+        Args:
+            app: The ASGI application to wrap.
+            processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+            action: The PII action to perform.
+            routes: Route rules; the first rule matching a path applies.
+            max_body_bytes: Bodies larger than this pass through unchanged.
+            max_concurrency: The maximum number of bodies sanitized at once.
+            executor: The pool that runs the sanitization. Defaults to a
+                thread pool with `max_concurrency` threads.
+        """
+        super().__init__(processor, action, routes, max_body_bytes, max_concurrency)
+        self.app = app
+        self._executor = executor or ThreadPoolExecutor(max_concurrency, thread_name_prefix="l8e-beam-asgi")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _sanitize(self, body: bytes, rule: RouteRule) -> bytes:
+        """Sanitizes a body in the executor, at most `max_concurrency` at a time."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self.sanitize_body, body, rule)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        rule = self.rule_for(scope.get("path", "/"))
+        if rule.request:
+            scope, receive = await self._request(scope, receive, rule)
+        if rule.response:
+            send = self._response(send, rule)
+        await self.app(scope, receive, send)
+
+    async def _request(self, scope: Dict[str, Any], receive: Callable, rule: RouteRule):
+        """Reads and sanitizes the request body; returns the scope and receive to use."""
+        headers = scope.get("headers", [])
+        if not self.accepts(
+            _header(headers, b"content-type"),
+            _header(headers, b"content-encoding"),
+            _header(headers, b"content-length")
+        ):
+            return scope, receive
+
+        messages = []
+        size = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            size += len(message.get("body", b""))
+            if size > self.max_body_bytes:
+                self.passed_through += 1
+                break
+            if not message.get("more_body", False):
+                body = await self._sanitize(b"".join(m.get("body", b"") for m in messages), rule)
+                messages = [{"type": "http.request", "body": body, "more_body": False}]
+                scope = dict(scope, headers=_with_length(headers, len(body)))
+                break
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+        return scope, replay
+
+    def _response(self, send: Callable, rule: RouteRule) -> Callable:
+        """Wraps `send` to buffer and sanitize a JSON response body."""
+        start: Optional[Dict[str, Any]] = None
+        chunks: List[bytes] = []
+        size = 0
+
+        async def wrapped(message: Dict[str, Any]):
+            nonlocal start, size
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if not _bodiless(message["status"]) and self.accepts(
+                    _header(headers, b"content-type"),
+                    _header(headers, b"content-encoding"),
+                    _header(headers, b"content-length")
+                ):
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+                if message.get("more_body", False) and size <= self.max_body_bytes:
+                    return
+                if size > self.max_body_bytes:
+                    # Too large: send what was held back and stream the rest
+                    self.passed_through += 1
+                    held, start = start, None
+                    await send(held)
+                    await send(dict(message, body=b"".join(chunks)))
+                    return
+                body = await self._sanitize(b"".join(chunks), rule)
+                held, start = start, None
+                await send(dict(held, headers=_with_length(held.get("headers", []), len(body))))
+                await send({"type": "http.response.body", "body": body, "more_body": False})
+                return
+            await send(message)
+        return wrapped
+
+
+class _ClosingIterator:
+    """Iterates over chunks, then closes the original WSGI response."""
+
+    def __init__(self, chunks: Iterable[bytes], result: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._result = result
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        return next(self._chunks)
+
+    def close(self):
+        close = getattr(self._result, "close", None)
+        if close is not None:
+            close()
+
+
+class SanitizingWSGIMiddleware(_BodySanitizer):
+    """
+    Sanitizes the JSON request and response bodies of a WSGI application.
+
+    Attributes:
+        app: The wrapped WSGI application.
+        processor (PiiProcessor): The processor used for the bodies.
+        action (PiiAction): The PII action to perform.
+        routes (List[RouteRule]): The route rules, first match wins; unmatched
+            routes are sanitized in full.
+        max_body_bytes (int): Larger bodies pass through unchanged.
+        max_concurrency (int): The maximum number of bodies sanitized at once
+            across the server's threads.
+        sanitized (int): Number of bodies sanitized so far.
+        passed_through (int): Number of JSON-typed bodies passed through
+            because they were too large or invalid.
+    """
+    def __init__(
+        self,
+        app: Callable,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        routes: Sequence[RouteRule] = (),
+        max_body_bytes: int = 1 << 20,
+        max_concurrency: int = 4
+    ):
+        """
+        Initializes the middleware.
+
+        Args:
+            app: The WSGI application to wrap.
+            processor: The processor to use, e.g. from `l8e_beam.api.build_processor`.
+            action: The PII action to perform.
+            routes: Route rules; the first rule matching a path applies.
+            max_body_bytes: Bodies larger than this pass through unchanged.
+            max_concurrency: The maximum number of bodies sanitized at once.
+        """
+        super().__init__(processor, action, routes, max_body_bytes, max_concurrency)
+        self.app = app
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def _sanitize(self, body: bytes, rule: RouteRule) -> bytes:
+        with self._semaphore:
+            return self.sanitize_body(body, rule)
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+        rule = self.rule_for(environ.get("PATH_INFO") or "/")
+        # WSGI bodies can only be read safely with a known length
+        if rule.request and environ.get("CONTENT_LENGTH") and self.accepts(
+            environ.get("CONTENT_TYPE"),
+            environ.get("HTTP_CONTENT_ENCODING"),
+            environ.get("CONTENT_LENGTH")
+        ):
+            body = self._sanitize(environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"])), rule)
+            environ = dict(environ, CONTENT_LENGTH=str(len(body)))
+            environ["wsgi.input"] = io.BytesIO(body)
+        if not rule.response:
+            return self.app(environ, start_response)
+
+        captured: Dict[str, Any] = {}
+        written: List[bytes] = []
+
+        def capture(status, headers, exc_info=None):
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            return written.append
+
+        result = self.app(environ, capture)
+        iterator = iter(result)
+        # Generator apps only call `start_response` once iterated; they must
+        # do so before yielding their first chunk.
+        pending: List[bytes] = []
+        while "headers" not in captured:
+            chunk = next(iterator, None)
+            if chunk is None:
+                _ClosingIterator((), result).close()
+                raise RuntimeError("The WSGI application did not call start_response.")
+            pending.append(chunk)
+        headers = captured["headers"]
+        values = {key.lower(): value for key, value in headers}
+        if _bodiless(int(captured["status"].split(None, 1)[0])) or not self.accepts(
+            values.get("content-type"), values.get("content-encoding"), values.get("content-length")
+        ):
+            start_response(captured["status"], headers, captured["exc_info"])
+            return _ClosingIterator(_chain(written + pending, iterator), result)
+
+        chunks = written + pending
+        size = sum(map(len, chunks))
+        for chunk in iterator:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                self.passed_through += 1
+                start_response(captured["status"], headers, captured["exc_info"])
+                return _ClosingIterator(_chain(chunks, iterator), result)
+        _ClosingIterator((), result).close()
+
+        body = self._sanitize(b"".join(chunks), rule)
+        headers = [(key, value) for key, value in headers if key.lower() != "content-length"]
+        headers.append(("Content-Length", str(len(body))))
+        start_response(captured["status"], headers, captured["exc_info"])
+        return [body]
+
+
+def _chain(first: Iterable[bytes], rest: Iterable[bytes]):
+    yield from first
+    yield from rest
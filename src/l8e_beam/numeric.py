@@ -0,0 +1,198 @@
+# src/l8e_beam/numeric.py
+
+"""
+Batch scanning and validation for numeric PII recognizers.
+
+On number-heavy text (logs, exports, telemetry), the card and phone
+recognizers dominate the cost of the regex stage: every recognizer scans
+the whole text on its own, `validate` runs once per match in Python, and
+the loose phone pattern produces many matches. `NumericScanner` runs all
+numeric recognizers of a processor together:
+
+- A numeric recognizer declares `numeric_min_length` (see
+  `RegexRecognizer`): all its matches are runs of digits and separators of
+  at least that length. One C-level pass over the batch collects all such
+  runs, with one character of context on each side for word boundaries.
+  Each recognizer then scans the runs of all texts with a single
+  `finditer` call, so prose and short numbers (amounts, counters,
+  coordinates) are never scanned at all.
+- The candidates of a whole batch of texts are validated with one
+  `validate_batch` call per recognizer. The Luhn check of
+  `CreditCardRecognizer` uses NumPy arrays when NumPy is available.
+- Findings are exactly those of `RegexRecognizer.analyze`, in the same order.
+
+`PiiProcessor` uses the scanner automatically; recognizers that override
+`analyze` are never routed through it.
+"""
+import functools
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+from l8e_beam.recognizers.base import Finding, RegexRecognizer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Below this many numbers, the NumPy set-up costs more than it saves.
+NUMPY_MIN_BATCH = 32
+
+# Luhn doubling of a digit: 2 * d, minus 9 when that has two digits.
+_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
+@functools.lru_cache(maxsize=None)
+def _run_pattern(min_length: int) -> "re.Pattern":
+    """A run of digits and separators that can contain a numeric match."""
+    return re.compile(r"[\d(+][\d\s.\-()+]{%d,}" % (min_length - 1))
+
+
+def luhn_valid(text: str, min_digits: int = 13) -> bool:
+    """
+    Checks the digits of a string against the Luhn algorithm.
+
+    Non-digit characters are ignored.
+
+    Args:
+        text: The number, e.g. a card number.
+        min_digits: Numbers with fewer digits are invalid.
+    """
+    digits = [int(d) for d in text if d.isdigit()]
+    if len(digits) < min_digits:
+        return False
+    for i in range(len(digits) - 2, -1, -2):
+        digits[i] = _DOUBLED[digits[i]]
+    return sum(digits) % 10 == 0
+
+
+def luhn_valid_batch(texts: Sequence[str], min_digits: int = 13) -> List[bool]:
+    """
+    Checks many numbers against the Luhn algorithm at once.
+
+    Equivalent to `[luhn_valid(t, min_digits) for t in texts]`. Plain ASCII
+    numbers of the same length are checked together as one NumPy array.
+
+    Args:
+        texts: The numbers to check.
+        min_digits: Numbers with fewer digits are invalid.
+    """
+    if np is None or len(texts) < NUMPY_MIN_BATCH:
+        return [luhn_valid(text, min_digits) for text in texts]
+
+    results = [False] * len(texts)
+    by_length: Dict[int, List[int]] = {}
+    for i, text in enumerate(texts):
+        if text.isascii() and text.isdigit():
+            if len(text) >= min_digits:
+                by_length.setdefault(len(text), []).append(i)
+        else:
+            results[i] = luhn_valid(text, min_digits)
+
+    doubled = np.array(_DOUBLED, dtype=np.uint8)
+    for length, indices in by_length.items():
+        joined = "".join(texts[i] for i in indices).encode("ascii")
+        digits = (np.frombuffer(joined, dtype=np.uint8) - ord("0")).reshape(len(indices), length)
+        # Double every second digit, starting with the second to last
+        digits[:, length - 2::-2] = doubled[digits[:, length - 2::-2]]
+        valid = digits.sum(axis=1, dtype=np.int64) % 10 == 0
+        for i, ok in zip(indices, valid.tolist()):
+            results[i] = ok
+    return results
+
+
+class NumericScanner:
+    """
+    Runs a set of numeric regex recognizers over a batch of texts.
+
+    Attributes:
+        recognizers (List[RegexRecognizer]): The numeric recognizers, in order.
+    """
+    def __init__(self, recognizers: Sequence[RegexRecognizer]):
+        """
+        Initializes the scanner.
+
+        Args:
+            recognizers: Recognizers for which `is_numeric` is true.
+        """
+        self.recognizers = list(recognizers)
+        if not self.recognizers:
+            raise ValueError("NumericScanner needs at least one numeric recognizer.")
+        self._run = _run_pattern(min(r.numeric_min_length for r in self.recognizers))
+
+    @staticmethod
+    def is_numeric(recognizer) -> bool:
+        """Whether a recognizer can be run by the scanner."""
+        return (
+            isinstance(recognizer, RegexRecognizer)
+            and bool(recognizer.numeric_min_length)
+            and type(recognizer).analyze is RegexRecognizer.analyze
+        )
+
+    @classmethod
+    def for_recognizers(cls, recognizers: Sequence) -> Optional["NumericScanner"]:
+        """Returns a scanner for the numeric recognizers among `recognizers`, or `None`."""
+        numeric = [r for r in recognizers if cls.is_numeric(r)]
+        return cls(numeric) if numeric else None
+
+    def scan(self, texts: Sequence[str]) -> List[Dict[int, List[Finding]]]:
+        """
+        Finds the matches of all numeric recognizers in a batch of texts.
+
+        Args:
+            texts: The texts to scan.
+
+        Returns:
+            One dict per recognizer (in the order of `recognizers`), mapping
+            the index of a text to its findings. Texts without findings
+            are left out.
+        """
+        # Join the texts with a separator that no run can contain, and that
+        # `\b` treats like the start and end of a text.
+        joined = "\0" + "\0".join(texts) + "\0"
+        # The numeric runs, with one character of context on each side for `\b`
+        spans = [run.span() for run in self._run.finditer(joined)]
+        if not spans:
+            return [{} for _ in self.recognizers]
+        runs = "".join([joined[start - 1:end + 1] for start, end in spans])
+        # Where each run starts in `runs`, and where its text starts in `joined`
+        offsets = []
+        origins = []
+        text_starts = list(accumulate([1] + [len(text) + 1 for text in texts]))
+        size = 1
+        for start, end in spans:
+            offsets.append(size)
+            i = bisect_right(text_starts, start) - 1
+            origins.append((i, start - text_starts[i]))
+            size += end - start + 2
+
+        results = []
+        for recognizer in self.recognizers:
+            matches = []
+            for match in recognizer.regex.finditer(runs):
+                k = bisect_right(offsets, match.start()) - 1
+                i, start = origins[k]
+                shift = start - offsets[k]
+                matches.append((i, match.group(0), match.start() + shift, match.end() + shift))
+            results.append(self._findings(recognizer, matches))
+        return results
+
+    @staticmethod
+    def _findings(recognizer: RegexRecognizer, matches: List) -> Dict[int, List[Finding]]:
+        """Validates the matches of one recognizer and turns them into findings."""
+        if not (type(recognizer).validate is RegexRecognizer.validate
+                and type(recognizer).validate_batch is RegexRecognizer.validate_batch):
+            valid = recognizer.validate_batch([text for _, text, _, _ in matches])
+            matches = [match for match, ok in zip(matches, valid) if ok]
+        name = recognizer.name
+        found: Dict[int, List[Finding]] = {}
+        for i, text, start, end in matches:
+            finding = Finding(text, name, start, end, recognizer, 0.85)
+            findings = found.get(i)
+            if findings is None:
+                found[i] = [finding]
+            else:
+                findings.append(finding)
+        return found
@@ -9,15 +9,19 @@ To create a custom recognizer, you should inherit from one of these base classes
 - `Recognizer`: The generic abstract base class for all recognizers.
 - `RegexRecognizer`: A base class for recognizers that use regular expressions.
 - `SpacyRecognizer`: A base class for recognizers that use spaCy's NER models.
+- `DictionaryRecognizer`: A base class for recognizers that match a fixed list
+  of terms (deny-lists) with an Aho-Corasick automaton.
 
 It also defines the `Finding` dataclass, which is used to standardize the
 output of all recognizer `analyze` methods.
 """
 
 import re
+import pickle
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from spacy.tokens import Doc
 import faker
 # --- Component 1: The Finding Dataclass ---
@@ -74,7 +78,16 @@ class RegexRecognizer(Recognizer):
     An abstract base class for recognizers that use regular expressions.
 
     Subclasses must implement the `regex` property.
+
+    Numeric recognizers (cards, phones, IDs) can set `numeric_min_length`
+    when every match of `regex` is a run of at least that many digits,
+    whitespace, `.`, `-`, `(`, `)` and `+` characters that starts with a
+    digit, `(` or `+`. `PiiProcessor` then runs them together through
+    `l8e_beam.numeric.NumericScanner`, which skips texts without such runs
+    and validates matches in batches with `validate_batch`.
     """
+    numeric_min_length: Optional[int] = None
+
     @property
     @abstractmethod
     def regex(self) -> re.Pattern:
@@ -93,6 +106,18 @@ class RegexRecognizer(Recognizer):
         """
         return True
 
+    def validate_batch(self, texts: List[str]) -> List[bool]:
+        """
+        Validates several matches at once.
+
+        Override this together with `validate` for vectorized checks. By
+        default, it calls `validate` on each match.
+
+        Returns:
+            One flag per match, as `validate` would return it.
+        """
+        return [self.validate(text) for text in texts]
+
     def analyze(self, text: str, findings: List[Finding]):
         """
         Scans the text for matches using the `regex` pattern.
@@ -139,4 +164,222 @@ class SpacyRecognizer(Recognizer):
                     end=ent.end_char,
                     score=0.90, # Higher confidence for spaCy entities
                     recognizer=self
-                ))
\ No newline at end of file
+                ))
+
+
+class AhoCorasickAutomaton:
+    """
+    A multi-pattern string matcher built from a list of terms.
+
+    The automaton is compiled once; `search` then finds every occurrence of
+    every term in a single linear pass over the text, regardless of the
+    number of terms.
+
+    Case-insensitive matching lowercases one character at a time (characters
+    whose lowercase form is longer than one character are kept as-is), so
+    match offsets always refer to the original text.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, terms: Iterable[str] = (), case_sensitive: bool = False):
+        """
+        Compiles the automaton.
+
+        Args:
+            terms: The terms to match. Empty terms are ignored.
+            case_sensitive: Whether matching is case-sensitive.
+        """
+        self.case_sensitive = case_sensitive
+        # State 0 is the root. goto[s] maps a character to the next state,
+        # fail[s] is the failure link and out[s] holds the lengths of all
+        # terms that end in state s (including those reached via fail links).
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple[int, ...]] = [()]
+        for term in terms:
+            self._add(term)
+        self._build_fail_links()
+
+    def _fold(self, char: str) -> str:
+        if self.case_sensitive:
+            return char
+        lowered = char.lower()
+        return lowered if len(lowered) == 1 else char
+
+    def _add(self, term: str):
+        if not term:
+            return
+        state = 0
+        for char in term:
+            char = self._fold(char)
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+                self.goto[state][char] = next_state
+            state = next_state
+        if len(term) not in self.out[state]:
+            self.out[state] += (len(term),)
+
+    def _build_fail_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.out[next_state] += self.out[self.fail[next_state]]
+
+    def __len__(self) -> int:
+        """The number of states in the automaton."""
+        return len(self.goto)
+
+    def search(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yields `(start, end)` offsets of every term occurrence in `text`.
+
+        Occurrences are yielded in order of their end offset and may overlap.
+        """
+        goto, fail, out = self.goto, self.fail, self.out
+        fold = self._fold
+        state = 0
+        for i, char in enumerate(text):
+            char = fold(char)
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in out[state]:
+                yield i + 1 - length, i + 1
+
+    def save(self, path: str):
+        """
+        Serializes the compiled automaton to a file.
+
+        Args:
+            path: The file to write.
+        """
+        with open(path, "wb") as f:
+            pickle.dump(
+                (self.FORMAT_VERSION, self.case_sensitive, self.goto, self.fail, self.out),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "AhoCorasickAutomaton":
+        """
+        Loads an automaton written by `save`.
+
+        The file is unpickled, so only load automatons from trusted locations.
+
+        Args:
+            path: The file to read.
+
+        Returns:
+            The loaded automaton.
+
+        Raises:
+            ValueError: If the file was written by an incompatible version.
+        """
+        with open(path, "rb") as f:
+            version, case_sensitive, goto, fail, out = pickle.load(f)
+        if version != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported automaton format version: {version}")
+        automaton = cls(case_sensitive=case_sensitive)
+        automaton.goto, automaton.fail, automaton.out = goto, fail, out
+        return automaton
+
+
+class DictionaryRecognizer(Recognizer):
+    """
+    An abstract base class for recognizers that match a fixed list of terms.
+
+    Use this for deny-lists (known customer names, internal codenames, ...)
+    that would otherwise become a huge regex alternation. The terms are
+    compiled into an `AhoCorasickAutomaton` on first use, and each text is
+    scanned in a single linear pass. Overlapping matches are resolved
+    leftmost-longest.
+
+    Subclasses must implement the `terms` property and can set:
+
+    - `case_sensitive` (default `False`)
+    - `whole_words` (default `True`): only match terms that are not part
+      of a longer word.
+
+    Example:
+        ```python
+        class CodenameRecognizer(DictionaryRecognizer):
+            name = "CODENAME"
+            terms = ["Project Bluebird", "Nightjar"]
+        ```
+    """
+    case_sensitive: bool = False
+    whole_words: bool = True
+
+    @property
+    @abstractmethod
+    def terms(self) -> Iterable[str]:
+        """The terms to search for."""
+        pass
+
+    @property
+    def automaton(self) -> AhoCorasickAutomaton:
+        """The compiled automaton, built from `terms` on first access."""
+        automaton = self.__dict__.get("_automaton")
+        if automaton is None:
+            automaton = AhoCorasickAutomaton(self.terms, case_sensitive=self.case_sensitive)
+            self.__dict__["_automaton"] = automaton
+        return automaton
+
+    def save_automaton(self, path: str):
+        """Serializes the compiled automaton so it can be loaded at startup."""
+        self.automaton.save(path)
+
+    def load_automaton(self, path: str):
+        """
+        Loads a previously saved automaton instead of compiling `terms`.
+
+        Raises:
+            ValueError: If the automaton's case sensitivity differs from this recognizer's.
+        """
+        automaton = AhoCorasickAutomaton.load(path)
+        if automaton.case_sensitive != self.case_sensitive:
+            raise ValueError(
+                f"Automaton case sensitivity does not match recognizer '{self.name}'."
+            )
+        self.__dict__["_automaton"] = automaton
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char == "_"
+
+    def analyze(self, text: str, findings: List[Finding]):
+        """
+        Scans the text for all terms in one pass.
+        """
+        matches = self.automaton.search(text)
+        if self.whole_words:
+            matches = (
+                (start, end) for start, end in matches
+                if (start == 0 or not self._is_word_char(text[start - 1]))
+                and (end == len(text) or not self._is_word_char(text[end]))
+            )
+        last_end = 0
+        for start, end in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if start < last_end:
+                continue
+            findings.append(Finding(
+                text=text[start:end],
+                pii_type=self.name,
+                start=start,
+                end=end,
+                score=0.85,
+                recognizer=self
+            ))
+            last_end = end
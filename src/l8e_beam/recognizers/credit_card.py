@@ -1,5 +1,7 @@
 """A recognizer for detecting credit card numbers."""
 import re
+from typing import List
+from l8e_beam.numeric import luhn_valid, luhn_valid_batch
 from l8e_beam.recognizers.base import RegexRecognizer
 from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
 
@@ -12,16 +14,15 @@ class CreditCardRecognizer(RegexRecognizer):
     """
     name = DEFAULT_RECOGNIZERS.CREDIT_CARD.value
     regex = re.compile(r"\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|6(?:011|5[0-9]{2})[0-9]{12}|3[47][0-9]{13})\b")
+    numeric_min_length = 13
 
     def validate(self, text: str) -> bool:
         """Check credit card number against the Luhn algorithm."""
-        digits = [int(d) for d in text if d.isdigit()]
-        if len(digits) < 13:
-            return False
-        for i in range(len(digits) - 2, -1, -2):
-            doubled = digits[i] * 2
-            digits[i] = doubled if doubled < 10 else doubled - 9
-        return sum(digits) % 10 == 0
-    
+        return luhn_valid(text, min_digits=13)
+
+    def validate_batch(self, texts: List[str]) -> List[bool]:
+        """Check many credit card numbers at once, vectorized with NumPy when available."""
+        return luhn_valid_batch(texts, min_digits=13)
+
     def anonymize(self, text: str) -> str:
         return self.faker.credit_card_number()
@@ -7,6 +7,11 @@ from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
 class PhoneRecognizer(RegexRecognizer):
     """Detects common phone number formats using a regular expression."""
     name = DEFAULT_RECOGNIZERS.PHONE.value
-    regex = re.compile(r"(\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+    # Every match is at least 10 digits and separators long. The leading
+    # lookahead checks this first, so positions in short numbers fail fast
+    # instead of backtracking through the optional groups.
+    regex = re.compile(r"(?=[\d(+][\d\s.\-()+]{9})(\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+    numeric_min_length = 10
+
     def anonymize(self, text: str) -> str:
         return self.faker.phone_number()
@@ -11,8 +11,535 @@ anonymize, or ignore) to the findings.
 
 from l8e_beam.enums import PiiAction, ModelType
 # from .base import Finding, RegexRecognizer, SpacyRecognizer
-from typing import List, Any
+from dataclasses import dataclass
+from typing import List, Any, Callable, Dict, Iterable, Optional, MutableMapping, Sequence, Tuple, Union
+import copy
+import gc
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import weakref
 import spacy
+from spacy.tokens import Doc, DocBin
+
+from l8e_beam.deadline import Deadline
+from l8e_beam.numeric import NumericScanner
+
+# Measured NER cost per character, per spaCy model and processor class. It
+# is kept with the model rather than the processor, so that processors built
+# per call (as by `sanitize_pii`) start from what earlier ones measured.
+_NER_COSTS: "weakref.WeakKeyDictionary[spacy.Language, Dict[type, float]]" = weakref.WeakKeyDictionary()
+
+
+class NerPrefilter:
+    """
+    A cheap, conservative gate that decides whether a string is worth
+    running through the spaCy NER pipeline.
+
+    Structured machine output (numbers, UUIDs, ISO timestamps, identifiers
+    like `user_id_42`) cannot contain the named entities the spaCy
+    recognizers look for, but running the model on it still costs a full
+    pipeline pass. The checks below are deliberately strict about what they
+    skip: anything that looks remotely like natural language is sent to NER.
+
+    Regex recognizers are never affected by the prefilter.
+
+    Prefilters are immutable, so one instance can safely be shared by many
+    processors (as the default one is); use `replace` for a variant.
+
+    Attributes:
+        min_length (int): Strings shorter than this (after stripping) are skipped.
+        skip_single_lowercase_tokens (bool): Skip strings that are a single
+            whitespace-free token without any uppercase letter
+            (e.g., `tech_ops`, `jdoe_123`).
+    """
+    # An alphabetic run of at least two letters, i.e. something word-like.
+    _WORD_RE = re.compile(r"[^\W\d_]{2,}")
+
+    def __init__(self, min_length: int = 2, skip_single_lowercase_tokens: bool = True):
+        """
+        Initializes the prefilter.
+
+        Args:
+            min_length: Minimum stripped length for a string to be sent to NER.
+            skip_single_lowercase_tokens: Whether to skip single lowercase tokens.
+        """
+        self._min_length = min_length
+        self._skip_single_lowercase_tokens = skip_single_lowercase_tokens
+
+    @property
+    def min_length(self) -> int:
+        return self._min_length
+
+    @property
+    def skip_single_lowercase_tokens(self) -> bool:
+        return self._skip_single_lowercase_tokens
+
+    def replace(self, **changes) -> "NerPrefilter":
+        """
+        Returns a copy of the prefilter with some settings changed.
+
+        Args:
+            **changes: New values for `min_length` and/or
+                `skip_single_lowercase_tokens`.
+        """
+        prefilter = copy.copy(self)
+        for name, value in changes.items():
+            if not isinstance(getattr(type(self), name, None), property):
+                raise TypeError(f"NerPrefilter has no setting {name!r}.")
+            setattr(prefilter, "_" + name, value)
+        return prefilter
+
+    def should_run_ner(self, text: str) -> bool:
+        """
+        Returns `True` if the text may contain named entities.
+
+        Args:
+            text: The input text.
+
+        Returns:
+            `False` only if the text is too short, contains no word-like
+            alphabetic run, or is a single lowercase machine token.
+        """
+        stripped = text.strip()
+        if len(stripped) < self.min_length:
+            return False
+        if not self._WORD_RE.search(stripped):
+            return False
+        if (self.skip_single_lowercase_tokens
+                and stripped.islower()
+                and not any(c.isspace() for c in stripped)):
+            return False
+        return True
+
+
+class PathFilter:
+    """
+    Selects which strings of a nested structure are sanitized, by their path.
+
+    The path of a value is the sequence of dict keys and list indices that
+    leads to it, written with dots: `messages.3.content`. Patterns use the
+    same notation, where `*` matches any single segment and `**` matches any
+    number of segments (e.g., `messages.*.content`, `**.password`).
+
+    A pattern selects the value at its path and everything below it. A
+    string is sanitized if it is selected by an `include` pattern (or no
+    `include` patterns are given) and not selected by any `exclude` pattern.
+
+    Attributes:
+        include (List[str]): The include patterns.
+        exclude (List[str]): The exclude patterns.
+    """
+    def __init__(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        """
+        Initializes the filter.
+
+        Args:
+            include: Patterns of the values to sanitize. `None` selects everything.
+            exclude: Patterns of the values to leave untouched.
+        """
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self._include = [tuple(p.split(".")) for p in self.include]
+        self._exclude = [tuple(p.split(".")) for p in self.exclude]
+
+    @classmethod
+    def _matches(cls, pattern: Tuple[str, ...], path: Tuple) -> bool:
+        """Whether `pattern` matches `path` or one of its ancestors."""
+        if not pattern:
+            return True
+        head = pattern[0]
+        if head == "**":
+            return any(cls._matches(pattern[1:], path[i:]) for i in range(len(path) + 1))
+        if not path or (head != "*" and head != str(path[0])):
+            return False
+        return cls._matches(pattern[1:], path[1:])
+
+    def selects(self, path: Tuple) -> bool:
+        """
+        Returns `True` if the string at `path` should be sanitized.
+
+        Args:
+            path: The keys and indices leading to the string.
+        """
+        if self._include and not any(self._matches(p, path) for p in self._include):
+            return False
+        return not any(self._matches(p, path) for p in self._exclude)
+
+
+def replacement_text(finding, action: PiiAction) -> str:
+    """
+    Returns the text that replaces a single finding for the given action.
+
+    Args:
+        finding: The `Finding` to replace.
+        action: The PII action to perform.
+
+    Returns:
+        A redaction placeholder, fake data from the finding's recognizer,
+        or the original text.
+
+    Raises:
+        ValueError: For `PiiAction.TOKENIZE`, whose placeholders are
+            assigned by a `TokenVault` (see `PiiProcessor.apply_findings`).
+    """
+    if action == PiiAction.TOKENIZE:
+        raise ValueError("PiiAction.TOKENIZE requires a TokenVault passed as `surrogates`.")
+    if action == PiiAction.REDACT:
+        return f"[REDACTED {finding.pii_type}]"
+    if action == PiiAction.ANONYMIZE:
+        # Use the recognizer stored in the finding to generate fake data
+        return finding.recognizer.anonymize(finding.text)
+    return finding.text
+
+
+def _rss_bytes() -> Optional[int]:
+    """Returns the resident set size of this process, if it can be determined."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+class ModelRecycler:
+    """
+    Keeps the memory of long-running processors flat by periodically
+    replacing their spaCy models with pristine copies.
+
+    Every token a model sees is interned into its `Vocab` and `StringStore`,
+    and neither ever shrinks. In a long-lived worker that sees a stream of
+    unique strings (ids, hashes, names) this makes memory grow without bound.
+    After `max_docs` documents or `max_bytes` of text have gone through the
+    model, the recycler swaps in a fresh copy, and the grown one is freed
+    once no other object references it.
+
+    Fresh copies are loaded from a snapshot that is written to a temporary
+    directory (`nlp.to_disk`) when the recycler first sees a model, so the
+    recycler should be created early, before the model has processed
+    traffic. Alternatively, a factory can reload the model from its source.
+
+    A recycler can be shared by several processors built for the same
+    models (e.g., one per `sanitize_pii` call); counts then accumulate
+    across them.
+
+    Attributes:
+        max_docs (Optional[int]): Recycle after this many documents, or `None`.
+        max_bytes (Optional[int]): Recycle after this many UTF-8 bytes of text, or `None`.
+        factories (Dict[str, Callable]): Per model attribute (`"nlp"`,
+            `"escalation_nlp"`), a callable returning a fresh model. Models
+            without a factory are restored from a snapshot.
+        on_recycle (Optional[Callable]): Called as `on_recycle(old, new)`
+            after a model was replaced, e.g. to update a model registry.
+        docs (int): Documents seen since the last recycle.
+        bytes (int): Bytes of text seen since the last recycle.
+        recycles (int): Number of recycles so far.
+    """
+    def __init__(
+        self,
+        max_docs: Optional[int] = 100_000,
+        max_bytes: Optional[int] = None,
+        factories: Optional[Dict[str, Callable[[], spacy.Language]]] = None,
+        on_recycle: Optional[Callable[[Any, Any], None]] = None
+    ):
+        """
+        Initializes the recycler.
+
+        Args:
+            max_docs: The number of documents after which models are recycled.
+            max_bytes: The amount of text (in UTF-8 bytes) after which models
+                are recycled.
+            factories: Optional callables returning fresh models, keyed by
+                the processor attribute they replace.
+            on_recycle: An optional callback `(old_model, new_model)`.
+        """
+        if max_docs is None and max_bytes is None:
+            raise ValueError("ModelRecycler needs at least one of max_docs or max_bytes.")
+        self.max_docs = max_docs
+        self.max_bytes = max_bytes
+        self.factories = dict(factories or {})
+        self.on_recycle = on_recycle
+        self.docs = 0
+        self.bytes = 0
+        self.recycles = 0
+        self._snapshots: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._snapshot_dir: Optional[str] = None
+
+    def bind(self, processor: "PiiProcessor"):
+        """Snapshots the processor's models that have neither a snapshot nor a factory."""
+        with self._lock:
+            for attr in processor.model_attributes:
+                nlp = getattr(processor, attr, None)
+                if nlp is None or attr in self.factories or attr in self._snapshots:
+                    continue
+                if self._snapshot_dir is None:
+                    self._snapshot_dir = tempfile.mkdtemp(prefix="l8e_beam_snapshot_")
+                    weakref.finalize(self, shutil.rmtree, self._snapshot_dir, True)
+                path = os.path.join(self._snapshot_dir, attr)
+                nlp.to_disk(path)
+                self._snapshots[attr] = path
+
+    def record(self, text: str):
+        """Counts a document that is about to be run through the model."""
+        self.docs += 1
+        if self.max_bytes is not None:
+            self.bytes += len(text.encode("utf-8", "surrogatepass"))
+
+    @property
+    def due(self) -> bool:
+        """Whether a limit has been reached."""
+        return (
+            (self.max_docs is not None and self.docs >= self.max_docs)
+            or (self.max_bytes is not None and self.bytes >= self.max_bytes)
+        )
+
+    def fresh(self, attr: str) -> spacy.Language:
+        """Returns a pristine copy of the model stored in `attr`."""
+        factory = self.factories.get(attr)
+        if factory is not None:
+            return factory()
+        return spacy.load(self._snapshots[attr])
+
+    def recycle(self, processor: "PiiProcessor"):
+        """
+        Replaces the processor's models with fresh copies and resets the counters.
+
+        Calls that are in flight keep using the model they started with.
+        Both `on_recycle` and the processor's own `on_model_recycled` are
+        told about every replaced model.
+        """
+        with self._lock:
+            if not self.due:
+                return
+            for attr in processor.model_attributes:
+                old = getattr(processor, attr, None)
+                if old is None:
+                    continue
+                new = self.fresh(attr)
+                setattr(processor, attr, new)
+                for callback in (self.on_recycle, getattr(processor, "on_model_recycled", None)):
+                    if callback is not None:
+                        callback(old, new)
+            self.docs = 0
+            self.bytes = 0
+            self.recycles += 1
+
+
+class _WalkFrame:
+    """A container being processed by `_walk`."""
+    __slots__ = ("obj", "kind", "keys", "values", "index", "results", "path", "copy", "cyclic")
+
+    def __init__(self, obj: Any, kind: str, path: Tuple, fields: Optional[dict] = None):
+        self.obj = obj
+        self.kind = kind
+        # Keys are only needed to build paths, or for `.dict()` objects
+        self.keys = None
+        if kind == "dict":
+            self.values = list(obj.values())
+            if path is not None:
+                self.keys = list(obj)
+        elif kind == "model":
+            self.keys, self.values = list(fields), list(fields.values())
+        else:
+            self.values = obj
+        self.index = 0
+        # The processed values, allocated once the first value changes
+        self.results: Optional[List[Any]] = None
+        self.path = path
+        # A new container allocated early, because a cyclic reference points to it
+        self.copy = None
+        # Whether a cyclic reference points to this (immutable) container
+        self.cyclic = False
+
+    def add(self, value: Any, result: Any):
+        """Records the processed form of the next value."""
+        if self.results is not None:
+            self.results.append(result)
+        elif result is not value:
+            self.results = list(self.values[:self.index])
+            self.results.append(result)
+        self.index += 1
+
+    def force_copy(self):
+        """Makes `build` return a new container even if no value changes."""
+        if self.results is None:
+            self.results = list(self.values[:self.index])
+
+    def build(self) -> Any:
+        """Returns the processed container, or the original if nothing changed."""
+        if self.results is None:
+            return self.obj
+        if self.kind == "dict":
+            result = self.copy if self.copy is not None else {}
+            result.update(zip(self.obj.keys(), self.results))
+            return result
+        if self.kind == "list":
+            result = self.copy if self.copy is not None else []
+            result.extend(self.results)
+            return result
+        if self.cyclic:
+            # The references inside point to the original, which is outdated
+            raise ValueError(f"Cannot rebuild a {self.kind} that contains a reference to itself.")
+        if self.kind == "tuple":
+            return tuple(self.results)
+        sanitized_dict = dict(zip(self.keys, self.results))
+        try:
+            # Re-create the object from the sanitized dict
+            return type(self.obj)(**sanitized_dict)
+        except TypeError:
+            # Fallback for objects that can't be re-instantiated this way
+            return sanitized_dict
+
+
+# Marks a value whose result is not known yet in `_walk`.
+_PENDING = object()
+
+
+def _container_kind(data: Any) -> Optional[str]:
+    """Returns how `_walk` traverses a value, or `None` for leaves."""
+    if isinstance(data, dict):
+        return "dict"
+    if isinstance(data, list):
+        return "list"
+    if isinstance(data, tuple):
+        return "tuple"
+    if not isinstance(data, str) and hasattr(data, 'dict') and callable(getattr(data, 'dict')):
+        return "model"
+    return None
+
+
+def _walk(data: Any, transform: Callable[[str], str], paths: Optional[PathFilter] = None) -> Any:
+    """
+    Applies `transform` to every selected string in `data`, rebuilding
+    the containers around the strings that changed.
+
+    The walk uses an explicit stack, so deeply nested data does not hit
+    the recursion limit. Strings are visited in document order.
+
+    - Copy-on-write: a container whose subtree has not changed is
+      returned as is, so clean payloads are not copied.
+    - A container reached several times (a shared reference) is
+      processed once, and all references get the same result. With
+      `paths`, shared containers are processed once per path, as their
+      selection may differ.
+    - A reference back to a dict or list that is still being processed
+      (a cycle) points to its processed copy, so cycles are preserved. A
+      reference back to a tuple or `.dict()` object keeps pointing to the
+      original, which is only correct if nothing inside it changes.
+
+    Args:
+        data: The data structure to walk.
+        transform: Maps a string to its replacement.
+        paths: An optional `PathFilter` restricting which strings are transformed.
+
+    Returns:
+        The processed data.
+
+    Raises:
+        ValueError: If a cycle leads back to a tuple or a `.dict()`
+            object whose contents change, as it cannot be rebuilt around a
+            reference to itself.
+    """
+    if isinstance(data, str):
+        return transform(data) if paths is None or paths.selects(()) else data
+    if _container_kind(data) is None:
+        return data
+
+    # id -> result of the processed containers. Temporaries created by
+    # `.dict()` are pinned, so that their ids cannot be reused.
+    memo: Dict[int, Any] = {}
+    pinned: List[dict] = []
+    active: Dict[int, _WalkFrame] = {}
+    stack: List[_WalkFrame] = []
+    value = data
+    path: Optional[Tuple] = () if paths is not None else None
+    while True:
+        # 1. Process `value`: leaves and known containers give a result
+        # right away, new containers are pushed onto the stack.
+        if isinstance(value, str):
+            result = transform(value) if paths is None or paths.selects(path) else value
+        else:
+            result = _PENDING
+            kind = _container_kind(value)
+            if kind is None:
+                result = value
+            elif id(value) in active:
+                result = _back_reference(active[id(value)], stack)
+            elif id(value) in memo:
+                result = memo[id(value)]
+            else:
+                fields = None
+                if kind == "model":
+                    fields = value.dict()
+                    pinned.append(fields)
+                active[id(value)] = _WalkFrame(value, kind, path, fields)
+                stack.append(active[id(value)])
+
+        # 2. Hand the result to the parent and finish completed containers.
+        while True:
+            if result is not _PENDING:
+                if not stack:
+                    return result
+                stack[-1].add(value, result)
+            frame = stack[-1]
+            if frame.index < len(frame.values):
+                break
+            stack.pop()
+            del active[id(frame.obj)]
+            value, result = frame.obj, frame.build()
+            if paths is None:
+                memo[id(value)] = result
+
+        # 3. Continue with the next value of the innermost container.
+        value = frame.values[frame.index]
+        if paths is not None:
+            path = frame.path + (frame.keys[frame.index] if frame.keys is not None else frame.index,)
+
+
+def _back_reference(target: _WalkFrame, stack: List[_WalkFrame]) -> Any:
+    """Resolves a cyclic reference to `target` in `_walk`; `target` is on the `stack`."""
+    if target.kind not in ("dict", "list"):
+        # Immutable: keep the original, `build` fails if it has to change
+        target.cyclic = True
+        return target.obj
+    if target.copy is None:
+        target.copy = {} if target.kind == "dict" else []
+    # Every container on the cycle must be copied to point to the copy
+    for frame in reversed(stack):
+        frame.force_copy()
+        if frame is target:
+            break
+    return target.copy
+
+
+@dataclass
+class ProcessorStats:
+    """
+    Counters describing the work a `PiiProcessor` has done.
+
+    Attributes:
+        texts (int): Number of strings scanned by `get_findings`.
+        ner_calls (int): Number of strings that were run through the spaCy model.
+        ner_skipped (int): Number of strings for which NER was skipped.
+        deadline_fallbacks (int): Number of strings whose NER did not fit
+            into a `Deadline` and fell back to its policy.
+        docs_reused (int): Number of spaCy `Doc`s passed in whose entities
+            were used without running the model.
+    """
+    texts: int = 0
+    ner_calls: int = 0
+    ner_skipped: int = 0
+    deadline_fallbacks: int = 0
+    docs_reused: int = 0
+
+    @property
+    def ner_skip_rate(self) -> float:
+        """The fraction of scanned strings for which NER was skipped."""
+        return self.ner_skipped / self.texts if self.texts else 0.0
 
 
 class PiiProcessor:
@@ -20,11 +547,32 @@ class PiiProcessor:
     Orchestrates all recognizers to find, sort, and process PII in text
     and other data structures.
     """
+    # The attributes holding spaCy models, for recycling and memory stats.
+    model_attributes: Tuple[str, ...] = ("nlp",)
+    # Called as `(old, new)` when the recycler replaced one of this
+    # processor's models; unlike `ModelRecycler.on_recycle`, it only
+    # concerns this processor (e.g. the registry its models came from).
+    on_model_recycled: Optional[Callable[[Any, Any], None]] = None
+    # Under a deadline, longer strings are run through NER in chunks of
+    # about this many characters, so the budget can be checked in between.
+    ner_chunk_chars: int = 2000
+    # The assumed NER cost of a model that has not been measured yet: about
+    # 20,000 characters per second, slower than small CPU pipelines, so that
+    # the first call under a deadline does not overrun it.
+    default_ner_seconds_per_char: float = 5e-5
+    # A sentence end or line break, where NER chunks are preferably cut.
+    _CHUNK_BREAK = re.compile(r"[.!?]+[\"')\]]*\s+|\n")
+
     def __init__(
         self,
         regex_recognizers: List, # List[RegexRecognizer]
         spacy_recognizers: List, # List[SpacyRecognizer]
-        nlp: spacy.Language
+        nlp: spacy.Language,
+        ner_prefilter: Optional[NerPrefilter] = NerPrefilter(),
+        cache=None, # Optional[FindingsCache]
+        recycler: Optional[ModelRecycler] = None,
+        segment_cache=None, # Optional[SegmentCache]
+        doc_labels: Optional[Iterable[str]] = None
     ):
         """
         Initializes the PiiProcessor.
@@ -33,41 +581,404 @@ class PiiProcessor:
             regex_recognizers: A list of instantiated `RegexRecognizer` objects.
             spacy_recognizers: A list of instantiated `SpacyRecognizer` objects.
             nlp: A loaded spaCy language model.
+            ner_prefilter: A `NerPrefilter` used to skip NER on strings that
+                cannot contain named entities. Pass `None` to always run NER.
+            cache: An optional `l8e_beam.cache.FindingsCache`. Findings are
+                looked up there before any recognizer runs, and stored after.
+            recycler: An optional `ModelRecycler` that bounds the memory growth
+                of the spaCy model(s) in long-running processes.
+            segment_cache: An optional `l8e_beam.cache.SegmentCache`. Texts
+                are then split into sentences or paragraphs, and only the
+                segments not seen before are scanned.
+            doc_labels: The entity labels that the pipeline producing the
+                spaCy `Doc`s passed in can assign, e.g.
+                `upstream.get_pipe("ner").labels`. Their entities are only
+                reused if these cover the labels of all spaCy recognizers,
+                see `accepts_doc`. By default, `Doc`s are scanned as text.
         """
         self.regex_recognizers = regex_recognizers
         self.spacy_recognizers = spacy_recognizers
         self.nlp = nlp
+        self.ner_prefilter = ner_prefilter
+        self.cache = cache
+        self.segment_cache = segment_cache
+        self.doc_labels = frozenset(doc_labels) if doc_labels is not None else None
+        self.stats = ProcessorStats()
+        self.recycler = recycler
+        # The numeric recognizers and their scanner, see `_numeric_scanner`.
+        self._numeric: Optional[Tuple[Tuple, Optional[NumericScanner]]] = None
+        if recycler is not None and spacy_recognizers:
+            recycler.bind(self)
+
+    def _needs_ner(self, text: str) -> bool:
+        """
+        Decides whether the spaCy model must be run on a string.
+
+        NER is skipped when there are no spaCy recognizers to consume the
+        resulting `Doc`, or when the prefilter rules the string out. The
+        decision is recorded in `self.stats`.
+        """
+        self.stats.texts += 1
+        if self.spacy_recognizers and (
+            self.ner_prefilter is None or self.ner_prefilter.should_run_ner(text)
+        ):
+            self.stats.ner_calls += 1
+            if self.recycler is not None:
+                self.recycler.record(text)
+            return True
+        self.stats.ner_skipped += 1
+        return False
+
+    def accepts_doc(self, doc: Doc) -> bool:
+        """
+        Whether the entities of a `Doc` parsed elsewhere can be used as they are.
+
+        Reuse is opt-in through `doc_labels`, since a `Doc` does not tell
+        which labels its pipeline could have assigned: an entity ruler that
+        only knows `PRODUCT` would otherwise pass names through unredacted.
+        The `Doc` must be in the language of `self.nlp`, carry entity
+        annotations, and only have entities with labels in `doc_labels`,
+        which in turn must include the label of every spaCy recognizer.
+        Other `Doc`s are scanned like their text.
+        """
+        if self.doc_labels is None:
+            return False
+        if not {r.label for r in self.spacy_recognizers} <= self.doc_labels:
+            return False
+        return (
+            doc.lang_ == self.nlp.lang
+            and doc.has_annotation("ENT_IOB")
+            and all(ent.label_ in self.doc_labels for ent in doc.ents)
+        )
+
+    def _doc_findings(self, doc: Doc, parsed: bool = False) -> List: # List[Finding]
+        """
+        Runs the regex recognizers on the text of a `Doc`, and the spaCy recognizers on its entities.
+
+        `parsed` tells that `self.nlp` just produced the `Doc`, which is then
+        counted as an NER call rather than as a reused `Doc`.
+        """
+        findings = self._regex_findings([doc.text])[0]
+        if parsed:
+            self.stats.texts += 1
+            self.stats.ner_calls += 1
+            if self.recycler is not None:
+                self.recycler.record(doc.text)
+        elif self.spacy_recognizers:
+            self.stats.docs_reused += 1
+        if self.spacy_recognizers:
+            self._analyze_doc(doc.text, doc, findings)
+        if parsed:
+            self._maybe_recycle()
+        return findings
 
-    def get_findings(self, text: str) -> List: # List[Finding]
+    def get_findings(self, text: Union[str, Doc], deadline: Optional[Deadline] = None) -> List: # List[Finding]
         """
         Finds all PII in a string by running all registered recognizers.
 
         This method optimizes the process by running the spaCy NLP model
         only once on the text, then passing the processed `Doc` object to all
-        spaCy-based recognizers.
+        spaCy-based recognizers. The model is not run at all if the
+        `ner_prefilter` decides the text cannot contain named entities.
+
+        A spaCy `Doc` that was already parsed (e.g. by an earlier stage of a
+        pipeline) can be passed instead of a string. If `accepts_doc` allows
+        it (see `doc_labels`), its entities are used directly and only the regex recognizers
+        run, on `doc.text`; caches are bypassed.
 
         Args:
-            text: The input text to scan.
+            text: The input text to scan, or a parsed `Doc`.
+            deadline: An optional `l8e_beam.deadline.Deadline`. NER then only
+                runs within the remaining budget; see `_add_ner_findings_within`.
 
         Returns:
             A list of all `Finding` objects, consolidated from all recognizers.
         """
-        findings = []
-        
+        if isinstance(text, Doc):
+            if self.accepts_doc(text):
+                return self._doc_findings(text)
+            text = text.text
+        if self.segment_cache is not None:
+            return self.segment_cache.get_findings(self, [text], deadline=deadline)[0]
+        if self.cache is not None:
+            findings = self.cache.get(self, text)
+            if findings is None:
+                fallbacks = deadline.fallbacks if deadline is not None else 0
+                findings = self._scan(text, deadline)
+                # Degraded findings must not be served to later calls
+                if deadline is None or deadline.fallbacks == fallbacks:
+                    self.cache.put(self, text, findings)
+            return findings
+        return self._scan(text, deadline)
+
+    def _scan(self, text: str, deadline: Optional[Deadline] = None) -> List: # List[Finding]
+        """Runs all recognizers on a string, bypassing the cache."""
         # 1. Run all regex recognizers first
-        for recognizer in self.regex_recognizers:
-            recognizer.analyze(text, findings)
+        findings = self._regex_findings([text])[0]
+
+        # 2. Run spaCy NLP process ONCE, if the text can contain entities
+        if self._needs_ner(text):
+            if deadline is None:
+                self._add_ner_findings(text, findings)
+            elif not self._add_ner_findings_within(text, findings, deadline):
+                self.stats.deadline_fallbacks += 1
+                findings = deadline.fallback(text, findings)
+            self._maybe_recycle()
             
-        # 2. Run spaCy NLP process ONCE
-        doc = self.nlp(text)
-        
-        # 3. Run all spaCy recognizers on the processed doc
+        return findings
+
+    def get_findings_batch(
+        self,
+        texts: Union[Sequence[Union[str, Doc]], DocBin],
+        batch_size: int = 64,
+        deadline: Optional[Deadline] = None
+    ) -> List[List]:
+        """
+        Finds all PII in several strings at once.
+
+        Equivalent to calling `get_findings` on each string, but the strings
+        that need NER are sent through `nlp.pipe` together, which is much
+        faster than calling the model once per string.
+
+        Args:
+            texts: The input texts to scan. Parsed `Doc`s can be mixed in
+                (see `get_findings`), or a whole `DocBin` passed, whose docs
+                are read with the vocab of `self.nlp`.
+            batch_size: The batch size passed to `nlp.pipe`.
+            deadline: An optional `l8e_beam.deadline.Deadline`. Batches are
+                only started while they are expected to fit into the budget.
+
+        Returns:
+            A list of `Finding` lists, one per input text.
+        """
+        if isinstance(texts, DocBin):
+            texts = list(texts.get_docs(self.nlp.vocab))
+        if any(isinstance(text, Doc) for text in texts):
+            return self._doc_findings_batch(texts, batch_size, deadline)
+        if self.segment_cache is not None:
+            return self.segment_cache.get_findings(self, texts, batch_size, deadline)
+        return self._cached_findings_batch(texts, batch_size, deadline)
+
+    def _doc_findings_batch(
+        self,
+        texts: Sequence[Union[str, Doc]],
+        batch_size: int,
+        deadline: Optional[Deadline] = None
+    ) -> List[List]:
+        """Like `get_findings_batch`, for inputs that contain `Doc`s."""
+        all_findings: List[Optional[List]] = [None] * len(texts)
+        rest = []
+        for i, text in enumerate(texts):
+            if isinstance(text, Doc) and self.accepts_doc(text):
+                all_findings[i] = self._doc_findings(text)
+            else:
+                rest.append(i)
+        if rest:
+            scanned = self.get_findings_batch(
+                [texts[i].text if isinstance(texts[i], Doc) else texts[i] for i in rest],
+                batch_size, deadline
+            )
+            for i, findings in zip(rest, scanned):
+                all_findings[i] = findings
+        return all_findings
+
+    def _cached_findings_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        deadline: Optional[Deadline] = None
+    ) -> List[List]:
+        """Like `get_findings_batch`, but bypassing the segment cache."""
+        if self.cache is None:
+            return self._scan_batch(texts, batch_size, deadline)
+
+        all_findings = self.cache.get_many(self, texts)
+        missing = [i for i, findings in enumerate(all_findings) if findings is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            fallbacks = deadline.fallbacks if deadline is not None else 0
+            scanned = self._scan_batch(missing_texts, batch_size, deadline)
+            if deadline is None or deadline.fallbacks == fallbacks:
+                self.cache.put_many(self, missing_texts, scanned)
+            for i, findings in zip(missing, scanned):
+                all_findings[i] = findings
+        return all_findings
+
+    def _scan_batch(
+        self,
+        texts: List[str],
+        batch_size: int,
+        deadline: Optional[Deadline] = None
+    ) -> List[List]:
+        """Runs all recognizers on several strings, bypassing the cache."""
+        all_findings = self._regex_findings(texts)
+        ner_indices = [i for i, text in enumerate(texts) if self._needs_ner(text)]
+
+        for start in range(0, len(ner_indices), batch_size):
+            group = ner_indices[start:start + batch_size]
+            chars = sum(len(texts[i]) for i in group)
+            if deadline is not None and not deadline.allows(self._ner_seconds_per_char * chars):
+                for i in ner_indices[start:]:
+                    self.stats.deadline_fallbacks += 1
+                    all_findings[i] = deadline.fallback(texts[i], all_findings[i])
+                break
+            began = time.perf_counter()
+            docs = self.nlp.pipe([texts[i] for i in group], batch_size=batch_size)
+            for i, doc in zip(group, docs):
+                self._analyze_doc(texts[i], doc, all_findings[i])
+            self._observe_ner_cost(chars, time.perf_counter() - began)
+        if ner_indices:
+            self._maybe_recycle()
+        return all_findings
+
+    def _numeric_scanner(self) -> Optional[NumericScanner]:
+        """Returns the scanner of the current numeric regex recognizers, if any."""
+        recognizers = tuple(self.regex_recognizers)
+        cached = self._numeric
+        if cached is None or cached[0] != recognizers:
+            cached = (recognizers, NumericScanner.for_recognizers(recognizers))
+            self._numeric = cached
+        return cached[1]
+
+    def _regex_findings(self, texts: List[str]) -> List[List]:
+        """
+        Runs the regex recognizers on several strings.
+
+        Numeric recognizers run together through a `NumericScanner`, all
+        others through their own `analyze`. Findings keep the order of
+        `regex_recognizers`.
+        """
+        scanner = self._numeric_scanner()
+        numeric = {}
+        if scanner is not None:
+            numeric = {id(r): found for r, found in zip(scanner.recognizers, scanner.scan(texts))}
+        all_findings = []
+        for i, text in enumerate(texts):
+            findings = []
+            for recognizer in self.regex_recognizers:
+                found = numeric.get(id(recognizer))
+                if found is None:
+                    recognizer.analyze(text, findings)
+                else:
+                    findings.extend(found.get(i, ()))
+            all_findings.append(findings)
+        return all_findings
+
+    def _maybe_recycle(self):
+        """Recycles the models if the recycler's limits have been reached."""
+        if self.recycler is not None and self.recycler.due:
+            self.recycler.recycle(self)
+            # spaCy pipelines hold reference cycles, so the replaced model is
+            # only freed by a full collection, which rarely runs on its own.
+            gc.collect()
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """
+        Reports the size of the models' vocabularies and of the process.
+
+        Returns:
+            A dict with the `StringStore` and `Vocab` sizes per model
+            attribute (e.g. `nlp.strings`, `nlp.lexemes`), the process RSS in
+            bytes (`rss_bytes`, `None` where unavailable) and, with a
+            recycler, its counters.
+        """
+        stats: Dict[str, Any] = {}
+        for attr in self.model_attributes:
+            vocab = getattr(getattr(self, attr, None), "vocab", None)
+            if vocab is None:
+                continue
+            stats[f"{attr}.strings"] = len(vocab.strings)
+            stats[f"{attr}.lexemes"] = len(vocab)
+        stats["rss_bytes"] = _rss_bytes()
+        if self.recycler is not None:
+            stats["recycles"] = self.recycler.recycles
+            stats["docs_since_recycle"] = self.recycler.docs
+            stats["bytes_since_recycle"] = self.recycler.bytes
+        return stats
+
+    def _add_ner_findings(self, text: str, findings: List):
+        """
+        Runs the spaCy model once and all spaCy recognizers on the resulting `Doc`.
+        """
+        began = time.perf_counter()
+        self._analyze_doc(text, self.nlp(text), findings)
+        self._observe_ner_cost(len(text), time.perf_counter() - began)
+
+    @property
+    def _ner_seconds_per_char(self) -> float:
+        """The NER cost per character, used to decide what fits into a deadline."""
+        costs = _NER_COSTS.get(self.nlp)
+        if costs is None or type(self) not in costs:
+            return self.default_ner_seconds_per_char
+        return costs[type(self)]
+
+    def _observe_ner_cost(self, chars: int, seconds: float):
+        """Updates the moving average of the NER cost per character."""
+        if chars <= 0:
+            return
+        cost = seconds / chars
+        costs = _NER_COSTS.setdefault(self.nlp, {})
+        previous = costs.get(type(self))
+        costs[type(self)] = cost if previous is None else 0.8 * previous + 0.2 * cost
+
+    def _ner_chunks(self, text: str):
+        """
+        Splits a string into `(offset, chunk)` pieces of about `ner_chunk_chars`
+        characters, cut at sentence ends or, failing that, at whitespace.
+        """
+        limit = self.ner_chunk_chars
+        start = 0
+        while len(text) - start > limit:
+            window = text[start:start + limit]
+            cut = 0
+            for match in self._CHUNK_BREAK.finditer(window):
+                cut = match.end()
+            if cut == 0:
+                cut = window.rfind(" ") + 1 or limit
+            yield start, text[start:start + cut]
+            start += cut
+        yield start, text[start:]
+
+    def _add_ner_findings_within(self, text: str, findings: List, deadline: Deadline) -> bool:
+        """
+        Runs NER chunk by chunk while the budget allows it.
+
+        A chunk is only started if the measured NER cost says it can finish
+        within the remaining budget. Findings of completed chunks are kept.
+
+        Returns:
+            `True` if NER covered the whole string.
+        """
+        for offset, chunk in self._ner_chunks(text):
+            if not deadline.allows(self._ner_seconds_per_char * len(chunk)):
+                return False
+            chunk_findings = []
+            self._add_ner_findings(chunk, chunk_findings)
+            for finding in chunk_findings:
+                finding.start += offset
+                finding.end += offset
+                findings.append(finding)
+        return True
+
+    def _analyze_doc(self, text: str, doc, findings: List):
+        """
+        Runs all spaCy recognizers on a `Doc` produced by `self.nlp`.
+
+        Subclasses can override this to change how entities are obtained
+        (e.g., cascading between models) without touching the regex stage;
+        the override then applies to both single and batched processing.
+        """
         for recognizer in self.spacy_recognizers:
             recognizer.analyze(doc, findings)
-            
-        return findings
 
-    def process(self, text: str, action: PiiAction = PiiAction.REDACT) -> str:
+    def process(
+        self,
+        text: Union[str, Doc],
+        action: PiiAction = PiiAction.REDACT,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+        deadline: Optional[Deadline] = None,
+        return_doc: bool = False
+    ) -> Union[str, Tuple[str, Doc]]:
         """
         Applies a PII action to a single string.
 
@@ -75,13 +986,115 @@ class PiiProcessor:
         rebuilds the string with the PII either redacted, anonymized, or ignored.
 
         Args:
-            text: The input text.
+            text: The input text, or a parsed `Doc` (see `get_findings`).
+            action: The action to perform on the PII.
+            surrogates: An optional mapping of `(pii_type, original text)` to
+                replacement. When given, each distinct PII value is anonymized
+                to the same fake value every time it is seen. Required for
+                `PiiAction.TOKENIZE`, as a `l8e_beam.vault.TokenVault`.
+            deadline: An optional latency budget, see `get_findings`.
+            return_doc: If `True`, also return the `Doc` of the input, so that
+                later stages can reuse the parse. A string is then always
+                parsed with `self.nlp`, even if the prefilter would skip it.
+                The `Doc` holds the original, unsanitized text.
+
+        Returns:
+            The processed string, or a `(processed string, Doc)` tuple if
+            `return_doc` is set.
+        """
+        if return_doc:
+            if isinstance(text, Doc):
+                doc, findings = text, self.get_findings(text, deadline)
+            else:
+                doc = self.nlp(text)
+                findings = self._doc_findings(doc, parsed=True)
+            return self.apply_findings(doc.text, findings, action, surrogates=surrogates), doc
+        findings = self.get_findings(text, deadline)
+        if isinstance(text, Doc):
+            text = text.text
+        return self.apply_findings(text, findings, action, surrogates=surrogates)
+
+    def process_batch(
+        self,
+        texts: Union[Sequence[Union[str, Doc]], DocBin],
+        action: PiiAction = PiiAction.REDACT,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+        deadline: Optional[Deadline] = None,
+        return_docs: bool = False
+    ) -> Union[List[str], Tuple[List[str], List[Doc]]]:
+        """
+        Applies a PII action to several strings, batching NER with `nlp.pipe`.
+
+        Args:
+            texts: The input texts; `Doc`s and `DocBin`s are accepted as in
+                `get_findings_batch`.
             action: The action to perform on the PII.
+            surrogates: See `process`.
+            deadline: An optional latency budget, see `get_findings_batch`.
+            return_docs: If `True`, also return the `Doc` of every input;
+                strings are then parsed with `self.nlp.pipe`. See `process`.
+
+        Returns:
+            The processed strings, in input order, or a tuple of them and
+            the `Doc`s if `return_docs` is set.
+        """
+        if isinstance(texts, DocBin):
+            texts = list(texts.get_docs(self.nlp.vocab))
+        if return_docs:
+            strings = [i for i, text in enumerate(texts) if not isinstance(text, Doc)]
+            docs = list(texts)
+            for i, doc in zip(strings, self.nlp.pipe([texts[i] for i in strings])):
+                docs[i] = doc
+            parsed = set(strings)
+            all_findings = self.get_findings_batch(
+                [doc for i, doc in enumerate(docs) if i not in parsed], deadline=deadline
+            ) if len(parsed) < len(docs) else []
+            found = iter(all_findings)
+            processed = [
+                self.apply_findings(
+                    doc.text, self._doc_findings(doc, parsed=True) if i in parsed else next(found),
+                    action, surrogates=surrogates
+                )
+                for i, doc in enumerate(docs)
+            ]
+            return processed, docs
+        return [
+            self.apply_findings(text.text if isinstance(text, Doc) else text, findings, action,
+                                surrogates=surrogates)
+            for text, findings in zip(texts, self.get_findings_batch(texts, deadline=deadline))
+        ]
+
+    def apply_findings(
+        self,
+        text: str,
+        findings: List,
+        action: PiiAction,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None
+    ) -> str:
+        """
+        Rebuilds a string with the given findings replaced according to `action`.
+
+        Findings are sorted by start offset; a finding that overlaps an
+        earlier one is skipped.
+
+        Args:
+            text: The original text the findings were computed on.
+            findings: A list of `Finding` objects for `text`.
+            action: The action to perform on the PII.
+            surrogates: See `process`.
 
         Returns:
             The processed string.
+
+        Raises:
+            ValueError: If `action` is `PiiAction.TOKENIZE` and `surrogates`
+                is not a `TokenVault`, or the other way round.
         """
-        findings = self.get_findings(text)
+        tokenize = action == PiiAction.TOKENIZE
+        if tokenize and not hasattr(surrogates, "tokenize"):
+            raise ValueError("PiiAction.TOKENIZE requires a TokenVault passed as `surrogates`.")
+        if not tokenize and hasattr(surrogates, "tokenize"):
+            raise ValueError("A TokenVault can only be used with PiiAction.TOKENIZE.")
         if not findings:
             return text
 
@@ -94,58 +1107,101 @@ class PiiProcessor:
                 continue
 
             new_text_parts.append(text[last_end:finding.start])
-
-            # --- Main Logic Change Here ---
-            replacement_text = ""
-            if action == PiiAction.REDACT:
-                replacement_text = f"[REDACTED {finding.pii_type}]"
-            elif action == PiiAction.ANONYMIZE:
-                # Use the recognizer stored in the finding to generate fake data
-                replacement_text = finding.recognizer.anonymize(finding.text)
-            elif action == PiiAction.IGNORE:
-                replacement_text = finding.text
-            
-            new_text_parts.append(replacement_text)
+            if tokenize:
+                new_text_parts.append(surrogates.tokenize(finding.pii_type, finding.text))
+            elif surrogates is not None and action == PiiAction.ANONYMIZE:
+                key = (finding.pii_type, finding.text)
+                if key not in surrogates:
+                    surrogates[key] = replacement_text(finding, action)
+                new_text_parts.append(surrogates[key])
+            else:
+                new_text_parts.append(replacement_text(finding, action))
             last_end = finding.end
 
         new_text_parts.append(text[last_end:])
 
         return "".join(new_text_parts)
     
-    def process_recursive(self, data: Any, action: PiiAction) -> Any:
+    def process_recursive_batch(
+        self,
+        data: Any,
+        action: PiiAction,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+        findings_batch: Optional[Callable[[List[str]], List[List]]] = None,
+        deadline: Optional[Deadline] = None,
+        paths: Optional[PathFilter] = None
+    ) -> Any:
+        """
+        Like `process_recursive`, but scans all strings of the structure at once.
+
+        The strings are collected first, their findings are computed in a
+        single batched call, and the structure is then rebuilt.
+
+        Args:
+            data: The data structure to process.
+            action: The PII action to apply.
+            surrogates: See `process`.
+            findings_batch: A callable mapping a list of strings to their
+                findings. Defaults to `get_findings_batch`.
+            deadline: An optional latency budget for the default
+                `findings_batch`, see `get_findings_batch`.
+            paths: See `process_recursive`.
+
+        Returns:
+            A data structure of the same type with all strings processed.
+        """
+        strings: List[str] = []
+        self._collect_strings(data, strings, paths)
+        if not strings:
+            return data
+        if findings_batch is None:
+            findings_lists = self.get_findings_batch(strings, deadline=deadline)
+        else:
+            findings_lists = findings_batch(strings)
+        processed = iter([
+            self.apply_findings(text, findings, action, surrogates=surrogates)
+            for text, findings in zip(strings, findings_lists)
+        ])
+        return self._rebuild(data, processed, paths)
+
+    def _collect_strings(self, data: Any, strings: List[str], paths: Optional[PathFilter] = None):
+        """Appends every selected string in `data` to `strings`, in `process_recursive` order."""
+        def collect(text: str) -> str:
+            strings.append(text)
+            return text
+        _walk(data, collect, paths)
+
+    def _rebuild(self, data: Any, processed, paths: Optional[PathFilter] = None) -> Any:
+        """Rebuilds `data`, taking each selected string's replacement from the `processed` iterator."""
+        return _walk(data, lambda _: next(processed), paths)
+
+    def process_recursive(
+        self,
+        data: Any,
+        action: PiiAction,
+        surrogates: Optional[MutableMapping[Tuple[str, str], str]] = None,
+        deadline: Optional[Deadline] = None,
+        paths: Optional[PathFilter] = None
+    ) -> Any:
         """
         Recursively traverses data structures to process all string values.
 
         This method can handle nested dictionaries, lists, and tuples, as well
-        as any object with a `.dict()` method (like Pydantic models).
+        as any object with a `.dict()` method (like Pydantic models). Nesting
+        depth is not limited by the recursion limit, shared and cyclic
+        references are handled, and containers without any changed string
+        are returned as is rather than copied.
 
         Args:
             data: The data structure to process.
             action: The PII action to apply.
+            surrogates: See `process`.
+            deadline: An optional latency budget shared by all strings, see
+                `get_findings`.
+            paths: An optional `PathFilter` restricting which strings are
+                processed; the others are returned unchanged.
 
         Returns:
-            A new data structure of the same type with all strings processed.
-        """
-        if isinstance(data, str):
-            return self.process(data, action)
-        elif isinstance(data, dict):
-            return {k: self.process_recursive(v, action) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self.process_recursive(item, action) for item in data]
-        # FIX: Added a condition to handle tuples
-        elif isinstance(data, tuple):
-            return tuple(self.process_recursive(item, action) for item in data)
-        elif hasattr(data, 'dict') and callable(getattr(data, 'dict')):
-            # Convert to a dict and process its values
-            sanitized_dict = self.process_recursive(data.dict(), action)
-            # Get the original class of the object
-            original_class = type(data)
-            try:
-                # Re-create the object from the sanitized dict
-                return original_class(**sanitized_dict)
-            except TypeError:
-                # Fallback for objects that can't be re-instantiated this way
-                return sanitized_dict
-        else:
-            # For any other data type, return it unchanged
-            return data
\ No newline at end of file
+            A data structure of the same type with all strings processed.
+        """
+        return _walk(data, lambda text: self.process(text, action, surrogates, deadline), paths)
@@ -21,7 +21,9 @@ import pathlib
 from typing import List
 
 # Import the base classes, as we need them for type checking
-from l8e_beam.recognizers.base import Recognizer, RegexRecognizer, SpacyRecognizer
+from l8e_beam.recognizers.base import (
+    Recognizer, RegexRecognizer, SpacyRecognizer, DictionaryRecognizer
+)
 
 
 def load_recognizers() -> List[Recognizer]:
@@ -57,7 +59,7 @@ def load_recognizers() -> List[Recognizer]:
         for name, member in inspect.getmembers(module, inspect.isclass):
             # Check if it's a concrete subclass of Recognizer
             if (issubclass(member, Recognizer) and member not in 
-                    [Recognizer, RegexRecognizer, SpacyRecognizer]):
+                    [Recognizer, RegexRecognizer, SpacyRecognizer, DictionaryRecognizer]):
                     recognizer_instances.append(member())
                 
     return recognizer_instances
@@ -83,5 +85,6 @@ __all__ = [
     "SPACY_RECOGNIZERS",
     "Recognizer",       # It's good practice to export the base classes too
     "RegexRecognizer",
-    "SpacyRecognizer"
+    "SpacyRecognizer",
+    "DictionaryRecognizer"
 ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+# tests/recognizers/test_dictionary_recognizer.py
+
+import os
+import tempfile
+import unittest
+
+from l8e_beam.recognizers.base import DictionaryRecognizer, AhoCorasickAutomaton
+
+
+class CodenameRecognizer(DictionaryRecognizer):
+    name = "CODENAME"
+    terms = ["Nightjar", "Blue", "Project Bluebird", "Bluebird"]
+
+
+class TestAhoCorasickAutomaton(unittest.TestCase):
+
+    def test_finds_all_overlapping_occurrences(self):
+        automaton = AhoCorasickAutomaton(["he", "she", "his", "hers"], case_sensitive=True)
+        matches = sorted(automaton.search("ushers"))
+        self.assertEqual(matches, [(1, 4), (2, 4), (2, 6)])
+
+    def test_case_insensitive(self):
+        automaton = AhoCorasickAutomaton(["acme"])
+        self.assertEqual(list(automaton.search("ACME and Acme")), [(0, 4), (9, 13)])
+
+
+class TestDictionaryRecognizer(unittest.TestCase):
+
+    def test_leftmost_longest_whole_words(self):
+        recognizer = CodenameRecognizer()
+        text = "project bluebird and Bluebirds met NIGHTJAR."
+        findings = []
+        recognizer.analyze(text, findings)
+        self.assertEqual([f.text for f in findings], ["project bluebird", "NIGHTJAR"])
+        self.assertEqual(findings[0].start, 0)
+        self.assertEqual(findings[0].pii_type, "CODENAME")
+
+    def test_substring_matching_without_word_boundaries(self):
+        recognizer = CodenameRecognizer()
+        recognizer.whole_words = False
+        findings = []
+        recognizer.analyze("Bluebirds", findings)
+        self.assertEqual([f.text for f in findings], ["Bluebird"])
+
+    def test_save_and_load_automaton(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "codenames.ac")
+            CodenameRecognizer().save_automaton(path)
+
+            class EmptyRecognizer(DictionaryRecognizer):
+                name = "CODENAME"
+                terms = []
+
+            recognizer = EmptyRecognizer()
+            recognizer.load_automaton(path)
+            findings = []
+            recognizer.analyze("Ask Nightjar.", findings)
+            self.assertEqual([f.text for f in findings], ["Nightjar"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# tests/test_model_recycler.py
+
+import os
+import unittest
+import uuid
+from unittest.mock import Mock
+
+import spacy
+
+from l8e_beam.recognizers.pii_processor import PiiProcessor, ModelRecycler
+from l8e_beam.recognizers.base import SpacyRecognizer
+
+# The number of unique documents the soak test pushes through the model.
+# Set L8E_BEAM_SOAK_DOCS=2000000 for a full soak run.
+SOAK_DOCS = int(os.environ.get("L8E_BEAM_SOAK_DOCS", "6000"))
+
+
+class PersonRecognizer(SpacyRecognizer):
+    name = "PERSON"
+    label = "PERSON"
+
+
+def _make_nlp():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PERSON", "pattern": "Susan Miller"}])
+    return nlp
+
+
+class TestModelRecycler(unittest.TestCase):
+
+    def setUp(self):
+        self.nlp = _make_nlp()
+        self.baseline_strings = len(self.nlp.vocab.strings)
+
+    def _processor(self, recycler):
+        return PiiProcessor(
+            regex_recognizers=[],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=self.nlp,
+            ner_prefilter=None,
+            recycler=recycler
+        )
+
+    def test_requires_a_limit(self):
+        with self.assertRaises(ValueError):
+            ModelRecycler(max_docs=None, max_bytes=None)
+
+    def test_recycles_after_max_docs(self):
+        processor = self._processor(ModelRecycler(max_docs=3))
+        for _ in range(2):
+            processor.process(f"Token {uuid.uuid4().hex}")
+        self.assertIs(processor.nlp, self.nlp)
+
+        processor.process(f"Token {uuid.uuid4().hex}")
+        self.assertIsNot(processor.nlp, self.nlp)
+        self.assertEqual(processor.recycler.recycles, 1)
+        self.assertEqual(processor.recycler.docs, 0)
+        self.assertEqual(len(processor.nlp.vocab.strings), self.baseline_strings)
+
+    def test_recycles_after_max_bytes(self):
+        processor = self._processor(ModelRecycler(max_docs=None, max_bytes=100))
+        processor.process_batch(["x" * 60 + " y", "z" * 60 + " w"])
+        self.assertEqual(processor.recycler.recycles, 1)
+
+    def test_recycled_model_keeps_pipeline_state(self):
+        processor = self._processor(ModelRecycler(max_docs=1))
+        processor.process("Nothing here.")
+        self.assertEqual(
+            processor.process("Ask Susan Miller."),
+            "Ask [REDACTED PERSON]."
+        )
+
+    def test_factory_and_callback(self):
+        fresh = _make_nlp()
+        on_recycle = Mock()
+        recycler = ModelRecycler(
+            max_docs=1, factories={"nlp": lambda: fresh}, on_recycle=on_recycle
+        )
+        processor = self._processor(recycler)
+        processor.process("Hello there.")
+        self.assertIs(processor.nlp, fresh)
+        on_recycle.assert_called_once_with(self.nlp, fresh)
+
+    def test_processor_callback_and_build_processor(self):
+        from unittest.mock import patch
+        from l8e_beam.api import build_processor
+        from l8e_beam.redactor import MODEL_REGISTRY
+
+        recycler = ModelRecycler(max_docs=1, factories={"nlp": _make_nlp})
+        with patch("l8e_beam.api._get_model", return_value=self.nlp):
+            processor = build_processor(recycler=recycler)
+        # The caller's recycler is left alone
+        self.assertIsNone(recycler.on_recycle)
+        self.assertEqual(processor.on_model_recycled, MODEL_REGISTRY.replace)
+
+        processor.on_model_recycled = Mock()
+        processor.process("Ask Susan Miller.")
+        processor.on_model_recycled.assert_called_once_with(self.nlp, processor.nlp)
+
+    def test_memory_stats(self):
+        processor = self._processor(ModelRecycler(max_docs=10))
+        processor.process("Hello there.")
+        stats = processor.memory_stats()
+        self.assertGreaterEqual(stats["nlp.strings"], self.baseline_strings)
+        self.assertIn("nlp.lexemes", stats)
+        self.assertIn("rss_bytes", stats)
+        self.assertEqual(stats["docs_since_recycle"], 1)
+        self.assertEqual(stats["recycles"], 0)
+
+    def test_soak_unique_strings_stay_bounded(self):
+        """
+        Unique tokens would grow the StringStore by several entries per
+        document; with recycling it stays within one recycle window.
+        """
+        window = max(SOAK_DOCS // 20, 100)
+        processor = self._processor(ModelRecycler(max_docs=window))
+        batch = 500
+        peak_strings = 0
+        rss_samples = []
+        for start in range(0, SOAK_DOCS, batch):
+            processor.process_batch([
+                f"Request {uuid.uuid4().hex} from host-{i} took {i * 7}ms"
+                for i in range(start, min(start + batch, SOAK_DOCS))
+            ])
+            stats = processor.memory_stats()
+            peak_strings = max(peak_strings, stats["nlp.strings"])
+            rss_samples.append(stats["rss_bytes"])
+
+        self.assertGreater(processor.recycler.recycles, 0)
+        # Each document adds a handful of new strings, plus one batch of overshoot.
+        self.assertLess(peak_strings, self.baseline_strings + 8 * (window + batch))
+
+        if SOAK_DOCS >= 1000000 and rss_samples[-1] is not None:
+            # After warm-up, the RSS peaks per recycle window must not keep climbing.
+            n = len(rss_samples)
+            early_peak = max(rss_samples[n // 4:n // 2])
+            late_peak = max(rss_samples[3 * n // 4:])
+            self.assertLess(late_peak - early_peak, 64 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
 import unittest
 from unittest.mock import Mock, MagicMock
 
-from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.pii_processor import PiiProcessor, NerPrefilter, PathFilter, ProcessorStats
 from l8e_beam.enums import PiiAction
 from l8e_beam.recognizers.base import Finding
 
@@ -129,5 +129,261 @@ class TestPiiProcessor(unittest.TestCase):
         self.assertEqual(self.processor.process_recursive((), PiiAction.REDACT), ())
         self.assertEqual(self.processor.process_recursive("", PiiAction.REDACT), "")
 
+    def test_process_recursive_with_paths(self):
+        data = {
+            "user": "John Doe",
+            "messages": [
+                {"role": "user", "content": "Mail test@example.com"},
+                {"role": "assistant", "content": "Thanks John Doe"}
+            ]
+        }
+        result = self.processor.process_recursive(
+            data, PiiAction.REDACT, paths=PathFilter(include=["messages.*.content"])
+        )
+        self.assertEqual(result["user"], "John Doe")
+        self.assertEqual(result["messages"][0]["role"], "user")
+        self.assertEqual(result["messages"][0]["content"], "Mail [REDACTED EMAIL]")
+        self.assertEqual(result["messages"][1]["content"], "Thanks [REDACTED PERSON]")
+
+        result = self.processor.process_recursive(
+            data, PiiAction.REDACT, paths=PathFilter(exclude=["messages.1"])
+        )
+        self.assertEqual(result["user"], "[REDACTED PERSON]")
+        self.assertEqual(result["messages"][1]["content"], "Thanks John Doe")
+
+    def test_process_recursive_copy_on_write(self):
+        clean = {"id": "abc", "tags": ["x", "y"], "meta": {"n": 1}}
+        data = {"clean": clean, "dirty": ["ok", "test@example.com"], "t": ("a", "b")}
+        result = self.processor.process_recursive(data, PiiAction.REDACT)
+        self.assertIsNot(result, data)
+        self.assertIs(result["clean"], clean)
+        self.assertIs(result["t"], data["t"])
+        self.assertEqual(result["dirty"], ["ok", "[REDACTED EMAIL]"])
+        self.assertEqual(data["dirty"], ["ok", "test@example.com"])
+        self.assertIs(self.processor.process_recursive(clean, PiiAction.REDACT), clean)
+
+        model = MockPydanticModel(user="nobody", message="hello")
+        self.assertIs(self.processor.process_recursive(model, PiiAction.REDACT), model)
+
+    def test_process_recursive_deep_nesting(self):
+        data = "User is John Doe."
+        for _ in range(20000):
+            data = {"next": [data]}
+        result = self.processor.process_recursive(data, PiiAction.REDACT)
+        for _ in range(20000):
+            result = result["next"][0]
+        self.assertEqual(result, "User is [REDACTED PERSON].")
+
+    def test_process_recursive_shared_references(self):
+        shared = {"user": "John Doe"}
+        data = [shared, {"again": shared}, shared]
+        result = self.processor.process_recursive(data, PiiAction.REDACT)
+        self.assertEqual(result[0], {"user": "[REDACTED PERSON]"})
+        self.assertIs(result[1]["again"], result[0])
+        self.assertIs(result[2], result[0])
+        self.assertEqual(self.processor.stats.texts, 1)
+
+    def test_process_recursive_cycles(self):
+        data = {"user": "John Doe", "children": []}
+        data["children"].append(data)
+        data["self"] = data
+        result = self.processor.process_recursive(data, PiiAction.REDACT)
+        self.assertEqual(result["user"], "[REDACTED PERSON]")
+        self.assertIs(result["self"], result)
+        self.assertIs(result["children"][0], result)
+        self.assertEqual(data["user"], "John Doe")
+
+        clean = ["nothing here"]
+        clean.append(clean)
+        self.assertEqual(self.processor.process_recursive(clean, PiiAction.REDACT)[0], "nothing here")
+
+        # A clean cycle through a tuple is returned as is
+        through_tuple = ([],)
+        through_tuple[0].append(through_tuple)
+        self.assertIs(self.processor.process_recursive(through_tuple, PiiAction.REDACT), through_tuple)
+        inner = []
+        tuple_inside = (inner,)
+        inner.append(tuple_inside)
+        self.assertIs(self.processor.process_recursive(tuple_inside, PiiAction.REDACT), tuple_inside)
+        self.assertIs(self.processor.process_recursive([tuple_inside], PiiAction.REDACT)[0], tuple_inside)
+
+        # It can't be rebuilt once something inside it changes
+        through_tuple[0].append("John Doe")
+        with self.assertRaises(ValueError):
+            self.processor.process_recursive(through_tuple, PiiAction.REDACT)
+
+    def test_process_recursive_batch_matches_process_recursive(self):
+        self.processor.nlp.pipe.side_effect = lambda texts, batch_size=None: [
+            MagicMock(text=text, ents=[]) for text in texts
+        ]
+        shared = ["Jane Smith", "clean"]
+        data = {"a": shared, "b": (shared, "test@example.com"), "c": {"d": "x"}}
+        data["loop"] = data
+        result = self.processor.process_recursive_batch(data, PiiAction.REDACT)
+        self.assertEqual(result["a"], ["[REDACTED PERSON]", "clean"])
+        self.assertIs(result["b"][0], result["a"])
+        self.assertEqual(result["b"][1], "[REDACTED EMAIL]")
+        self.assertIs(result["c"], data["c"])
+        self.assertIs(result["loop"], result)
+
+    def test_prefilter_skips_structured_strings(self):
+        """NER is not run on strings that cannot contain named entities."""
+        for text in ["42", "123e4567-e89b-12d3-a456-426614174000",
+                     "2024-01-02T10:00:00Z", "tech_ops", " "]:
+            self.processor.get_findings(text)
+        self.processor.nlp.assert_not_called()
+        self.assertEqual(self.processor.stats.ner_skipped, 5)
+        self.assertEqual(self.processor.stats.ner_skip_rate, 1.0)
+
+    def test_prefilter_keeps_natural_language(self):
+        result = self.processor.process("User is John Doe.", PiiAction.REDACT)
+        self.assertEqual(result, "User is [REDACTED PERSON].")
+        self.assertEqual(self.processor.stats.ner_calls, 1)
+
+    def test_prefilter_still_runs_regex_recognizers(self):
+        result = self.processor.process("test@example.com", PiiAction.REDACT)
+        self.assertEqual(result, "[REDACTED EMAIL]")
+        self.processor.nlp.assert_not_called()
+
+    def test_prefilter_opt_out(self):
+        self.processor.ner_prefilter = None
+        self.processor.get_findings("42")
+        self.processor.nlp.assert_called_once_with("42")
+
+    def test_no_spacy_recognizers_skips_nlp(self):
+        self.processor.spacy_recognizers = []
+        self.processor.get_findings("User is John Doe.")
+        self.processor.nlp.assert_not_called()
+
+
+class TestProcessorStats(unittest.TestCase):
+
+    def test_is_a_dataclass(self):
+        stats = ProcessorStats(texts=4, ner_skipped=1)
+        self.assertEqual(stats, ProcessorStats(texts=4, ner_skipped=1))
+        self.assertEqual(stats.ner_calls, 0)
+        self.assertEqual(stats.ner_skip_rate, 0.25)
+        self.assertIn("texts=4", repr(stats))
+
+
+class TestNerPrefilter(unittest.TestCase):
+
+    def test_should_run_ner(self):
+        prefilter = NerPrefilter()
+        self.assertTrue(prefilter.should_run_ner("Meet Anna in Paris"))
+        self.assertTrue(prefilter.should_run_ner("please call john smith"))
+        self.assertFalse(prefilter.should_run_ner("1234567"))
+        self.assertFalse(prefilter.should_run_ner("jdoe_123"))
+
+    def test_is_immutable(self):
+        prefilter = NerPrefilter()
+        with self.assertRaises(AttributeError):
+            prefilter.skip_single_lowercase_tokens = False
+        variant = prefilter.replace(skip_single_lowercase_tokens=False)
+        self.assertTrue(variant.should_run_ner("jdoe"))
+        self.assertFalse(prefilter.should_run_ner("jdoe"))
+        self.assertEqual(variant.min_length, prefilter.min_length)
+        with self.assertRaises(TypeError):
+            prefilter.replace(max_length=3)
+
+
+class TestPathFilter(unittest.TestCase):
+
+    def test_patterns(self):
+        paths = PathFilter(include=["messages.*.content", "**.note"], exclude=["messages.0"])
+        self.assertTrue(paths.selects(("messages", 1, "content")))
+        self.assertTrue(paths.selects(("messages", 1, "content", "parts", 0)))
+        self.assertFalse(paths.selects(("messages", 0, "content")))
+        self.assertFalse(paths.selects(("messages", 1, "role")))
+        self.assertTrue(paths.selects(("a", "b", "note")))
+        self.assertTrue(paths.selects(("note",)))
+
+    def test_no_include_selects_everything(self):
+        self.assertTrue(PathFilter().selects(()))
+        self.assertFalse(PathFilter(exclude=["**.password"]).selects(("user", "password")))
+
+class TestDocInput(unittest.TestCase):
+    """Tests for passing spaCy `Doc`s parsed by an earlier pipeline stage."""
+
+    def setUp(self):
+        import spacy
+        from l8e_beam.recognizers.email import EmailRecognizer
+        from l8e_beam.recognizers.person import PersonRecognizer
+
+        self.upstream = spacy.blank("en")
+        self.upstream.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        self.nlp = MagicMock(wraps=self.upstream)
+        self.nlp.lang = "en"
+        self.nlp.vocab = self.upstream.vocab
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=self.nlp,
+            doc_labels=self.upstream.get_pipe("entity_ruler").labels
+        )
+        self.text = "Jane Doe wrote from jane@example.com"
+        self.expected = "[REDACTED PERSON] wrote from [REDACTED EMAIL]"
+
+    def test_doc_entities_are_reused(self):
+        doc = self.upstream(self.text)
+        self.assertEqual(self.processor.process(doc), self.expected)
+        self.nlp.assert_not_called()
+        self.assertEqual(self.processor.stats.docs_reused, 1)
+        self.assertEqual(self.processor.stats.ner_calls, 0)
+
+    def test_docbin_and_mixed_batches(self):
+        from spacy.tokens import DocBin
+        docs = DocBin(docs=[self.upstream(self.text), self.upstream("no pii here")])
+        docs = DocBin().from_bytes(docs.to_bytes())
+        self.assertEqual(self.processor.process_batch(docs), [self.expected, "no pii here"])
+        self.nlp.pipe.assert_not_called()
+        self.assertEqual(
+            self.processor.process_batch([self.text, self.upstream(self.text)]),
+            [self.expected, self.expected]
+        )
+        self.assertEqual(self.processor.stats.docs_reused, 3)
+
+    def test_incompatible_docs_are_scanned_as_text(self):
+        import spacy
+        blank = spacy.blank("en")(self.text)  # no entity annotations
+        self.assertFalse(self.processor.accepts_doc(blank))
+        self.assertEqual(self.processor.process(blank), self.expected)
+        self.assertEqual(self.processor.stats.docs_reused, 0)
+        self.assertEqual(self.processor.stats.ner_calls, 1)
+
+    def test_docs_are_only_reused_when_their_labels_are_known(self):
+        import spacy
+        products = spacy.blank("en")
+        products.add_pipe("entity_ruler").add_patterns([{"label": "PRODUCT", "pattern": "iPhone"}])
+        doc = products("Jane Doe bought an iPhone")
+
+        # Not opted in: the text is parsed again
+        self.processor.doc_labels = None
+        self.assertEqual(self.processor.process(doc), "[REDACTED PERSON] bought an iPhone")
+        # The declared labels do not cover PERSON
+        self.processor.doc_labels = frozenset(["PRODUCT"])
+        self.assertFalse(self.processor.accepts_doc(doc))
+        # The Doc has entities from outside the declared labels
+        self.processor.doc_labels = frozenset(["PERSON"])
+        self.assertFalse(self.processor.accepts_doc(doc))
+        self.assertEqual(self.processor.stats.docs_reused, 0)
+
+    def test_return_doc(self):
+        processed, doc = self.processor.process(self.text, return_doc=True)
+        self.assertEqual(processed, self.expected)
+        self.assertEqual(doc.text, self.text)
+        self.assertEqual([ent.text for ent in doc.ents], ["Jane Doe"])
+
+        processed, docs = self.processor.process_batch(
+            [self.text, self.upstream("mail jane@example.com")], return_docs=True
+        )
+        self.assertEqual(processed, [self.expected, "mail [REDACTED EMAIL]"])
+        self.assertEqual([d.text for d in docs], [self.text, "mail jane@example.com"])
+        self.assertEqual(self.processor.stats.ner_calls, 2)
+        self.assertEqual(self.processor.stats.docs_reused, 1)
+
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
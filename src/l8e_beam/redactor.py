@@ -7,45 +7,307 @@ This module contains the logic for loading and caching spaCy models and
 the PiiProcessor instances. The primary goal is to ensure that these
 heavy objects are created only once and then reused, which significantly
 improves performance when the decorator is used on multiple functions or
-called multiple times.
+called multiple times. The `ModelRegistry` also unloads models again when
+they exceed a memory budget or sit idle, so rarely used models (such as
+the transformer) do not stay resident forever.
 
 This is not part of the public-facing API but is crucial for the
 decorator's functionality.
 """
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import wraps
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple, Union
 from importlib import resources
 import spacy
 
 # Import the main processor and the action/model enums
-from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.pii_processor import PiiProcessor, _rss_bytes
 from l8e_beam.enums import ModelType, PiiAction
+from l8e_beam.cascade import CascadePiiProcessor
 
 # Import the pre-loaded recognizer lists
 from l8e_beam.recognizers.recognizers import REGEX_RECOGNIZERS, SPACY_RECOGNIZERS
 
-_LOADED_MODELS = {}
+def _dir_size(path) -> int:
+    """Returns the on-disk size of a model directory in bytes."""
+    total = 0
+    for root, _, files in os.walk(str(path)):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
 
-def _get_model(model: ModelType):
+
+def _model_name(model: Union[ModelType, str]) -> str:
+    """Returns the registry name of a `ModelType` member or registered model."""
+    return model.value if isinstance(model, ModelType) else model
+
+
+@dataclass
+class _ModelEntry:
+    """A resident model and its bookkeeping."""
+    nlp: Any
+    size_bytes: int
+    last_used: float
+
+
+class ModelRegistry:
+    """
+    Loads, caches and evicts spaCy models (and the processors built on them).
+
+    Models are loaded on first use. Two limits keep host memory in check:
+
+    - `memory_budget_bytes`: when loading a model pushes the estimated
+      resident size of all models over the budget, the least recently used
+      other models are unloaded.
+    - `idle_timeout`: models not used for this many seconds are unloaded
+      on the next registry access.
+
+    Processors cached through `get_processor` are dropped together with the
+    models they use. Memory is only returned to the OS once no other object
+    (e.g. a processor held by user code) references an unloaded model.
+
+    Loading a model (or building a processor) only blocks callers waiting
+    for that same model; resident models stay available meanwhile, and
+    different models load in parallel.
+
+    Besides the packaged `ModelType` models, any spaCy package, model
+    directory or factory callable can be added with `register`.
+
+    Attributes:
+        memory_budget_bytes (Optional[int]): The memory budget, or `None` for no limit.
+        idle_timeout (Optional[float]): The idle timeout in seconds, or `None`.
+    """
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        idle_timeout: Optional[float] = None
+    ):
+        """
+        Initializes an empty registry.
+
+        Args:
+            memory_budget_bytes: The memory budget for all resident models.
+            idle_timeout: Seconds after which an unused model is unloaded.
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_timeout = idle_timeout
+        self._sources: Dict[str, Tuple[Union[str, Callable[[], Any]], Optional[int]]] = {}
+        self._models: "OrderedDict[str, _ModelEntry]" = OrderedDict()
+        self._processors: Dict[Any, Tuple[Tuple[str, ...], PiiProcessor]] = {}
+        self._lock = threading.RLock()
+        # Per model name and processor key, so each is loaded/built only once
+        self._loading: Dict[str, threading.Lock] = {}
+        self._building: Dict[Any, threading.Lock] = {}
+
+    def register(
+        self,
+        name: str,
+        source: Union[str, Callable[[], Any]],
+        size_bytes: Optional[int] = None
+    ):
+        """
+        Registers an additional model.
+
+        Args:
+            name: The name used to request the model (e.g., in `sanitize_pii(model=...)`).
+            source: An installed spaCy package name, a model directory, or a
+                callable returning a loaded `spacy.Language`.
+            size_bytes: The model's resident size, if known. Otherwise it is
+                measured when the model is loaded.
+        """
+        with self._lock:
+            self._sources[name] = (source, size_bytes)
+
+    def _load(self, name: str):
+        """
+        Loads a model and estimates its resident size. Measured sizes are
+        approximate while other models load at the same time.
+        """
+        source, size_bytes = self._sources.get(name, (None, None))
+        rss_before = _rss_bytes()
+        if source is None:
+            # A packaged model from the l8e_beam.model resources
+            with resources.path('l8e_beam.model', name) as model_path:
+                nlp = spacy.load(model_path)
+                disk_size = _dir_size(model_path)
+        elif callable(source):
+            nlp = source()
+            disk_size = 0
+        else:
+            nlp = spacy.load(source)
+            disk_size = _dir_size(source) if os.path.isdir(str(source)) else 0
+
+        if size_bytes is None:
+            rss_after = _rss_bytes()
+            measured = rss_after - rss_before if rss_before is not None and rss_after is not None else 0
+            size_bytes = max(measured, disk_size)
+        return nlp, size_bytes
+
+    def get(self, model: Union[ModelType, str]):
+        """
+        Returns a loaded model, loading it if necessary.
+
+        Args:
+            model: A `ModelType` member or the name of a registered model.
+
+        Returns:
+            A loaded spaCy Language object.
+        """
+        name = _model_name(model)
+        with self._lock:
+            self.evict_idle()
+            nlp = self._touch(name)
+            if nlp is not None:
+                return nlp
+            load_lock = self._loading.setdefault(name, threading.Lock())
+        # The registry lock is not held while loading, which can take seconds
+        with load_lock:
+            with self._lock:
+                nlp = self._touch(name)
+                if nlp is not None:
+                    return nlp
+            nlp, size_bytes = self._load(name)
+            with self._lock:
+                self._models[name] = _ModelEntry(nlp=nlp, size_bytes=size_bytes, last_used=time.monotonic())
+                self._enforce_budget(keep=name)
+            return nlp
+
+    def _touch(self, name: str):
+        """Marks a resident model as used and returns it, or `None` if it is not loaded."""
+        entry = self._models.get(name)
+        if entry is None:
+            return None
+        entry.last_used = time.monotonic()
+        self._models.move_to_end(name)
+        return entry.nlp
+
+    def get_processor(self, key: Any, models: Tuple[str, ...], factory: Callable[[], PiiProcessor]) -> PiiProcessor:
+        """
+        Returns a cached processor, creating it with `factory` if necessary.
+
+        Args:
+            key: The cache key of the processor.
+            models: The names of the models the processor uses. The processor
+                is dropped when any of them is unloaded.
+            factory: Creates the processor.
+
+        Returns:
+            The cached or newly created processor.
+        """
+        with self._lock:
+            cached = self._processors.get(key)
+            build_lock = self._building.setdefault(key, threading.Lock()) if cached is None else None
+        if build_lock is not None:
+            # The factory usually loads models, so it runs outside the registry lock
+            with build_lock:
+                with self._lock:
+                    cached = self._processors.get(key)
+                if cached is None:
+                    processor = factory()
+                    with self._lock:
+                        cached = self._processors.setdefault(key, (tuple(models), processor))
+        with self._lock:
+            for name in cached[0]:
+                self._touch(name)
+            return cached[1]
+
+    def unload(self, model: Union[ModelType, str]):
+        """Unloads a model and every processor that uses it."""
+        name = _model_name(model)
+        with self._lock:
+            self._models.pop(name, None)
+            for key in [k for k, (models, _) in self._processors.items() if name in models]:
+                del self._processors[key]
+
+    def replace(self, old, new):
+        """
+        Swaps a resident model for another instance, e.g. a recycled copy.
+
+        Used as a `ModelRecycler.on_recycle` callback, so that later callers
+        get the fresh model and the grown one can be freed.
+        """
+        with self._lock:
+            for entry in self._models.values():
+                if entry.nlp is old:
+                    entry.nlp = new
+
+    def evict_idle(self):
+        """Unloads all models that have been idle longer than `idle_timeout`."""
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            deadline = time.monotonic() - self.idle_timeout
+            for name in [n for n, e in self._models.items() if e.last_used < deadline]:
+                self.unload(name)
+
+    def _enforce_budget(self, keep: str):
+        if self.memory_budget_bytes is None:
+            return
+        for name in list(self._models):
+            if self.resident_bytes() <= self.memory_budget_bytes:
+                break
+            if name != keep:
+                self.unload(name)
+
+    def resident_memory(self) -> Dict[str, int]:
+        """Returns the estimated resident size in bytes of each loaded model."""
+        with self._lock:
+            return {name: entry.size_bytes for name, entry in self._models.items()}
+
+    def resident_bytes(self) -> int:
+        """Returns the estimated resident size of all loaded models."""
+        return sum(self.resident_memory().values())
+
+    def __contains__(self, model: Union[ModelType, str]) -> bool:
+        return _model_name(model) in self._models
+
+    def clear(self):
+        """Unloads all models and processors. Registrations are kept."""
+        with self._lock:
+            self._models.clear()
+            self._processors.clear()
+
+
+# The process-wide registry used by the decorator and `sanitize_pii`
+MODEL_REGISTRY = ModelRegistry()
+
+
+def register_model(name: str, source: Union[str, Callable[[], Any]], size_bytes: Optional[int] = None):
     """
-    Loads a spaCy model from the package's internal resources.
+    Registers an additional spaCy model with the process-wide registry.
 
-    This function caches the model in the `_LOADED_MODELS` dictionary after
-    the first load to prevent costly re-initialization on subsequent calls.
+    Args:
+        name: The name to request the model by, e.g. `sanitize_pii(model=name)`.
+        source: An installed spaCy package name, a model directory, or a
+            callable returning a loaded `spacy.Language`.
+        size_bytes: The model's resident size, if known.
+    """
+    MODEL_REGISTRY.register(name, source, size_bytes)
+
+
+def _get_model(model: Union[ModelType, str]):
+    """
+    Loads a spaCy model from the package's internal resources, or a model
+    registered with `register_model`.
+
+    Models are cached in `MODEL_REGISTRY`, which loads each model only once
+    and unloads it again according to its memory budget and idle timeout.
 
     Args:
-        model (ModelType): The enum member representing the model to load.
+        model: The enum member or registered name of the model to load.
 
     Returns:
         A loaded spaCy Language object.
     """
-    if model in _LOADED_MODELS:
-        return _LOADED_MODELS[model]
-
-    with resources.path('l8e_beam.model', model.value) as model_path:
-        nlp = spacy.load(model_path)
-        _LOADED_MODELS[model] = nlp
-        return nlp
+    return MODEL_REGISTRY.get(model)
 
 
 class PiiDecoratorBackend:
@@ -53,29 +315,37 @@ class PiiDecoratorBackend:
     Manages PiiProcessor instances for the decorator.
 
     This class ensures that a `PiiProcessor` is instantiated only once per
-    spaCy model type. It holds a class-level cache (`_PROCESSORS`) to store
-    these instances. When the `@redact_pii` decorator is used, this backend
-    is created, which then retrieves or creates the appropriate processor
-    to handle the PII sanitization.
+    spaCy model type. Processors are cached in `MODEL_REGISTRY` together
+    with the models they use, so they are released when their model is
+    evicted. When the `@redact_pii` decorator is used, this backend is
+    created, which then retrieves or creates the appropriate processor to
+    handle the PII sanitization.
 
     Attributes:
         model (ModelType): The spaCy model to use for NER.
+        escalate_to (Optional[ModelType]): The model for cascade escalation, if any.
         nlp (spacy.Language): The loaded spaCy model object.
         action (PiiAction): The PII action to perform (REDACT, ANONYMIZE, IGNORE).
         processor (PiiProcessor): The processor instance for the given model.
     """
-    # Class-level cache to store processor instances, keyed by model name
-    _PROCESSORS: Dict[str, PiiProcessor] = {}
-
-    def __init__(self, model: ModelType, action: PiiAction):
+    def __init__(
+        self,
+        model: Union[ModelType, str],
+        action: PiiAction,
+        escalate_to: Optional[Union[ModelType, str]] = None
+    ):
         """
         Initializes the backend with a specific model and action.
 
         Args:
-            model (ModelType): The spaCy model to use for NER.
+            model (ModelType): The spaCy model to use for NER, or the name of
+                a model registered with `register_model`.
             action (PiiAction): The PII action to perform (REDACT, ANONYMIZE, IGNORE).
+            escalate_to (Optional[ModelType]): If set, enables cascade mode with
+                this model as the accurate second stage.
         """
         self.model = model
+        self.escalate_to = escalate_to
         self.nlp = _get_model(model)
         self.action = action
         self.processor = self._get_processor()
@@ -83,25 +353,38 @@ class PiiDecoratorBackend:
 
     def _get_processor(self) -> PiiProcessor:
         """
-        Retrieves a PiiProcessor from the cache or creates a new one.
+        Retrieves a PiiProcessor from the registry or creates a new one.
 
-        This method checks the `_PROCESSORS` cache for an existing processor
-        for the requested model. If one is not found, it creates a new
-        instance and stores it in the cache for future use.
+        Processors are keyed by model name (and escalation model name in
+        cascade mode). If one is not found, a new instance is created and
+        stored in the registry for future use.
 
         Returns:
             The cached or newly created PiiProcessor instance.
         """
-        model_name = self.model.value
-        if model_name not in self._PROCESSORS:
+        model_name = _model_name(self.model)
+        escalation_name = _model_name(self.escalate_to) if self.escalate_to else None
+        key = ("decorator", model_name, escalation_name)
+
+        def create() -> PiiProcessor:
             # If no processor exists for this model, create and cache it
+            if self.escalate_to is not None:
+                print(f"Initializing CascadePiiProcessor with models: {model_name} -> {escalation_name}...")
+                return CascadePiiProcessor(
+                    regex_recognizers=REGEX_RECOGNIZERS,
+                    spacy_recognizers=SPACY_RECOGNIZERS,
+                    nlp=self.nlp,
+                    escalation_nlp=_get_model(self.escalate_to)
+                )
             print(f"Initializing PiiProcessor with model: {model_name}...")
-            self._PROCESSORS[model_name] = PiiProcessor(
+            return PiiProcessor(
                 regex_recognizers=REGEX_RECOGNIZERS,
                 spacy_recognizers=SPACY_RECOGNIZERS,
                 nlp=self.nlp
             )
-        return self._PROCESSORS[model_name]
+
+        models = tuple(n for n in (model_name, escalation_name) if n)
+        return MODEL_REGISTRY.get_processor(key, models, create)
 
 
     def process_data(self, data: Any) -> Any:
@@ -119,3 +402,84 @@ class PiiDecoratorBackend:
         """
         rdata = self.processor.process_recursive(data, action=self.action)
         return rdata
+
+    def _process_pending(self, pending: List[str]) -> List[str]:
+        """Sanitizes a micro-batch of yielded strings in one `nlp.pipe` call."""
+        if len(pending) == 1:
+            return [self.process_data(pending[0])]
+        return self.processor.process_batch(pending, action=self.action)
+
+    def process_iterator(self, iterator: Iterator, batch_size: int = 1) -> Iterator:
+        """
+        Lazily sanitizes every item yielded by a generator or iterator.
+
+        Items are sanitized as they are consumed. With `batch_size > 1`,
+        consecutive string items are collected into micro-batches and sent
+        through `nlp.pipe` together; this improves throughput for many small
+        items at the cost of holding back up to `batch_size - 1` items.
+        Non-string items flush the pending batch first, so order is kept.
+
+        Args:
+            iterator: The iterator returned by the decorated function.
+            batch_size: The maximum number of strings per micro-batch.
+
+        Yields:
+            The sanitized items, in order.
+        """
+        pending: List[str] = []
+        try:
+            for item in iterator:
+                if batch_size > 1 and isinstance(item, str):
+                    pending.append(item)
+                    if len(pending) >= batch_size:
+                        yield from self._process_pending(pending)
+                        pending = []
+                    continue
+                if pending:
+                    yield from self._process_pending(pending)
+                    pending = []
+                yield self.process_data(item)
+            if pending:
+                yield from self._process_pending(pending)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    async def aprocess_iterator(self, iterator, batch_size: int = 1) -> AsyncIterator:
+        """
+        The async counterpart of `process_iterator` for async generators.
+
+        Sanitization runs in the default executor so that NER does not block
+        the event loop.
+
+        Args:
+            iterator: The async iterator returned by the decorated function.
+            batch_size: The maximum number of strings per micro-batch.
+
+        Yields:
+            The sanitized items, in order.
+        """
+        loop = asyncio.get_running_loop()
+        pending: List[str] = []
+        try:
+            async for item in iterator:
+                if batch_size > 1 and isinstance(item, str):
+                    pending.append(item)
+                    if len(pending) >= batch_size:
+                        for processed in await loop.run_in_executor(None, self._process_pending, pending):
+                            yield processed
+                        pending = []
+                    continue
+                if pending:
+                    for processed in await loop.run_in_executor(None, self._process_pending, pending):
+                        yield processed
+                    pending = []
+                yield await loop.run_in_executor(None, self.process_data, item)
+            if pending:
+                for processed in await loop.run_in_executor(None, self._process_pending, pending):
+                    yield processed
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,233 @@
+# src/l8e_beam/server.py
+
+"""
+The l8e-beam sanitization sidecar.
+
+`SidecarServer` listens on a Unix domain socket and sanitizes data for any
+number of local client processes (see `l8e_beam.client.SidecarClient`).
+Models are loaded once, through `MODEL_REGISTRY`, so host memory is paid
+once per model rather than once per process.
+
+The server keeps one processor per policy (model, escalation model,
+disabled recognizers, prefilter setting), each behind a `DynamicBatcher`.
+Requests from different clients that use the same policy are therefore
+batched together into shared `nlp.pipe` calls.
+
+Start it with `l8e-beam serve` (see `l8e_beam.cli`).
+"""
+import os
+import socket
+import socketserver
+import stat
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from l8e_beam.api import build_processor
+from l8e_beam.batching import DynamicBatcher
+from l8e_beam.client import DEFAULT_SOCKET_PATH, SidecarError, read_frame, write_frame
+from l8e_beam.enums import ModelType, PiiAction
+from l8e_beam.recognizers.pii_processor import PathFilter
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+from l8e_beam.redactor import MODEL_REGISTRY
+
+
+def _model(value: Optional[str]):
+    """Maps a wire model name back to a `ModelType` where possible."""
+    if value is None:
+        return None
+    try:
+        return ModelType(value)
+    except ValueError:
+        return value
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Serves the request frames of one client connection."""
+
+    def handle(self):
+        while True:
+            try:
+                frame = read_frame(self.request)
+            except (SidecarError, OSError):
+                return
+            if frame is None:
+                return
+            codec, message = frame
+            write_frame(self.request, self.server.sidecar.handle(message), codec)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Many workers of a host may connect at once; the default backlog is 5.
+    request_queue_size = socket.SOMAXCONN
+
+
+class SidecarServer:
+    """
+    A Unix-socket server that sanitizes data for local clients.
+
+    Attributes:
+        socket_path (str): The Unix socket the server listens on.
+        max_batch_size (int): See `DynamicBatcher`.
+        max_wait_ms (float): See `DynamicBatcher`.
+        socket_mode (int): The permission bits of the socket file. Only
+            users that can write to the socket can use the sidecar.
+    """
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        socket_mode: int = 0o600
+    ):
+        """
+        Initializes the server. Nothing is bound until `start` or `serve_forever`.
+
+        Args:
+            socket_path: The Unix socket to listen on.
+            max_batch_size: The maximum number of strings per model batch.
+            max_wait_ms: How long a string may wait for a batch to fill up.
+            socket_mode: The permission bits of the socket file.
+        """
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.socket_mode = socket_mode
+        self._batchers: Dict[Tuple, DynamicBatcher] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _batcher(self, policy: Dict[str, Any]) -> DynamicBatcher:
+        """Returns the batcher for a policy, building its processor on first use."""
+        key = (
+            policy.get("model") or ModelType.SM.value,
+            policy.get("escalate_to"),
+            tuple(sorted(policy.get("disabled_recognizers") or [])),
+            bool(policy.get("ner_prefilter", True)),
+        )
+        with self._lock:
+            batcher = self._batchers.get(key)
+            if batcher is None:
+                processor = build_processor(
+                    model=_model(key[0]),
+                    disabled_recognizers=[DEFAULT_RECOGNIZERS(name) for name in key[2]],
+                    ner_prefilter=key[3],
+                    escalate_to=_model(key[1])
+                )
+                batcher = DynamicBatcher(
+                    processor, max_batch_size=self.max_batch_size, max_wait_ms=self.max_wait_ms
+                )
+                self._batchers[key] = batcher
+            return batcher
+
+    def handle(self, message: Any) -> Dict[str, Any]:
+        """
+        Executes one request message and returns the response message.
+
+        Supported operations are `sanitize`, `ping` and `stats`. Errors are
+        reported in the response rather than raised.
+        """
+        try:
+            if not isinstance(message, dict):
+                raise ValueError("A request must be a map.")
+            op = message.get("op")
+            if op == "sanitize":
+                batcher = self._batcher(message.get("policy") or {})
+                action = PiiAction(message.get("action", PiiAction.REDACT.value))
+                paths = message.get("paths")
+                result = batcher.process_recursive(
+                    message.get("data"), action, paths=PathFilter(**paths) if paths else None
+                )
+            elif op == "ping":
+                result = "pong"
+            elif op == "stats":
+                result = self.stats()
+            else:
+                raise ValueError(f"Unknown operation '{op}'.")
+            return {"ok": True, "result": result}
+        except Exception as exc:
+            return {"ok": False, "type": type(exc).__name__, "error": str(exc)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns per-policy batching statistics and the resident model sizes."""
+        with self._lock:
+            batchers = list(self._batchers.items())
+        return {
+            "policies": [
+                {
+                    "model": key[0],
+                    "escalate_to": key[1],
+                    "disabled_recognizers": list(key[2]),
+                    "ner_prefilter": key[3],
+                    "batches": batcher.batches,
+                    "texts": batcher.texts,
+                    "mean_batch_size": batcher.mean_batch_size,
+                }
+                for key, batcher in batchers
+            ],
+            "models": MODEL_REGISTRY.resident_memory(),
+        }
+
+    def _bind(self) -> _UnixServer:
+        if os.path.exists(self.socket_path):
+            if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                raise RuntimeError(f"'{self.socket_path}' exists and is not a socket.")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # A stale socket left behind by a previous run
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"Another server is already listening on '{self.socket_path}'.")
+            finally:
+                probe.close()
+        # Restrict the socket's permissions from the moment it is created.
+        old_umask = os.umask(0o777 & ~self.socket_mode)
+        try:
+            server = _UnixServer(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        server.sidecar = self
+        self._server = server
+        return server
+
+    def serve_forever(self):
+        """Binds the socket and serves until `shutdown` is called."""
+        server = self._bind()
+        try:
+            server.serve_forever()
+        finally:
+            self._cleanup()
+
+    def start(self) -> "SidecarServer":
+        """Binds the socket and serves from a background thread."""
+        server = self._bind()
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="l8e-beam-sidecar", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """Stops serving, closes all batchers and removes the socket file."""
+        if self._server is not None:
+            self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._cleanup()
+
+    def _cleanup(self):
+        server, self._server = self._server, None
+        if server is not None:
+            server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            batchers, self._batchers = list(self._batchers.values()), {}
+        for batcher in batchers:
+            batcher.close()
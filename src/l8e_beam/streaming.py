@@ -0,0 +1,223 @@
+# src/l8e_beam/streaming.py
+
+"""
+Streaming redaction of text streams, such as LLM token streams.
+
+`StreamSanitizer` accepts text in arbitrary chunks and releases sanitized
+text as soon as it is safe to do so. It only holds back the trailing part
+of the stream that could still change the outcome:
+
+- For regex recognizers, the last `max_match_length` characters, since a
+  match that is not complete yet can only start there.
+- For NER, everything after the last sentence boundary, because entity
+  recognition needs the whole sentence for context.
+
+A cut point is never placed inside a word or inside a match of a text
+recognizer (regex or dictionary). If no
+sentence boundary arrives within `max_buffer_chars`, the buffer is cut at a
+word boundary anyway, so memory and latency stay bounded.
+
+`sanitize_stream` and `asanitize_stream` wrap this in sync and async
+generator adapters.
+"""
+import asyncio
+import re
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Tuple
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+# The end of a sentence: terminal punctuation (optionally followed by closing
+# quotes/brackets) and whitespace, or a line break.
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|\n")
+_WHITESPACE = re.compile(r"\s")
+
+
+class StreamSanitizer:
+    """
+    Incrementally sanitizes a text stream with a bounded lookahead buffer.
+
+    Attributes:
+        processor (PiiProcessor): The processor used for released segments.
+        action (PiiAction): The PII action to perform.
+        max_match_length (int): The longest regex match that is guaranteed to
+            be detected when it arrives split across chunks.
+        max_buffer_chars (int): The buffer size at which text is released even
+            without a sentence boundary.
+    """
+    def __init__(
+        self,
+        processor: PiiProcessor,
+        action: PiiAction = PiiAction.REDACT,
+        max_match_length: int = 128,
+        max_buffer_chars: int = 2048
+    ):
+        """
+        Initializes the stream sanitizer.
+
+        Args:
+            processor: The processor used to sanitize released segments.
+            action: The PII action to perform.
+            max_match_length: The lookahead kept for regex recognizers.
+            max_buffer_chars: The hard limit for buffered text.
+        """
+        self.processor = processor
+        self.action = action
+        self.max_match_length = max_match_length
+        self.max_buffer_chars = max(max_buffer_chars, max_match_length)
+        self._buffer = ""
+        # Keeps anonymized values consistent over the whole stream.
+        self._surrogates: Dict[Tuple[str, str], str] = {}
+
+    @property
+    def uses_ner(self) -> bool:
+        """Whether sentence-level buffering is required."""
+        return bool(self.processor.spacy_recognizers)
+
+    def _safe_cut(self) -> int:
+        """Returns the length of the buffer prefix that can be released now."""
+        buf = self._buffer
+        cut = 0
+        if self.uses_ner:
+            for match in _SENTENCE_END.finditer(buf):
+                cut = match.end()
+            if cut == 0 and len(buf) > self.max_buffer_chars:
+                cut = len(buf) - self.max_match_length
+        else:
+            cut = len(buf) - self.max_match_length
+        if cut <= 0:
+            return 0
+
+        # Never split a word: back off to just after the last whitespace. Text
+        # without any (CJK, base64, minified code) is cut where it stands.
+        if cut < len(buf) and not buf[cut - 1].isspace():
+            last_space = -1
+            for match in _WHITESPACE.finditer(buf, 0, cut):
+                last_space = match.start()
+            if last_space >= 0:
+                cut = last_space + 1
+
+        # Never split a match of a text recognizer (regexes, dictionaries).
+        # Moving the cut back for one match can make it split another, so
+        # repeat until stable.
+        spans = []
+        for recognizer in self.processor.regex_recognizers:
+            regex = getattr(recognizer, "regex", None)
+            if regex is not None:
+                spans.extend(match.span() for match in regex.finditer(buf))
+            else:
+                found = []
+                recognizer.analyze(buf, found)
+                spans.extend((f.start, f.end) for f in found)
+        moved = True
+        while moved and cut > 0:
+            moved = False
+            for start, end in spans:
+                if start < cut < end:
+                    cut = start
+                    moved = True
+        return max(cut, 0)
+
+    def _release(self, cut: int) -> str:
+        head, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self.processor.process(head, self.action, surrogates=self._surrogates)
+
+    def feed(self, chunk: str) -> str:
+        """
+        Adds a chunk to the stream.
+
+        Args:
+            chunk: The next piece of text.
+
+        Returns:
+            The sanitized text that can be released now (possibly empty).
+        """
+        self._buffer += chunk
+        cut = self._safe_cut()
+        if cut == 0:
+            return ""
+        return self._release(cut)
+
+    def flush(self) -> str:
+        """
+        Ends the stream.
+
+        Returns:
+            The sanitized remainder of the buffer.
+        """
+        return self._release(len(self._buffer)) if self._buffer else ""
+
+
+def sanitize_stream(
+    chunks: Iterable[str],
+    processor: PiiProcessor,
+    action: PiiAction = PiiAction.REDACT,
+    **options
+) -> Iterator[str]:
+    """
+    Sanitizes a synchronous stream of text chunks.
+
+    Args:
+        chunks: The input stream (e.g., LLM tokens).
+        processor: The processor to use.
+        action: The PII action to perform.
+        **options: Passed on to `StreamSanitizer`.
+
+    Yields:
+        Sanitized text, as soon as it is safe to release.
+
+    Example:
+        ```python
+        from l8e_beam.api import build_processor
+        from l8e_beam.streaming import sanitize_stream
+
+        for text in sanitize_stream(llm_tokens(), build_processor()):
+            send_to_client(text)
+        ```
+    """
+    sanitizer = StreamSanitizer(processor, action, **options)
+    for chunk in chunks:
+        released = sanitizer.feed(chunk)
+        if released:
+            yield released
+    released = sanitizer.flush()
+    if released:
+        yield released
+
+
+async def asanitize_stream(
+    chunks: AsyncIterable[str],
+    processor: PiiProcessor,
+    action: PiiAction = PiiAction.REDACT,
+    **options
+) -> AsyncIterator[str]:
+    """
+    Sanitizes an asynchronous stream of text chunks.
+
+    When NER is involved, sanitization runs in the default executor so that
+    the event loop is not blocked by model inference.
+
+    Args:
+        chunks: The input stream (e.g., an async LLM token stream).
+        processor: The processor to use.
+        action: The PII action to perform.
+        **options: Passed on to `StreamSanitizer`.
+
+    Yields:
+        Sanitized text, as soon as it is safe to release.
+    """
+    sanitizer = StreamSanitizer(processor, action, **options)
+    loop = asyncio.get_running_loop()
+
+    async def run(func, *args):
+        if sanitizer.uses_ner:
+            return await loop.run_in_executor(None, func, *args)
+        return func(*args)
+
+    async for chunk in chunks:
+        released = await run(sanitizer.feed, chunk)
+        if released:
+            yield released
+    released = await run(sanitizer.flush)
+    if released:
+        yield released
@@ -42,7 +42,7 @@ class TestSanitizePiiApi(unittest.TestCase):
             self.assertEqual(kwargs['nlp'], mock_nlp)
 
             mock_processor_instance.process_recursive.assert_called_once_with(
-                "test data", action=PiiAction.REDACT
+                "test data", action=PiiAction.REDACT, surrogates=None, deadline=None, paths=None
             )
 
     @patch('l8e_beam.api.PiiProcessor')
@@ -95,8 +95,27 @@ class TestSanitizePiiApi(unittest.TestCase):
         
         # Verify the correct action was passed to the processing method
         mock_processor_instance.process_recursive.assert_called_once_with(
-            "test data", action=PiiAction.ANONYMIZE
+            "test data", action=PiiAction.ANONYMIZE, surrogates=None, deadline=None, paths=None
         )
 
+    @patch('l8e_beam.api.PiiProcessor')
+    @patch('l8e_beam.api._get_model')
+    def test_doc_input(self, mock_get_model, MockPiiProcessor):
+        """
+        Test that a parsed spaCy Doc goes to `process` rather than the recursive walk.
+        """
+        import spacy
+        doc = spacy.blank("en")("Jane Doe")
+        mock_processor_instance = MockPiiProcessor.return_value
+
+        sanitize_pii(doc)
+
+        mock_processor_instance.process.assert_called_once_with(
+            doc, action=PiiAction.REDACT, surrogates=None, deadline=None
+        )
+        mock_processor_instance.process_recursive.assert_not_called()
+        with self.assertRaises(ValueError):
+            sanitize_pii(doc, batcher=Mock())
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
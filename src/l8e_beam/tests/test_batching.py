@@ -0,0 +1,118 @@
+# src/l8e_beam/tests/test_batching.py
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.api import sanitize_pii
+from l8e_beam.batching import DynamicBatcher
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+
+
+class TestDynamicBatcher(unittest.TestCase):
+
+    def setUp(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=nlp
+        )
+
+    def test_process_matches_processor(self):
+        text = "Jane Doe wrote from jane@example.com."
+        with DynamicBatcher(self.processor) as batcher:
+            self.assertEqual(batcher.process(text), self.processor.process(text))
+
+    def test_concurrent_callers_share_batches(self):
+        texts = [f"Ticket {i} was opened by Jane Doe." for i in range(40)]
+        results = [None] * len(texts)
+        start = threading.Barrier(len(texts))
+
+        def call(i):
+            start.wait()
+            results[i] = batcher.process(texts[i])
+
+        with DynamicBatcher(self.processor, max_batch_size=16, max_wait_ms=50) as batcher:
+            with patch.object(
+                self.processor, "get_findings_batch", wraps=self.processor.get_findings_batch
+            ) as batch_call:
+                threads = [threading.Thread(target=call, args=(i,)) for i in range(len(texts))]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        self.assertEqual(results, [f"Ticket {i} was opened by [REDACTED PERSON]." for i in range(40)])
+        self.assertLess(batch_call.call_count, len(texts))
+        self.assertTrue(all(len(c.args[0]) <= 16 for c in batch_call.call_args_list))
+        self.assertGreater(batcher.mean_batch_size, 1)
+
+    def test_duplicate_texts_in_a_batch_are_scanned_once(self):
+        with DynamicBatcher(self.processor, max_wait_ms=50) as batcher:
+            result = batcher.process_recursive({"a": "Jane Doe", "b": ["Jane Doe", "ok"]})
+            self.assertEqual(batcher.texts, 2)
+        self.assertEqual(
+            result, {"a": "[REDACTED PERSON]", "b": ["[REDACTED PERSON]", "ok"]}
+        )
+
+    def test_errors_are_propagated_to_callers(self):
+        with patch.object(self.processor, "get_findings_batch", side_effect=RuntimeError("boom")):
+            with DynamicBatcher(self.processor) as batcher:
+                with self.assertRaises(RuntimeError):
+                    batcher.process("Jane Doe")
+
+    def test_closed_batcher_rejects_work(self):
+        batcher = DynamicBatcher(self.processor)
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit("Jane Doe")
+
+    def test_close_racing_with_submit_resolves_every_future(self):
+        for _ in range(20):
+            batcher = DynamicBatcher(self.processor, max_wait_ms=0)
+            futures = []
+            start = threading.Barrier(5)
+
+            def submit():
+                start.wait()
+                for _ in range(50):
+                    try:
+                        futures.append(batcher.submit("Jane Doe"))
+                    except RuntimeError:
+                        return
+
+            threads = [threading.Thread(target=submit) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            start.wait()
+            batcher.close()
+            for thread in threads:
+                thread.join()
+            for future in futures:
+                self.assertEqual(future.result(timeout=5)[0].text, "Jane Doe")
+
+    def test_async_process_recursive(self):
+        data = {"user": "Jane Doe", "notes": ("mail jane@example.com",)}
+        with DynamicBatcher(self.processor) as batcher:
+            result = asyncio.run(batcher.aprocess_recursive(data, PiiAction.REDACT))
+        self.assertEqual(result, self.processor.process_recursive(data, PiiAction.REDACT))
+
+    def test_sanitize_pii_uses_batcher(self):
+        with DynamicBatcher(self.processor) as batcher:
+            result = sanitize_pii({"msg": "Jane Doe here"}, batcher=batcher)
+            self.assertEqual(batcher.texts, 1)
+        self.assertEqual(result, {"msg": "[REDACTED PERSON] here"})
+
+
+if __name__ == '__main__':
+    unittest.main()
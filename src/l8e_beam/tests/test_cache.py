@@ -0,0 +1,214 @@
+# src/l8e_beam/tests/test_cache.py
+
+import multiprocessing
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.cache import FindingsCache, SegmentCache
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.base import RegexRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+
+
+class TicketRecognizer(RegexRecognizer):
+    name = "TICKET"
+    regex = re.compile(r"TCK-\d+")
+
+
+def make_processor(cache, regex_recognizers=None, segment_cache=None):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+    ])
+    return PiiProcessor(
+        regex_recognizers=regex_recognizers or [EmailRecognizer()],
+        spacy_recognizers=[PersonRecognizer()],
+        nlp=nlp,
+        cache=cache,
+        segment_cache=segment_cache
+    )
+
+
+def _worker(path, offset):
+    processor = make_processor(FindingsCache(path))
+    for i in range(50):
+        processor.process(f"Jane Doe opened ticket {offset + i}")
+
+
+class TestFindingsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "findings.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_findings_survive_restarts(self):
+        text = "Jane Doe wrote to jane@example.com"
+        first = make_processor(FindingsCache(self.path))
+        self.assertEqual(first.process(text), "[REDACTED PERSON] wrote to [REDACTED EMAIL]")
+        self.assertEqual(first.stats.texts, 1)
+
+        # A fresh cache object and processor, as in a new process or run.
+        cache = FindingsCache(self.path)
+        second = make_processor(cache)
+        self.assertEqual(second.process(text, PiiAction.REDACT), "[REDACTED PERSON] wrote to [REDACTED EMAIL]")
+        self.assertEqual(second.stats.texts, 0)
+        self.assertEqual(cache.hits, 1)
+
+    def test_batch_lookup(self):
+        cache = FindingsCache(self.path)
+        processor = make_processor(cache)
+        processor.process_batch(["Jane Doe", "nothing here"])
+        result = processor.process_batch(["Jane Doe", "new text", "nothing here"])
+        self.assertEqual(result, ["[REDACTED PERSON]", "new text", "nothing here"])
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 3)
+
+    def test_recognizer_change_invalidates(self):
+        text = "Jane Doe filed TCK-42"
+        make_processor(FindingsCache(self.path)).process(text)
+
+        cache = FindingsCache(self.path)
+        changed = make_processor(cache, regex_recognizers=[EmailRecognizer(), TicketRecognizer()])
+        self.assertEqual(changed.process(text), "[REDACTED PERSON] filed [REDACTED TICKET]")
+        self.assertEqual(cache.hits, 0)
+
+        cache.purge(keep_processor=changed)
+        self.assertEqual(len(cache), 1)
+
+    def test_size_based_eviction(self):
+        cache = FindingsCache(self.path, max_bytes=200)
+        processor = make_processor(cache)
+        for i in range(30):
+            processor.get_findings(f"Jane Doe #{i}")
+        cache.evict()
+        self.assertLessEqual(cache.size(), 180)
+        # The most recently stored entry is kept.
+        self.assertIsNotNone(cache.get(processor, "Jane Doe #29"))
+
+    def test_eviction_in_chunks(self):
+        cache = FindingsCache(self.path, max_bytes=200)
+        cache.EVICTION_CHUNK = 3
+        processor = make_processor(cache)
+        for i in range(30):
+            processor.get_findings(f"Jane Doe #{i}")
+        cache.evict()
+        self.assertLessEqual(cache.size(), 180)
+        self.assertIsNotNone(cache.get(processor, "Jane Doe #29"))
+
+    def test_fresh_access_times_are_not_rewritten(self):
+        cache = FindingsCache(self.path)
+        processor = make_processor(cache)
+        processor.get_findings("Jane Doe")
+        statements = []
+        cache._connection().set_trace_callback(statements.append)
+        for _ in range(3):
+            self.assertIsNotNone(cache.get(processor, "Jane Doe"))
+        self.assertFalse([s for s in statements if s.startswith("UPDATE")])
+
+        cache.ACCESS_RESOLUTION = 0.0
+        cache.get(processor, "Jane Doe")
+        self.assertTrue([s for s in statements if s.startswith("UPDATE")])
+
+    def test_fingerprint_follows_recognizer_changes(self):
+        cache = FindingsCache(self.path)
+        processor = make_processor(cache)
+        text = "Jane Doe filed TCK-42"
+        self.assertEqual(processor.process(text), "[REDACTED PERSON] filed TCK-42")
+        before = cache.fingerprint(processor)
+
+        processor.regex_recognizers = processor.regex_recognizers + [TicketRecognizer()]
+        self.assertNotEqual(cache.fingerprint(processor), before)
+        self.assertEqual(processor.process(text), "[REDACTED PERSON] filed [REDACTED TICKET]")
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_concurrent_processes(self):
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_worker, args=(self.path, i * 50)) for i in range(4)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        self.assertTrue(all(w.exitcode == 0 for w in workers))
+        self.assertEqual(len(FindingsCache(self.path)), 200)
+
+
+SIGNATURE = (
+    "\n--\nJane Doe | Support Lead\njane@example.com\n"
+    "This message is confidential. If you received it by mistake, delete it.\n"
+)
+
+
+class TestSegmentCache(unittest.TestCase):
+
+    def test_only_new_segments_are_scanned(self):
+        cache = SegmentCache()
+        processor = make_processor(None, segment_cache=cache)
+        first = "Hi team. The export failed again." + SIGNATURE
+        second = "Hi team. It works now, thanks to Jane Doe!" + SIGNATURE
+        processor.process(first)
+        with patch.object(processor.nlp, "pipe", wraps=processor.nlp.pipe) as pipe:
+            result = processor.process(second)
+        self.assertEqual(
+            result,
+            "Hi team. It works now, thanks to [REDACTED PERSON]!\n--\n[REDACTED PERSON] | Support Lead\n"
+            "[REDACTED EMAIL]\nThis message is confidential. If you received it by mistake, delete it.\n"
+        )
+        scanned = [t for call in pipe.call_args_list for t in call.args[0]]
+        self.assertEqual(scanned, ["It works now, thanks to Jane Doe!\n"])
+        self.assertEqual(cache.misses, 8)
+        self.assertEqual(cache.hits, 6)
+        self.assertAlmostEqual(cache.hit_rate, 6 / 14)
+        self.assertEqual(cache.hit_chars, len(second) - len(scanned[0]))
+        self.assertAlmostEqual(cache.char_hit_rate, cache.hit_chars / (len(first) + len(second)))
+
+    def test_same_findings_as_whole_texts(self):
+        texts = [
+            f"Ticket {i}. Reporter: Jane Doe\nContact jane@example.com. Status: open.\n\nThanks!"
+            for i in range(5)
+        ] + ["", "   ", "Jane Doe"]
+        plain = make_processor(None)
+        processor = make_processor(None, segment_cache=SegmentCache())
+
+        def describe(findings_lists):
+            # Findings come per segment; `apply_findings` sorts them by start
+            return [
+                [(f.text, f.pii_type, f.start, f.end) for f in sorted(fs, key=lambda f: f.start)]
+                for fs in findings_lists
+            ]
+
+        expected = describe(plain.get_findings_batch(texts))
+        self.assertEqual(describe(processor.get_findings_batch(texts)), expected)
+        self.assertEqual(describe([processor.get_findings(t) for t in texts]), expected)
+
+    def test_paragraphs_and_bound(self):
+        cache = SegmentCache(max_segments=2, split="paragraph")
+        self.assertEqual(
+            cache.segments("a. b\nc\n\n  \nd"), [(0, "a. b\nc\n\n  \n"), (11, "d")]
+        )
+        processor = make_processor(None, segment_cache=cache)
+        processor.process("one\n\ntwo\n\nthree")
+        self.assertEqual(len(cache), 2)
+        processor.process("one")
+        self.assertEqual(cache.hits, 0)
+
+    def test_processors_do_not_share_entries(self):
+        cache = SegmentCache()
+        text = "Jane Doe filed TCK-42"
+        make_processor(None, segment_cache=cache).process(text)
+        changed = make_processor(None, [TicketRecognizer()], segment_cache=cache)
+        self.assertEqual(changed.process(text), "[REDACTED PERSON] filed [REDACTED TICKET]")
+        self.assertEqual(cache.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
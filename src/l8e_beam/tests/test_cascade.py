@@ -0,0 +1,72 @@
+# src/l8e_beam/tests/test_cascade.py
+
+import unittest
+import spacy
+
+from l8e_beam.cascade import CascadePiiProcessor, has_entities_or_proper_nouns
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.recognizers.org import OrgRecognizer
+from l8e_beam.recognizers.email import EmailRecognizer
+
+
+def make_nlp(patterns):
+    """Builds a small rule-based pipeline standing in for a trained model."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(patterns)
+    return nlp
+
+
+class TestCascadePiiProcessor(unittest.TestCase):
+
+    def setUp(self):
+        # The "fast" model only knows first names; the "accurate" one knows full
+        # names and organizations.
+        self.fast = make_nlp([{"label": "PERSON", "pattern": "Anna"}])
+        self.accurate = make_nlp([
+            {"label": "PERSON", "pattern": [{"LOWER": "anna"}, {"LOWER": "schmidt"}]},
+            {"label": "ORG", "pattern": "Acme"},
+        ])
+        self.processor = CascadePiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer(), OrgRecognizer()],
+            nlp=self.fast,
+            escalation_nlp=self.accurate
+        )
+
+    def test_escalates_only_entity_bearing_sentences(self):
+        text = "The build is green. Anna Schmidt joined Acme today. Ping acme-bot."
+        result = self.processor.process(text, action=PiiAction.REDACT)
+        self.assertEqual(
+            result,
+            "The build is green. [REDACTED PERSON] joined [REDACTED ORG] today. Ping acme-bot."
+        )
+        self.assertEqual(self.processor.total_sentences, 3)
+        self.assertEqual(self.processor.escalated_sentences, 1)
+
+    def test_unflagged_sentences_keep_fast_findings(self):
+        # Acme alone is not found by the fast model, so the sentence is not escalated.
+        text = "Acme shipped it. Email anna@example.com."
+        result = self.processor.process(text, action=PiiAction.REDACT)
+        self.assertEqual(result, "Acme shipped it. Email [REDACTED EMAIL].")
+        self.assertEqual(self.processor.escalated_sentences, 0)
+
+    def test_fast_findings_missed_by_the_accurate_model_are_kept(self):
+        # The accurate model does not know "Bob"; the fast model does.
+        self.fast.get_pipe("entity_ruler").add_patterns([{"label": "PERSON", "pattern": "Bob"}])
+        result = self.processor.process("Anna Schmidt met Bob at Acme.", action=PiiAction.REDACT)
+        self.assertEqual(result, "[REDACTED PERSON] met [REDACTED PERSON] at [REDACTED ORG].")
+        findings = self.processor.get_findings("Anna Schmidt met Bob at Acme.")
+        # "Anna" from the fast model gave way to "Anna Schmidt"
+        self.assertEqual(sorted(f.text for f in findings), ["Acme", "Anna Schmidt", "Bob"])
+
+    def test_custom_heuristic(self):
+        self.processor.escalate_when = has_entities_or_proper_nouns
+        result = self.processor.process("It was built by Acme.", action=PiiAction.REDACT)
+        self.assertEqual(result, "It was built by [REDACTED ORG].")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# src/l8e_beam/tests/test_conversation.py
+
+import unittest
+import spacy
+
+from l8e_beam.conversation import ConversationSanitizer
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+
+
+class TestConversationSanitizer(unittest.TestCase):
+
+    def setUp(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=nlp
+        )
+
+    def test_only_new_messages_are_processed(self):
+        sanitizer = ConversationSanitizer(self.processor)
+        history = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "I am Jane Doe, mail jane@example.com"},
+        ]
+        first = sanitizer.sanitize(history, conversation_id="c1")
+        self.assertEqual(first[1], {"role": "user", "content": "I am [REDACTED PERSON], mail [REDACTED EMAIL]"})
+        calls_after_first_turn = self.processor.stats.texts
+
+        history += [
+            {"role": "assistant", "content": "Hello! How can I help?"},
+            {"role": "user", "content": "Please summarize my account."},
+        ]
+        second = sanitizer.sanitize(history, conversation_id="c1")
+        self.assertEqual(second[:2], first)
+        self.assertEqual(self.processor.stats.texts - calls_after_first_turn, 2)
+        self.assertEqual(sanitizer.hits, 2)
+        self.assertEqual(sanitizer.misses, 4)
+
+    def test_anonymized_values_are_consistent_across_turns(self):
+        sanitizer = ConversationSanitizer(self.processor, action=PiiAction.ANONYMIZE)
+        history = [{"role": "user", "content": "Jane Doe here."}]
+        turn1 = sanitizer.sanitize(history, conversation_id="c1")
+        history.append({"role": "user", "content": "Again, it's Jane Doe."})
+        turn2 = sanitizer.sanitize(history, conversation_id="c1")
+
+        fake_name = turn1[0]["content"][:-len(" here.")]
+        self.assertNotEqual(fake_name, "Jane Doe")
+        self.assertEqual(turn2[1]["content"], f"Again, it's {fake_name}.")
+
+    def test_multimodal_content_parts(self):
+        sanitizer = ConversationSanitizer(self.processor)
+        history = [{"role": "user", "content": [{"type": "text", "text": "Ask Jane Doe"}]}]
+        result = sanitizer.sanitize(history)
+        self.assertEqual(result[0]["content"], [{"type": "text", "text": "Ask [REDACTED PERSON]"}])
+
+    def test_memo_is_bounded(self):
+        sanitizer = ConversationSanitizer(self.processor, max_messages=2, max_conversations=1)
+        sanitizer.sanitize([{"role": "user", "content": str(i)} for i in range(5)], "c1")
+        self.assertEqual(len(sanitizer._conversations["c1"].messages), 2)
+        sanitizer.sanitize([{"role": "user", "content": "hi"}], "c2")
+        self.assertNotIn("c1", sanitizer._conversations)
+
+
+if __name__ == '__main__':
+    unittest.main()
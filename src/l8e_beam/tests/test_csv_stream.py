@@ -0,0 +1,139 @@
+# src/l8e_beam/tests/test_csv_stream.py
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.csv_stream import ColumnPolicy, CsvStreamSanitizer, sanitize_csv_file
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.phone import PhoneRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.vault import TokenVault
+
+CSV_TEXT = (
+    "id,email,notes,owner\r\n"
+    "1,jane@example.com,\"Called Jane Doe, see jane@example.com\",Jane Doe\r\n"
+    "2,john@example.com,,Jane Doe\r\n"
+    "3,jane@example.com,\"Multi\nline note by Jane Doe\",Jane Doe\r\n"
+)
+
+
+class TestCsvStreamSanitizer(unittest.TestCase):
+
+    def setUp(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer(), PhoneRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=nlp
+        )
+
+    def sanitize(self, text, **options):
+        out = io.StringIO(newline="")
+        rows = CsvStreamSanitizer(self.processor, **options).sanitize(io.StringIO(text, newline=""), out)
+        return rows, list(csv.reader(io.StringIO(out.getvalue(), newline="")))
+
+    def test_column_policies(self):
+        rows, result = self.sanitize(CSV_TEXT, columns={
+            "id": ColumnPolicy.SKIP,
+            "email": ColumnPolicy.REGEX_ONLY,
+            "owner": [DEFAULT_RECOGNIZERS.PERSON],
+        })
+        self.assertEqual(rows, 3)
+        self.assertEqual(result[0], ["id", "email", "notes", "owner"])
+        self.assertEqual(result[1], [
+            "1", "[REDACTED EMAIL]", "Called [REDACTED PERSON], see [REDACTED EMAIL]", "[REDACTED PERSON]"
+        ])
+        self.assertEqual(result[2], ["2", "[REDACTED EMAIL]", "", "[REDACTED PERSON]"])
+        self.assertEqual(result[3][2], "Multi\nline note by [REDACTED PERSON]")
+
+    def test_regex_only_and_subset_columns(self):
+        text = "a,b\r\nJane Doe jane@example.com,Jane Doe jane@example.com\r\n"
+        _, result = self.sanitize(text, columns={
+            "a": ColumnPolicy.REGEX_ONLY, "b": [DEFAULT_RECOGNIZERS.PERSON]
+        })
+        self.assertEqual(result[1], ["Jane Doe [REDACTED EMAIL]", "[REDACTED PERSON] jane@example.com"])
+
+    def test_ner_scales_with_distinct_values(self):
+        text = "name\r\n" + "".join(f"Jane Doe\r\nclient {i % 3} Jane Doe\r\n" for i in range(50))
+        sanitizer = CsvStreamSanitizer(self.processor, batch_rows=8)
+        with patch.object(self.processor.nlp, "pipe", wraps=self.processor.nlp.pipe) as pipe:
+            sanitizer.sanitize(io.StringIO(text, newline=""), io.StringIO(newline=""))
+        self.assertEqual(sanitizer.rows, 100)
+        self.assertEqual(sanitizer.scanned, 4)
+        # Repeats within the first batch are deduplicated before the memo is filled
+        self.assertEqual(sanitizer.memo_hits, 92)
+        self.assertEqual(sum(len(list(c.args[0])) for c in pipe.call_args_list), 4)
+
+    def test_memo_is_bounded(self):
+        text = "name\r\n" + "".join(f"Jane Doe {i}\r\n" for i in range(20)) * 2
+        sanitizer = CsvStreamSanitizer(self.processor, batch_rows=4, memo_size=5)
+        sanitizer.sanitize(io.StringIO(text, newline=""), io.StringIO(newline=""))
+        # The values come back only after they have been evicted
+        self.assertEqual(sanitizer.scanned, 40)
+        self.assertEqual(sanitizer.memo_hits, 0)
+
+    def test_rows_keep_their_order_across_batches(self):
+        text = "n,note\r\n" + "".join(f"{i},Jane Doe {i}\r\n" for i in range(25))
+        _, result = self.sanitize(text, batch_rows=4, columns={"n": ColumnPolicy.SKIP})
+        self.assertEqual(result[1:], [[str(i), f"[REDACTED PERSON] {i}"] for i in range(25)])
+
+    def test_anonymization_is_consistent(self):
+        text = "a,b\r\nJane Doe,x\r\ny,Jane Doe\r\n"
+        _, result = self.sanitize(text, action=PiiAction.ANONYMIZE, batch_rows=1)
+        self.assertNotEqual(result[1][0], "Jane Doe")
+        self.assertEqual(result[1][0], result[2][1])
+
+    def test_surrogates_are_bounded(self):
+        text = "email\r\n" + "".join(f"user{i}@example.com\r\n" for i in range(20))
+        sanitizer = CsvStreamSanitizer(self.processor, PiiAction.ANONYMIZE, max_surrogates=5)
+        sanitizer.sanitize(io.StringIO(text, newline=""), io.StringIO(newline=""))
+        self.assertEqual(len(sanitizer._surrogates), 5)
+
+    def test_tokenize_with_vault(self):
+        vault = TokenVault()
+        text = "a,b\r\nJane Doe,x\r\ny,Jane Doe\r\n"
+        _, result = self.sanitize(text, action=PiiAction.TOKENIZE, surrogates=vault)
+        self.assertEqual(result[1:], [["[PERSON_1]", "x"], ["y", "[PERSON_1]"]])
+
+    def test_without_header_and_ragged_rows(self):
+        text = "1,Jane Doe\r\n2\r\n3,Jane Doe,jane@example.com\r\n"
+        rows, result = self.sanitize(text, has_header=False, columns={0: ColumnPolicy.SKIP})
+        self.assertEqual(rows, 3)
+        self.assertEqual(result, [
+            ["1", "[REDACTED PERSON]"], ["2"], ["3", "[REDACTED PERSON]", "[REDACTED EMAIL]"]
+        ])
+
+    def test_dialect_and_empty_input(self):
+        out = io.StringIO(newline="")
+        CsvStreamSanitizer(self.processor, delimiter=";").sanitize(io.StringIO("a;b\nJane Doe;1\n"), out)
+        self.assertEqual(out.getvalue(), "a;b\r\n[REDACTED PERSON];1\r\n")
+        self.assertEqual(self.sanitize("")[0], 0)
+
+    def test_sanitize_csv_file(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        src, dst = os.path.join(tmpdir, "in.csv"), os.path.join(tmpdir, "out.csv")
+        with open(src, "w", encoding="utf-8", newline="") as f:
+            f.write(CSV_TEXT)
+        rows = sanitize_csv_file(src, dst, self.processor, columns={"id": ColumnPolicy.SKIP})
+        with open(dst, encoding="utf-8", newline="") as f:
+            result = list(csv.reader(f))
+        self.assertEqual(rows, 3)
+        self.assertEqual(result[2], ["2", "[REDACTED EMAIL]", "", "[REDACTED PERSON]"])
+
+
+if __name__ == '__main__':
+    unittest.main()
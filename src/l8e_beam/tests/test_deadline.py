@@ -0,0 +1,123 @@
+# src/l8e_beam/tests/test_deadline.py
+
+import unittest
+
+import spacy
+from spacy.language import Language
+
+from l8e_beam.api import sanitize_pii
+from l8e_beam.batching import DynamicBatcher
+from l8e_beam.deadline import Deadline, DeadlineExceeded, DeadlinePolicy
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+
+
+class FakeClock:
+    """A clock that only moves when the test model runs."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+CLOCK = FakeClock()
+
+
+@Language.component("l8e_beam_test_one_second_per_doc")
+def one_second_per_doc(doc):
+    CLOCK.now += 1.0
+    return doc
+
+
+class TestDeadline(unittest.TestCase):
+
+    def setUp(self):
+        CLOCK.now = 0.0
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        nlp.add_pipe("l8e_beam_test_one_second_per_doc")
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=nlp
+        )
+        self.text = "Jane Doe wrote from jane@example.com."
+
+    def deadline(self, budget_ms, policy=DeadlinePolicy.REGEX_ONLY):
+        return Deadline(budget_ms, policy=policy, clock=CLOCK)
+
+    def test_enough_budget_gives_full_result(self):
+        deadline = self.deadline(5000)
+        result = self.processor.process(self.text, deadline=deadline)
+        self.assertEqual(result, "[REDACTED PERSON] wrote from [REDACTED EMAIL].")
+        self.assertFalse(deadline.degraded)
+
+    def test_regex_only_fallback(self):
+        deadline = self.deadline(0)
+        result = self.processor.process(self.text, deadline=deadline)
+        self.assertEqual(result, "Jane Doe wrote from [REDACTED EMAIL].")
+        self.assertEqual(deadline.fallbacks, 1)
+        self.assertEqual(self.processor.stats.deadline_fallbacks, 1)
+
+    def test_redact_field_fallback(self):
+        deadline = self.deadline(0, DeadlinePolicy.REDACT_FIELD)
+        data = {"note": self.text, "id": "42"}
+        for action in (PiiAction.REDACT, PiiAction.ANONYMIZE):
+            result = self.processor.process_recursive(data, action, deadline=deadline)
+            # Strings that do not need NER are unaffected.
+            self.assertEqual(result, {"note": "[REDACTED FIELD]", "id": "42"})
+
+    def test_raise_fallback(self):
+        with self.assertRaises(DeadlineExceeded):
+            self.processor.process(self.text, deadline=self.deadline(0, DeadlinePolicy.RAISE))
+
+    def test_long_strings_are_chunked_within_budget(self):
+        self.processor.ner_chunk_chars = 20
+        text = "Jane Doe is here. Jane Doe again. Jane Doe last."
+        deadline = self.deadline(1500)
+        result = self.processor.process(text, deadline=deadline)
+        # Two chunks fit into 1.5 "seconds"; the third one did not.
+        self.assertEqual(
+            result, "[REDACTED PERSON] is here. [REDACTED PERSON] again. Jane Doe last."
+        )
+        self.assertEqual(deadline.fallbacks, 1)
+
+    def test_batched_scan_respects_budget(self):
+        texts = [f"Ticket {i} by Jane Doe" for i in range(4)]
+        deadline = self.deadline(500)
+        results = self.processor.process_batch(texts, deadline=deadline)
+        self.assertTrue(all(r.endswith("[REDACTED PERSON]") for r in results))
+
+        deadline = self.deadline(0)
+        results = self.processor.process_batch(texts, deadline=deadline)
+        self.assertEqual(results, texts)
+        self.assertEqual(deadline.fallbacks, 4)
+
+    def test_unmeasured_models_are_not_assumed_free(self):
+        text = "Jane Doe wrote. " * 10
+        deadline = self.deadline(1)
+        self.assertEqual(self.processor.process(text, deadline=deadline), text)
+        self.assertEqual(deadline.fallbacks, 1)
+
+    def test_cost_estimate_is_shared_per_model(self):
+        self.processor.process(self.text)
+        measured = self.processor._ner_seconds_per_char
+        self.assertNotEqual(measured, PiiProcessor.default_ner_seconds_per_char)
+        other = PiiProcessor(
+            regex_recognizers=[], spacy_recognizers=[PersonRecognizer()], nlp=self.processor.nlp
+        )
+        self.assertEqual(other._ner_seconds_per_char, measured)
+
+    def test_sanitize_pii_rejects_deadline_with_batcher(self):
+        with DynamicBatcher(self.processor) as batcher:
+            with self.assertRaises(ValueError):
+                sanitize_pii(self.text, batcher=batcher, deadline=self.deadline(10))
+
+
+if __name__ == '__main__':
+    unittest.main()
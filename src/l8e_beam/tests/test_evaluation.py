@@ -0,0 +1,152 @@
+# src/l8e_beam/tests/test_evaluation.py
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.cli import main
+from l8e_beam.evaluation import (
+    EvaluationReport, compare, evaluate, format_reports, load_corpus, predicted_spans
+)
+from l8e_beam.recognizers.pii_processor import PiiProcessor, _rss_bytes
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+
+CORPUS = [
+    # Both spans found
+    {"text": "Jane Doe wrote from jane@example.com.",
+     "spans": [{"start": 0, "end": 8, "label": "PER"}, {"start": 20, "end": 36, "label": "EMAIL"}]},
+    # The person is missed (false negative)
+    {"text": "Ask John Smith about it.",
+     "spans": [{"start": 4, "end": 14, "label": "PER"}]},
+    # No gold spans, but the email is predicted (false positive)
+    {"text": "Write to noreply@example.com for nothing.", "spans": []},
+]
+
+
+def _make_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+    ])
+    return nlp
+
+
+class TestEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, "corpus.jsonl")
+        with open(self.path, "w", encoding="utf-8") as f:
+            for record in CORPUS:
+                f.write(json.dumps(record) + "\n")
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=_make_nlp()
+        )
+
+    def test_load_corpus_validates_spans(self):
+        self.assertEqual(len(load_corpus(self.path)), 3)
+        bad = os.path.join(self.tmpdir, "bad.jsonl")
+        with open(bad, "w") as f:
+            f.write(json.dumps({"text": "abc", "spans": [{"start": 0, "end": 9, "label": "X"}]}))
+        with self.assertRaises(ValueError):
+            load_corpus(bad)
+
+    def test_predicted_spans(self):
+        self.assertEqual(
+            predicted_spans(self.processor, CORPUS[0]["text"]),
+            [(0, 8, "PERSON"), (20, 36, "EMAIL")]
+        )
+
+    def test_scores(self):
+        report = evaluate(
+            self.processor, load_corpus(self.path), label_map={"PER": "PERSON"}, warmup=0
+        )
+        self.assertEqual((report.overall.tp, report.overall.fp, report.overall.fn), (2, 1, 1))
+        self.assertEqual(report.per_type["PERSON"].recall, 0.5)
+        self.assertEqual(report.per_type["PERSON"].precision, 1.0)
+        self.assertEqual(report.per_type["EMAIL"].precision, 0.5)
+        self.assertAlmostEqual(report.overall.f1, 2 / 3)
+        self.assertEqual(report.docs, 3)
+        self.assertEqual(len(report.latencies), 3)
+        self.assertGreater(report.docs_per_second, 0)
+
+    def test_memory_sampling_and_scoring_are_not_timed(self):
+        import time
+
+        def slow_rss():
+            time.sleep(0.05)
+            return 0
+
+        with patch("l8e_beam.evaluation._rss_bytes", slow_rss):
+            report = evaluate(self.processor, load_corpus(self.path), warmup=0)
+        self.assertEqual(report.seconds, sum(report.latencies))
+        self.assertLess(report.seconds, 0.05)
+
+    def test_latency_percentiles(self):
+        report = EvaluationReport(name="x", latencies=[0.001 * i for i in range(1, 101)])
+        self.assertAlmostEqual(report.latency_percentile(50), 0.050)
+        self.assertAlmostEqual(report.latency_percentile(95), 0.095)
+
+    def test_compare_and_format(self):
+        reports = compare(
+            {"sm": lambda: self.processor, "regex-only": lambda: PiiProcessor(
+                [EmailRecognizer()], [], _make_nlp())},
+            load_corpus(self.path),
+            label_map={"PER": "PERSON"}
+        )
+        self.assertEqual([r.name for r in reports], ["sm", "regex-only"])
+        self.assertLess(reports[1].overall.recall, reports[0].overall.recall)
+        table = format_reports(reports)
+        self.assertIn("regex-only", table)
+        self.assertIn("PERSON", table)
+        json.dumps([r.to_dict() for r in reports])
+
+    @unittest.skipUnless(_rss_bytes() is not None, "requires /proc")
+    def test_memory_includes_the_model(self):
+        shared = []
+
+        def factory():
+            # Stands in for a model that stays loaded, e.g. in MODEL_REGISTRY.
+            if not shared:
+                shared.append(bytearray(64 * 1024 * 1024))
+            return self.processor
+
+        configurations = {"first": factory, "second": factory}
+        examples = load_corpus(self.path)
+        isolated = compare(configurations, examples, warmup=0)
+        for report in isolated:
+            self.assertGreaterEqual(report.peak_rss_delta_bytes, 48 * 1024 * 1024)
+
+        # In-process, the second configuration inherits the first one's model.
+        in_process = compare(configurations, examples, warmup=0, isolate=False)
+        self.assertGreaterEqual(in_process[0].peak_rss_delta_bytes, 48 * 1024 * 1024)
+        self.assertLess(in_process[1].peak_rss_delta_bytes, 16 * 1024 * 1024)
+
+    def test_isolated_errors_are_raised(self):
+        def factory():
+            raise ValueError("no such model")
+
+        with self.assertRaisesRegex(ValueError, "no such model"):
+            compare({"broken": factory}, load_corpus(self.path))
+
+    def test_cli(self):
+        output = io.StringIO()
+        with patch("l8e_beam.api._get_model", return_value=_make_nlp()), redirect_stdout(output):
+            main(["evaluate", self.path, "--label-map", "PER=PERSON", "--json"])
+        (report,) = json.loads(output.getvalue())
+        self.assertEqual(report["per_type"]["PERSON"]["tp"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
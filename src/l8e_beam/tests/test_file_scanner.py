@@ -0,0 +1,77 @@
+# src/l8e_beam/tests/test_file_scanner.py
+
+import os
+import re
+import tempfile
+import unittest
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.file_scanner import sanitize_file, BytesRegexScanner
+from l8e_beam.recognizers.base import RegexRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.recognizers import REGEX_RECOGNIZERS
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+from l8e_beam.recognizers.person import PersonRecognizer
+
+
+class UuidRecognizer(RegexRecognizer):
+    name = "UUID"
+    regex = re.compile(r"[a-f0-9]{8}-([a-f0-9]{4}-){3}[a-f0-9]{12}", re.I)
+
+
+class TestSanitizeFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmpdir.name, "in.log")
+        self.dst = os.path.join(self.tmpdir.name, "out.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, text):
+        with open(self.src, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _read(self):
+        with open(self.dst, encoding="utf-8") as f:
+            return f.read()
+
+    def test_matches_string_processing(self):
+        lines = [
+            f"{i} user{i}@example.com called 555-867-5309 card 4242424242424242 ünïcödé"
+            for i in range(200)
+        ]
+        text = "\n".join(lines)
+        self._write(text)
+
+        # Tiny windows force many matches to cross chunk boundaries.
+        count = sanitize_file(self.src, self.dst, chunk_size=37, max_match_length=64)
+
+        expected = PiiProcessor(
+            regex_recognizers=REGEX_RECOGNIZERS, spacy_recognizers=[], nlp=None
+        ).process(text, PiiAction.REDACT)
+        self.assertEqual(self._read(), expected)
+        self.assertEqual(count, 600)
+
+    def test_custom_and_disabled_recognizers(self):
+        self._write("id 123e4567-e89b-12d3-a456-426614174000 mail a@b.io")
+        sanitize_file(
+            self.src, self.dst,
+            custom_recognizers=[UuidRecognizer()],
+            disabled_recognizers=[DEFAULT_RECOGNIZERS.EMAIL]
+        )
+        self.assertEqual(self._read(), "id [REDACTED UUID] mail a@b.io")
+
+    def test_empty_file(self):
+        self._write("")
+        self.assertEqual(sanitize_file(self.src, self.dst), 0)
+        self.assertEqual(self._read(), "")
+
+    def test_rejects_spacy_recognizers(self):
+        with self.assertRaises(ValueError):
+            BytesRegexScanner([PersonRecognizer()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# src/l8e_beam/tests/test_incremental.py
+
+import random
+import unittest
+
+import spacy
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.incremental import MIN_MARGIN, _common_prefix, _common_suffix, resanitize, sanitize_document
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.recognizers.phone import PhoneRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+WORDS = ["the", "report", "was", "sent", "to", "Jane Doe", "jane@example.com", "call",
+         "555-123-4567", "about", "John", "invoice", "42", "and", "Doe"]
+
+
+def make_processor():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]},
+        {"label": "PERSON", "pattern": [{"LOWER": "john"}]},
+    ])
+    return PiiProcessor(
+        regex_recognizers=[EmailRecognizer(), PhoneRecognizer()],
+        spacy_recognizers=[PersonRecognizer()],
+        nlp=nlp
+    )
+
+
+def make_document(rng, paragraphs):
+    return "\n\n".join(
+        "\n".join(" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(3))
+        for _ in range(paragraphs)
+    )
+
+
+def describe(findings):
+    return sorted((f.start, f.end, f.pii_type, f.text) for f in findings)
+
+
+class TestResanitize(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = make_processor()
+
+    def test_same_result_as_full_scan(self):
+        rng = random.Random(4)
+        text = make_document(rng, 20)
+        result = sanitize_document(self.processor, text)
+        for _ in range(100):
+            start = rng.randrange(len(text))
+            end = min(len(text), start + rng.randrange(30))
+            edit = rng.choice(["", " " + rng.choice(WORDS) + " ", rng.choice(WORDS), "\n\n"])
+            text = text[:start] + edit + text[end:]
+            result = resanitize(self.processor, result.source, result.findings, text, margin=20)
+            self.assertEqual(describe(result.findings), describe(self.processor.get_findings(text)))
+            self.assertEqual(result.text, self.processor.process(text))
+
+    def test_rescans_only_around_the_edit(self):
+        text = make_document(random.Random(1), 200)
+        result = sanitize_document(self.processor, text)
+        middle = len(text) // 2
+        edited = text[:middle] + " Jane Doe " + text[middle:]
+        result = resanitize(self.processor, text, result.findings, edited)
+        start, end = result.rescanned
+        self.assertLessEqual(start, middle)
+        self.assertGreaterEqual(end, middle + 10)
+        self.assertLess(end - start, 2000)
+        self.assertEqual(result.text, self.processor.process(edited))
+
+    def test_findings_straddling_the_window_are_rescanned_whole(self):
+        text = "x " * 200 + "Jane Doe" + " y" * 50
+        result = sanitize_document(self.processor, text)
+        edited = text[:270] + "w" + text[271:]
+        # The window would end inside "Jane Doe" (400-408)
+        result = resanitize(self.processor, text, result.findings, edited, margin=MIN_MARGIN + 3, max_context=0)
+        self.assertEqual(result.rescanned, (270 - MIN_MARGIN - 3, 408))
+        self.assertEqual(describe(result.findings), describe(self.processor.get_findings(edited)))
+
+    def test_small_margins_are_raised(self):
+        rng = random.Random(7)
+        text = make_document(rng, 5)
+        result = sanitize_document(self.processor, text)
+        for _ in range(100):
+            start = rng.randrange(len(text))
+            end = min(len(text), start + rng.randrange(30))
+            edit = rng.choice(["", " " + rng.choice(WORDS) + " ", "-", "@", "\n\n"])
+            text = text[:start] + edit + text[end:]
+            result = resanitize(self.processor, result.source, result.findings, text, margin=0, max_context=0)
+            self.assertEqual(describe(result.findings), describe(self.processor.get_findings(text)))
+
+    def test_deleted_findings_are_dropped(self):
+        text = "Jane Doe was here. " + "x " * 100
+        result = sanitize_document(self.processor, text)
+        result = resanitize(self.processor, text, result.findings, text[9:])
+        self.assertEqual(result.findings, [])
+
+    def test_anonymized_values_are_stable(self):
+        text = "Jane Doe wrote.\n\nThen John replied."
+        first = sanitize_document(self.processor, text, PiiAction.ANONYMIZE)
+        second = resanitize(
+            self.processor, text, first.findings, text + "\n\nJohn again.",
+            PiiAction.ANONYMIZE, surrogates=first.surrogates
+        )
+        self.assertTrue(second.text.startswith(first.text))
+        fake = first.surrogates[("PERSON", "John")]
+        self.assertEqual(second.text.count(fake), 2)
+
+    def test_unchanged_text(self):
+        text = "Mail jane@example.com"
+        result = sanitize_document(self.processor, text)
+        again = resanitize(self.processor, text, result.findings, text)
+        self.assertEqual(again.text, "Mail [REDACTED EMAIL]")
+        self.assertEqual(again.rescanned, (len(text), len(text)))
+
+    def test_common_prefix_and_suffix(self):
+        a = "a" * 10000 + "b" + "c" * 9000
+        b = "a" * 10000 + "xy" + "c" * 9000
+        prefix = _common_prefix(a, b)
+        self.assertEqual(prefix, 10000)
+        self.assertEqual(_common_suffix(a, b, len(a) - prefix), 9000)
+        self.assertEqual(_common_prefix("abc", "abc"), 3)
+        self.assertEqual(_common_suffix("aa", "aaa", 2), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
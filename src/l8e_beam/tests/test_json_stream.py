@@ -0,0 +1,130 @@
+# src/l8e_beam/tests/test_json_stream.py
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.json_stream import JsonStreamSanitizer, sanitize_json_file
+from l8e_beam.recognizers.pii_processor import PathFilter, PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.vault import TokenVault
+
+DOCUMENT = {
+    "id": 7,
+    "active": True,
+    "score": -1.5e3,
+    "owner": None,
+    "messages": [
+        {"role": "user", "content": "I am Jane Doe, mail jane@example.com"},
+        {"role": "assistant", "content": "Hello Jane Doe éè \"quoted\" \\ \n line"},
+    ],
+    "jane@example.com": "key is not sanitized",
+    "nested": [[], {}, ["Jane Doe"]],
+}
+
+
+class TestJsonStreamSanitizer(unittest.TestCase):
+
+    def setUp(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=nlp
+        )
+
+    def sanitize(self, text, **options):
+        out = io.StringIO()
+        JsonStreamSanitizer(self.processor, **options).sanitize(io.StringIO(text), out)
+        return out.getvalue()
+
+    def test_matches_process_recursive(self):
+        expected = self.processor.process_recursive(DOCUMENT, PiiAction.REDACT)
+        for indent in (None, 2):
+            text = json.dumps(DOCUMENT, indent=indent)
+            for chunk_size in (1, 7, 1 << 20):
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    self.assertEqual(json.loads(self.sanitize(text, chunk_size=chunk_size)), expected)
+
+    def test_formatting_is_preserved(self):
+        text = '{ "a" : [ 1 ,\n\t"Jane Doe" ] ,"b":"ok" }\n'
+        self.assertEqual(self.sanitize(text, chunk_size=3), '{ "a" : [ 1 ,\n\t"[REDACTED PERSON]" ] ,"b":"ok" }\n')
+
+    def test_paths(self):
+        text = json.dumps(DOCUMENT)
+        paths = PathFilter(include=["messages.*.content"], exclude=["messages.1"])
+        result = json.loads(self.sanitize(text, paths=paths))
+        self.assertEqual(result, self.processor.process_recursive(DOCUMENT, PiiAction.REDACT, paths=paths))
+        self.assertEqual(result["nested"], [[], {}, ["Jane Doe"]])
+        self.assertEqual(result["messages"][1], DOCUMENT["messages"][1])
+
+    def test_strings_are_batched(self):
+        document = [f"Note {i} from Jane Doe" for i in range(10)]
+        sanitizer = JsonStreamSanitizer(self.processor, batch_size=4, chunk_size=16)
+        with patch.object(self.processor, "process_batch", wraps=self.processor.process_batch) as batch:
+            out = io.StringIO()
+            count = sanitizer.sanitize(io.StringIO(json.dumps(document)), out)
+        self.assertEqual(count, 10)
+        self.assertEqual(sanitizer.strings, 10)
+        self.assertEqual([len(c.args[0]) for c in batch.call_args_list], [4, 4, 2])
+        self.assertEqual(json.loads(out.getvalue()), [f"Note {i} from [REDACTED PERSON]" for i in range(10)])
+
+    def test_anonymization_is_consistent_across_batches(self):
+        document = ["Jane Doe", "x", "Jane Doe"]
+        result = json.loads(self.sanitize(json.dumps(document), action=PiiAction.ANONYMIZE, batch_size=1))
+        self.assertNotEqual(result[0], "Jane Doe")
+        self.assertEqual(result[0], result[2])
+
+    def test_surrogates_are_bounded(self):
+        document = [f"user{i}@example.com" for i in range(20)]
+        sanitizer = JsonStreamSanitizer(self.processor, PiiAction.ANONYMIZE, max_surrogates=5)
+        sanitizer.sanitize(io.StringIO(json.dumps(document)), io.StringIO())
+        self.assertEqual(len(sanitizer._surrogates), 5)
+
+    def test_tokenize_with_vault(self):
+        vault = TokenVault()
+        result = json.loads(self.sanitize(
+            json.dumps(["Jane Doe", {"to": "Jane Doe"}]), action=PiiAction.TOKENIZE, surrogates=vault
+        ))
+        self.assertEqual(result, ["[PERSON_1]", {"to": "[PERSON_1]"}])
+        self.assertEqual(vault.restore(result[0]), "Jane Doe")
+
+    def test_scalar_documents(self):
+        self.assertEqual(self.sanitize('"Jane Doe"'), '"[REDACTED PERSON]"')
+        self.assertEqual(self.sanitize(" 42 "), " 42 ")
+
+    def test_invalid_json(self):
+        invalid = [
+            '{"a" 1}', '{"a":}', '[1, 2', '{"a": tru}', '[1] [2]', '{1: 2}', '"open',
+            '[1}', 'nope', '[1 2]', '{"a": 1,}', '', '["\\x"]',
+        ]
+        for text in invalid:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.sanitize(text, chunk_size=2)
+
+    def test_sanitize_json_file(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        src, dst = os.path.join(tmpdir, "in.json"), os.path.join(tmpdir, "out.json")
+        with open(src, "w", encoding="utf-8") as f:
+            json.dump(DOCUMENT, f, ensure_ascii=False)
+        count = sanitize_json_file(src, dst, self.processor, chunk_size=64)
+        with open(dst, encoding="utf-8") as f:
+            result = json.load(f)
+        self.assertEqual(result, self.processor.process_recursive(DOCUMENT, PiiAction.REDACT))
+        self.assertEqual(count, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+# src/l8e_beam/tests/test_log_handler.py
+
+import logging
+import threading
+import unittest
+
+import spacy
+
+from l8e_beam.log_handler import FAILED_MESSAGE, OverflowPolicy, SanitizingQueueListener
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+
+class ListHandler(logging.Handler):
+    """Collects the formatted records it handles."""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+        self.lines = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.lines.append(self.format(record))
+
+
+def make_processor():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+    ])
+    return PiiProcessor(
+        regex_recognizers=[EmailRecognizer()],
+        spacy_recognizers=[PersonRecognizer()],
+        nlp=nlp
+    )
+
+
+class TestSanitizingQueueListener(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = make_processor()
+        self.target = ListHandler()
+        self.logger = logging.getLogger(f"l8e_beam.tests.{self.id()}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.logger.handlers.clear()
+
+    def listen(self, *handlers, **options):
+        listener = SanitizingQueueListener(self.processor, *(handlers or (self.target,)), **options)
+        self.logger.addHandler(listener.handler)
+        return listener
+
+    def test_messages_and_args_are_sanitized(self):
+        with self.listen():
+            self.logger.info("login by %s <%s>", "Jane Doe", "jane@example.com")
+        self.assertEqual(self.target.lines, ["login by [REDACTED PERSON] <[REDACTED EMAIL]>"])
+        self.assertIsNone(self.target.records[0].args)
+
+    def test_caller_does_not_run_the_model(self):
+        listener = self.listen()
+        self.logger.info("Jane Doe")
+        self.assertEqual(self.processor.stats.texts, 0)
+        listener.start()
+        listener.stop()
+        self.assertEqual(self.target.lines, ["[REDACTED PERSON]"])
+
+    def test_records_are_batched_in_order(self):
+        listener = self.listen(max_batch_size=32)
+        for i in range(100):
+            self.logger.info("record %d from jane@example.com", i)
+        listener.start()
+        listener.stop()
+        self.assertEqual(self.target.lines, [f"record {i} from [REDACTED EMAIL]" for i in range(100)])
+        self.assertEqual(listener.batches, 4)
+        self.assertEqual(listener.handled, 100)
+
+    def test_tracebacks_are_sanitized(self):
+        with self.listen():
+            try:
+                raise ValueError("bad address jane@example.com")
+            except ValueError:
+                self.logger.exception("failed for Jane Doe")
+        line = self.target.lines[0]
+        self.assertIn("failed for [REDACTED PERSON]", line)
+        self.assertIn("ValueError: bad address [REDACTED EMAIL]", line)
+        self.assertNotIn("jane@example.com", line)
+
+    def test_handler_levels_are_respected(self):
+        errors = ListHandler(logging.ERROR)
+        with self.listen(self.target, errors):
+            self.logger.info("info")
+            self.logger.error("error")
+        self.assertEqual(self.target.lines, ["info", "error"])
+        self.assertEqual(errors.lines, ["error"])
+
+    def test_drop_policy(self):
+        listener = self.listen(max_queue_size=2, policy=OverflowPolicy.DROP)
+        for i in range(5):
+            self.logger.info("record %d", i)
+        self.assertEqual(listener.dropped, 3)
+        listener.start()
+        listener.stop()
+        self.assertEqual(self.target.lines, ["record 0", "record 1"])
+
+    def test_block_policy_with_timeout(self):
+        listener = self.listen(max_queue_size=1, block_timeout=0.01)
+        self.logger.info("kept")
+        self.logger.info("dropped after waiting")
+        self.assertEqual(listener.dropped, 1)
+        listener.start()
+        listener.stop()
+        self.assertEqual(self.target.lines, ["kept"])
+
+    def test_failures_never_forward_the_original_text(self):
+        listener = self.listen()
+        self.processor.process_batch = None
+        with listener:
+            self.logger.info("Jane Doe")
+        self.assertEqual(self.target.lines, [FAILED_MESSAGE])
+        self.assertEqual(listener.errors, 1)
+
+    def test_records_after_stop_are_handled_in_the_caller(self):
+        listener = self.listen(max_queue_size=1)
+        listener.start()
+        listener.stop()
+        # Would block forever on the full queue if records were still enqueued
+        for _ in range(3):
+            self.logger.info("bye from Jane Doe")
+        self.assertEqual(self.target.lines, ["bye from [REDACTED PERSON]"] * 3)
+        self.assertEqual(listener.handled, 3)
+        self.assertEqual(listener.queue.qsize(), 0)
+
+    def test_records_racing_stop_are_not_lost(self):
+        listener = self.listen(max_queue_size=1)
+        entered, release = threading.Event(), threading.Event()
+        put = listener.queue.put
+
+        def slow_put(item, *args, **kwargs):
+            if getattr(item, "msg", None) == "racing Jane Doe":
+                # Passed the `_stopped` check, but not yet on the queue
+                entered.set()
+                release.wait(5)
+            put(item, *args, **kwargs)
+
+        listener.queue.put = slow_put
+        listener.start()
+        caller = threading.Thread(target=self.logger.info, args=("racing Jane Doe",))
+        caller.start()
+        entered.wait(5)
+        stopper = threading.Thread(target=listener.stop)
+        stopper.start()
+        stopper.join(0.05)
+        release.set()
+        stopper.join(5)
+        caller.join(5)
+        self.assertFalse(stopper.is_alive())
+        self.assertEqual(self.target.lines, ["racing [REDACTED PERSON]"])
+        self.assertEqual(listener.queue.qsize(), 0)
+
+    def test_start_twice(self):
+        with self.listen() as listener:
+            with self.assertRaises(RuntimeError):
+                listener.start()
+
+
+if __name__ == '__main__':
+    unittest.main()
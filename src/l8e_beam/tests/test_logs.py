@@ -0,0 +1,150 @@
+# src/l8e_beam/tests/test_logs.py
+
+import os
+import tempfile
+import unittest
+
+import spacy
+
+from l8e_beam.enums import PiiAction
+from l8e_beam.logs import LogSanitizer, sanitize_log_file
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.recognizers.phone import PhoneRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+
+class CountingNlp:
+    """Wraps a pipeline and records the texts it is run on."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.texts = []
+
+    def __call__(self, text):
+        self.texts.append(text)
+        return self.nlp(text)
+
+    def pipe(self, texts, **kwargs):
+        texts = list(texts)
+        self.texts.extend(texts)
+        return self.nlp.pipe(texts, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.nlp, name)
+
+
+def make_processor():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]},
+        {"label": "PERSON", "pattern": [{"LOWER": "john"}]},
+    ])
+    return PiiProcessor(
+        regex_recognizers=[EmailRecognizer(), PhoneRecognizer()],
+        spacy_recognizers=[PersonRecognizer()],
+        nlp=CountingNlp(nlp)
+    )
+
+
+class TestLogSanitizer(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = make_processor()
+        self.sanitizer = LogSanitizer(self.processor)
+
+    def test_same_output_as_processor(self):
+        lines = [
+            "User Jane Doe logged in from 10.0.0.7\n",
+            "User bob logged in from 10.0.0.8\n",
+            "User john logged in from 10.0.0.9\n",
+            "mail sent to jane@example.com status=200\n",
+            "mail sent to bob@example.org status=500\n",
+            "\n",
+            "callback 555 123 4567 queued\n",
+            "callback 555 987 6543 queued\n",
+        ]
+        expected = [self.processor.process(line) for line in lines]
+        self.assertEqual(list(self.sanitizer.sanitize_lines(lines, batch_size=3)), expected)
+        self.assertEqual(self.sanitizer.lines, 7)
+
+    def test_ner_runs_only_on_variable_slots(self):
+        nlp = self.processor.nlp
+        self.sanitizer.sanitize_batch(["job 1 finished for Jane Doe", "job 2 finished for Bob Smith"])
+        self.assertEqual(self.sanitizer.templates(), ["job <*> finished for <*> <*>"])
+        nlp.texts.clear()
+
+        out = self.sanitizer.sanitize_batch(["job 3 finished for Jane Doe", "job 4 finished for Al Bo"])
+        self.assertEqual(out, ["job 3 finished for [REDACTED PERSON]", "job 4 finished for Al Bo"])
+        # Numeric slots are skipped by the NER prefilter, and constants never reach NER
+        self.assertEqual(nlp.texts, ["Jane Doe", "Al Bo"])
+
+        nlp.texts.clear()
+        self.sanitizer.sanitize("job 5 finished for Jane Doe")
+        self.assertEqual(nlp.texts, [])
+        self.assertEqual(self.sanitizer.memo_hits, 1)
+
+    def test_pii_in_first_line_becomes_a_slot(self):
+        self.sanitizer.sanitize("owner john approved")
+        self.assertEqual(self.sanitizer.templates(), ["owner <*> approved"])
+        self.assertEqual(self.sanitizer.sanitize("owner john approved"), "owner [REDACTED PERSON] approved")
+
+    def test_new_template_is_scanned_in_full_once_per_batch(self):
+        out = self.sanitizer.sanitize_batch(["ping from ann", "ping from john", "ping from Jane Doe"])
+        self.assertEqual(out, ["ping from ann", "ping from [REDACTED PERSON]", "ping from [REDACTED PERSON]"])
+        # "ping from Jane Doe" has a template of its own
+        self.assertEqual(self.sanitizer.full_scans, 2)
+
+    def test_templates_are_bounded(self):
+        sanitizer = LogSanitizer(self.processor, max_templates=3, max_children=2)
+        for i in range(20):
+            sanitizer.sanitize(f"event{i} happened " + "x " * i)
+        self.assertEqual(len(sanitizer), 3)
+        self.assertEqual(sanitizer.evictions, 17)
+        # Evicted templates leave no empty branches behind
+        self.assertEqual(len(sanitizer._root.children), 3)
+
+    def test_routing_caps_children(self):
+        sanitizer = LogSanitizer(self.processor, max_children=2, similarity=0.9)
+        for word in ("alpha", "beta", "gamma", "delta"):
+            sanitizer.sanitize(f"{word} started")
+        self.assertEqual(set(sanitizer._root.children[2].children), {"alpha", "<*>"})
+        self.assertEqual(len(sanitizer), 4)
+
+    def test_anonymized_values_are_consistent(self):
+        sanitizer = LogSanitizer(self.processor, action=PiiAction.ANONYMIZE)
+        first, second = sanitizer.sanitize_batch(["login jane@example.com ok", "login jane@example.com ok"])
+        self.assertEqual(first, second)
+        self.assertNotIn("jane@example.com", first)
+
+    def test_surrogates_are_bounded(self):
+        sanitizer = LogSanitizer(self.processor, action=PiiAction.ANONYMIZE, memo_size=100)
+        lines = [f"login user{i}@example.com ok" for i in range(2000)]
+        sanitizer.sanitize_batch(lines)
+        self.assertEqual(len(sanitizer._surrogates), 100)
+
+    def test_caller_supplied_vault(self):
+        from l8e_beam.vault import TokenVault
+        vault = TokenVault()
+        sanitizer = LogSanitizer(self.processor, action=PiiAction.TOKENIZE, surrogates=vault)
+        line = sanitizer.sanitize("login jane@example.com ok")
+        self.assertEqual(vault.restore(line), "login jane@example.com ok")
+
+    def test_sanitize_log_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "app.log")
+            target = os.path.join(tmpdir, "app.clean.log")
+            with open(source, "w", newline="") as f:
+                f.write("user left: john\r\nuser left: ann\r\nno newline at end")
+            sanitizer = sanitize_log_file(source, target, self.processor)
+            with open(target, newline="") as f:
+                self.assertEqual(f.read(), "user left: [REDACTED PERSON]\r\nuser left: ann\r\nno newline at end")
+        self.assertEqual(len(sanitizer), 2)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            LogSanitizer(self.processor, max_templates=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
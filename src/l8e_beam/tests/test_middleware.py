@@ -0,0 +1,305 @@
+# src/l8e_beam/tests/test_middleware.py
+
+import asyncio
+import io
+import json
+import threading
+import time
+import unittest
+from wsgiref.util import setup_testing_defaults
+
+import spacy
+
+from l8e_beam.middleware import RouteRule, SanitizingASGIMiddleware, SanitizingWSGIMiddleware
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+PAYLOAD = {"user": "Jane Doe", "email": "jane@example.com", "id": "42"}
+
+
+def make_processor():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+    ])
+    return PiiProcessor(
+        regex_recognizers=[EmailRecognizer()],
+        spacy_recognizers=[PersonRecognizer()],
+        nlp=nlp
+    )
+
+
+async def echo_app(scope, receive, send):
+    """Responds with the request body it received, and its content type."""
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            break
+    content_type = dict(scope["headers"]).get(b"content-type", b"text/plain")
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+    })
+    # Sent in two parts, like a streaming framework would
+    await send({"type": "http.response.body", "body": body[:5], "more_body": True})
+    await send({"type": "http.response.body", "body": body[5:]})
+
+
+async def call_asgi(app, path, body, content_type=b"application/json", chunk=None, method="POST"):
+    """Sends one request through an ASGI app; returns the received request body and the response."""
+    chunk = chunk or max(len(body), 1)
+    parts = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+    messages = [
+        {"type": "http.request", "body": part, "more_body": i < len(parts) - 1}
+        for i, part in enumerate(parts)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [(b"content-type", content_type)]}
+    await app(scope, receive, send)
+    headers = dict(sent[0]["headers"])
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return headers, body
+
+
+def echo_wsgi(environ, start_response):
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(length)
+    start_response("200 OK", [
+        ("Content-Type", environ.get("CONTENT_TYPE", "text/plain")),
+        ("Content-Length", str(len(body))),
+    ])
+    return [body[:5], body[5:]]
+
+
+def call_wsgi(app, path, body, content_type="application/json", method="POST"):
+    environ = {}
+    setup_testing_defaults(environ)
+    environ.update(
+        PATH_INFO=path, REQUEST_METHOD=method, CONTENT_TYPE=content_type,
+        CONTENT_LENGTH=str(len(body)), **{"wsgi.input": io.BytesIO(body)}
+    )
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started.update(status=status, headers=dict(headers))
+
+    result = app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        getattr(result, "close", lambda: None)()
+    return started["headers"], body
+
+
+class TestASGIMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = make_processor()
+
+    def call(self, app, path="/", body=json.dumps(PAYLOAD).encode(), **kwargs):
+        return asyncio.run(call_asgi(app, path, body, **kwargs))
+
+    def test_request_and_response_are_sanitized(self):
+        app = SanitizingASGIMiddleware(echo_app, self.processor)
+        headers, body = self.call(app, chunk=7)
+        self.assertEqual(json.loads(body), {"user": "[REDACTED PERSON]", "email": "[REDACTED EMAIL]", "id": "42"})
+        self.assertEqual(int(headers[b"content-length"]), len(body))
+        # The request body and the (already clean) response body
+        self.assertEqual(app.sanitized, 2)
+
+    def test_route_rules(self):
+        routes = [
+            RouteRule("/health", request=False, response=False),
+            RouteRule("/users/*", include=["email"]),
+        ]
+        app = SanitizingASGIMiddleware(echo_app, self.processor, routes=routes)
+        _, body = self.call(app, "/health")
+        self.assertEqual(json.loads(body), PAYLOAD)
+        _, body = self.call(app, "/users/7")
+        self.assertEqual(json.loads(body), dict(PAYLOAD, email="[REDACTED EMAIL]"))
+
+    def test_non_json_invalid_and_oversized_bodies_pass_through(self):
+        app = SanitizingASGIMiddleware(echo_app, self.processor, max_body_bytes=64)
+        _, body = self.call(app, body=b"Jane Doe", content_type=b"text/plain")
+        self.assertEqual(body, b"Jane Doe")
+        _, body = self.call(app, body=b"{Jane Doe")
+        self.assertEqual(body, b"{Jane Doe")
+        large = json.dumps({"user": "Jane Doe", "pad": "x" * 100}).encode()
+        headers, body = self.call(app, body=large, chunk=16)
+        self.assertEqual(body, large)
+        self.assertEqual(int(headers[b"content-length"]), len(large))
+        self.assertEqual(app.sanitized, 0)
+
+    def test_head_and_bodiless_responses_pass_through(self):
+        def make_app(status):
+            async def app(scope, receive, send):
+                # The length of the body a GET would have returned
+                headers = [(b"content-type", b"application/json"), (b"content-length", b"50")]
+                await send({"type": "http.response.start", "status": status, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+            return app
+
+        for status, method in [(200, "HEAD"), (204, "GET"), (304, "GET")]:
+            with self.subTest(status=status, method=method):
+                app = SanitizingASGIMiddleware(make_app(status), self.processor)
+                headers, body = self.call(app, body=b"", method=method)
+                self.assertEqual(headers[b"content-length"], b"50")
+                self.assertEqual(body, b"")
+
+        app = SanitizingASGIMiddleware(echo_app, self.processor)
+        _, body = self.call(app, method="HEAD")
+        self.assertEqual(json.loads(body), PAYLOAD)
+        self.assertEqual(app.sanitized, 0)
+
+    def test_concurrency_is_limited_and_the_loop_stays_responsive(self):
+        running, peak = 0, 0
+        lock = threading.Lock()
+        process = self.processor.process_recursive_batch
+
+        def slow(*args, **kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return process(*args, **kwargs)
+
+        self.processor.process_recursive_batch = slow
+        app = SanitizingASGIMiddleware(echo_app, self.processor, max_concurrency=2, routes=[
+            RouteRule("*", response=False)
+        ])
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            task = asyncio.ensure_future(ticker())
+            body = json.dumps(PAYLOAD).encode()
+            await asyncio.gather(*(call_asgi(app, "/", body) for _ in range(6)))
+            task.cancel()
+            return ticks
+
+        ticks = asyncio.run(main())
+        self.assertEqual(peak, 2)
+        # Three rounds of 50 ms; a blocked loop would not tick in between
+        self.assertGreater(ticks, 10)
+
+    def test_added_latency_per_request(self):
+        app = SanitizingASGIMiddleware(echo_app, self.processor)
+        body = json.dumps(PAYLOAD).encode()
+
+        async def measure(target, requests=200):
+            started = time.perf_counter()
+            for _ in range(requests):
+                await call_asgi(target, "/", body)
+            return (time.perf_counter() - started) / requests
+
+        async def main():
+            await measure(app, 10)  # warm up the pool and the model
+            return await measure(echo_app), await measure(app)
+
+        bare, wrapped = asyncio.run(main())
+        added = wrapped - bare
+        # Two small bodies through the blank pipeline; generous for CI machines
+        self.assertLess(added, 0.02, f"added latency {added * 1000:.2f} ms per request")
+
+
+class TestWSGIMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = make_processor()
+
+    def test_request_and_response_are_sanitized(self):
+        app = SanitizingWSGIMiddleware(echo_wsgi, self.processor)
+        headers, body = call_wsgi(app, "/", json.dumps(PAYLOAD).encode())
+        self.assertEqual(json.loads(body), {"user": "[REDACTED PERSON]", "email": "[REDACTED EMAIL]", "id": "42"})
+        self.assertEqual(int(headers["Content-Length"]), len(body))
+
+    def test_response_only_route(self):
+        calls = []
+
+        def app(environ, start_response):
+            calls.append(environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"])))
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return [json.dumps({"owner": "Jane Doe"}).encode()]
+
+        wrapped = SanitizingWSGIMiddleware(app, self.processor, routes=[RouteRule("/*", request=False)])
+        _, body = call_wsgi(wrapped, "/report", b'{"q": "Jane Doe"}')
+        self.assertEqual(calls, [b'{"q": "Jane Doe"}'])
+        self.assertEqual(json.loads(body), {"owner": "[REDACTED PERSON]"})
+
+    def test_generator_apps(self):
+        def app(environ, start_response):
+            body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"]))
+            start_response("200 OK", [("Content-Type", environ["CONTENT_TYPE"])])
+            yield body[:5]
+            yield body[5:]
+
+        wrapped = SanitizingWSGIMiddleware(app, self.processor)
+        _, body = call_wsgi(wrapped, "/", json.dumps(PAYLOAD).encode())
+        self.assertEqual(json.loads(body), {"user": "[REDACTED PERSON]", "email": "[REDACTED EMAIL]", "id": "42"})
+        _, body = call_wsgi(wrapped, "/", b"Jane Doe", content_type="text/plain")
+        self.assertEqual(body, b"Jane Doe")
+
+    def test_head_and_bodiless_responses_pass_through(self):
+        def make_app(status):
+            def app(environ, start_response):
+                # The length of the body a GET would have returned
+                start_response(status, [("Content-Type", "application/json"), ("Content-Length", "50")])
+                return []
+            return app
+
+        for status, method in [("200 OK", "HEAD"), ("204 No Content", "GET"), ("304 Not Modified", "GET")]:
+            with self.subTest(status=status, method=method):
+                wrapped = SanitizingWSGIMiddleware(make_app(status), self.processor)
+                headers, body = call_wsgi(wrapped, "/", b"", method=method)
+                self.assertEqual(headers["Content-Length"], "50")
+                self.assertEqual(body, b"")
+
+        wrapped = SanitizingWSGIMiddleware(echo_wsgi, self.processor)
+        _, body = call_wsgi(wrapped, "/", json.dumps(PAYLOAD).encode(), method="HEAD")
+        self.assertEqual(json.loads(body), PAYLOAD)
+        self.assertEqual(wrapped.sanitized, 0)
+
+    def test_non_json_and_oversized_bodies_pass_through(self):
+        closed = []
+
+        class Result(list):
+            def close(self):
+                closed.append(True)
+
+        def app(environ, start_response):
+            start_response("200 OK", [("Content-Type", "application/json")])
+            return Result([b'{"user": ', b'"Jane Doe", ', b'"pad": "' + b"x" * 100 + b'"}'])
+
+        wrapped = SanitizingWSGIMiddleware(app, self.processor, max_body_bytes=32)
+        _, body = call_wsgi(wrapped, "/", b"")
+        self.assertIn(b"Jane Doe", body)
+        self.assertEqual(closed, [True])
+        self.assertEqual(wrapped.passed_through, 1)
+
+        wrapped = SanitizingWSGIMiddleware(echo_wsgi, self.processor)
+        _, body = call_wsgi(wrapped, "/", b"Jane Doe", content_type="text/plain")
+        self.assertEqual(body, b"Jane Doe")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# src/l8e_beam/tests/test_numeric.py
+
+import random
+import re
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam import numeric
+from l8e_beam.numeric import NumericScanner, luhn_valid, luhn_valid_batch
+from l8e_beam.recognizers.base import RegexRecognizer
+from l8e_beam.recognizers.credit_card import CreditCardRecognizer
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.phone import PhoneRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+
+
+class ZipRecognizer(RegexRecognizer):
+    """A numeric recognizer with a plain `validate`."""
+    name = "ZIP"
+    regex = re.compile(r"\b\d{5}-\d{4}\b")
+    numeric_min_length = 10
+
+    def validate(self, text: str) -> bool:
+        return not text.startswith("0")
+
+
+class AnalyzingRecognizer(PhoneRecognizer):
+    """Overrides `analyze`, so it must not be routed through the scanner."""
+    name = "CUSTOM_PHONE"
+
+    def analyze(self, text, findings):
+        super().analyze(text, findings)
+
+
+def _number_dense_text(rng: random.Random, lines: int) -> str:
+    parts = [
+        lambda: str(rng.randrange(10 ** rng.randint(1, 20))),
+        lambda: "4111 1111 1111 1111",
+        lambda: rng.choice(["4111111111111111", "4111111111111112", "5555555555554444", "378282246310005"]),
+        lambda: "+1 (555) 123-%04d" % rng.randrange(10000),
+        lambda: "%03d.%03d.%04d" % (rng.randrange(1000), rng.randrange(1000), rng.randrange(10000)),
+        lambda: "%05d-%04d" % (rng.randrange(100000), rng.randrange(10000)),
+        lambda: "%.4f" % rng.random(),
+        lambda: "2024-01-%02d 10:%02d" % (rng.randint(1, 28), rng.randrange(60)),
+        lambda: rng.choice(["id", "x", "_", "é", "٣٣٣٣٣٣٣٣٣٣", "(", "+", "-", "jane@example.com"]),
+    ]
+    separators = [" ", "", "=", ",", "\n", "a", "-", "(", ")"]
+    return "".join(
+        "".join(rng.choice(parts)() + rng.choice(separators) for _ in range(12)) + "\n"
+        for _ in range(lines)
+    )
+
+
+def _describe(findings):
+    return [(f.text, f.pii_type, f.start, f.end, f.score, f.recognizer) for f in findings]
+
+
+class TestNumericScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.recognizers = [
+            EmailRecognizer(), CreditCardRecognizer(), ZipRecognizer(),
+            AnalyzingRecognizer(), PhoneRecognizer()
+        ]
+        self.processor = PiiProcessor(
+            regex_recognizers=self.recognizers, spacy_recognizers=[], nlp=spacy.blank("en")
+        )
+
+    def analyze(self, text):
+        findings = []
+        for recognizer in self.recognizers:
+            recognizer.analyze(text, findings)
+        return findings
+
+    def test_routes_only_numeric_recognizers(self):
+        scanner = self.processor._numeric_scanner()
+        self.assertEqual(
+            [type(r) for r in scanner.recognizers],
+            [CreditCardRecognizer, ZipRecognizer, PhoneRecognizer]
+        )
+
+    def test_same_findings_as_analyze(self):
+        rng = random.Random(7)
+        texts = [_number_dense_text(rng, rng.randint(0, 6)) for _ in range(300)]
+        texts += ["", "no digits here", "4111111111111111", "call 555-123-4567", "x4111111111111111"]
+        # Batches large enough for the NumPy path
+        batch = self.processor.get_findings_batch(texts)
+        for text, findings in zip(texts, batch):
+            expected = _describe(self.analyze(text))
+            self.assertEqual(_describe(findings), expected)
+            self.assertEqual(_describe(self.processor.get_findings(text)), expected)
+
+    def test_phone_pattern_is_unchanged(self):
+        legacy = re.compile(r"(\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+        rng = random.Random(11)
+        for _ in range(200):
+            text = _number_dense_text(rng, 3)
+            self.assertEqual(
+                [m.span() for m in PhoneRecognizer.regex.finditer(text)],
+                [m.span() for m in legacy.finditer(text)]
+            )
+
+    def test_texts_without_numeric_runs_are_skipped(self):
+        scanner = NumericScanner([PhoneRecognizer()])
+        results = scanner.scan(["no numbers", "order 12, 13.5 and 2024-01-01", "tel 555 123 4567"])
+        self.assertEqual(list(results[0]), [2])
+        self.assertEqual(results[0][2][0].text, "555 123 4567")
+
+    def test_subset_of_recognizers_is_rescanned(self):
+        self.processor.get_findings("4111111111111111")
+        self.processor.regex_recognizers = [PhoneRecognizer()]
+        findings = self.processor.get_findings("4111111111111111")
+        self.assertEqual([f.pii_type for f in findings], ["PHONE"])
+
+
+class TestLuhn(unittest.TestCase):
+
+    def test_batch_matches_scalar(self):
+        rng = random.Random(3)
+        numbers = [str(rng.randrange(10 ** 12, 10 ** 17)) for _ in range(500)]
+        numbers += ["4111111111111111", "4111 1111 1111 1111", "411111111111", "", "٤١١١١١١١١١١١١١١١"]
+        expected = [luhn_valid(n) for n in numbers]
+        self.assertEqual(luhn_valid_batch(numbers), expected)
+        self.assertIn(True, expected)
+        with patch.object(numeric, "np", None):
+            self.assertEqual(luhn_valid_batch(numbers), expected)
+
+    def test_credit_card_validation(self):
+        recognizer = CreditCardRecognizer()
+        self.assertTrue(recognizer.validate("4111111111111111"))
+        self.assertFalse(recognizer.validate("4111111111111112"))
+        self.assertEqual(recognizer.validate_batch(["4111111111111111"] * 40), [True] * 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 # src/l8e_beam/tests/test_redaction.py
 
+import asyncio
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
+import spacy
 # Import the actual cache dictionary to clear it
-from l8e_beam.redactor import PiiDecoratorBackend, _get_model, _LOADED_MODELS
+from l8e_beam.redactor import PiiDecoratorBackend, ModelRegistry, _get_model, MODEL_REGISTRY
 from l8e_beam.decorator import redact_pii
 from l8e_beam.enums import PiiAction, ModelType
 
@@ -11,9 +15,8 @@ class TestPiiDecoratorBackend(unittest.TestCase):
     """Tests the backend logic for model/processor caching."""
 
     def setUp(self):
-        # FIX: Clear the actual cache dictionary (_LOADED_MODELS)
-        _LOADED_MODELS.clear()
-        PiiDecoratorBackend._PROCESSORS.clear()
+        # FIX: Clear the actual model and processor cache (MODEL_REGISTRY)
+        MODEL_REGISTRY.clear()
 
     @patch('l8e_beam.redactor.spacy.load')
     @patch('l8e_beam.redactor.resources.path')
@@ -35,6 +38,82 @@ class TestPiiDecoratorBackend(unittest.TestCase):
         backend._get_processor() # Second call should use the cache
         MockPiiProcessor.assert_called_once()
 
+class TestModelRegistry(unittest.TestCase):
+    """Tests memory-budget and idle eviction of models and processors."""
+
+    def test_registered_models_and_memory_report(self):
+        registry = ModelRegistry()
+        registry.register("en_custom", lambda: "custom_model", size_bytes=100)
+        self.assertEqual(registry.get("en_custom"), "custom_model")
+        self.assertEqual(registry.resident_memory(), {"en_custom": 100})
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        registry = ModelRegistry(memory_budget_bytes=250)
+        for name in ("a", "b", "c"):
+            registry.register(name, lambda name=name: f"model_{name}", size_bytes=100)
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")  # "b" is now the least recently used model
+        registry.get("c")
+        self.assertIn("a", registry)
+        self.assertNotIn("b", registry)
+        self.assertEqual(registry.resident_bytes(), 200)
+
+    def test_evicting_a_model_drops_its_processors(self):
+        registry = ModelRegistry(memory_budget_bytes=100)
+        registry.register("a", lambda: "model_a", size_bytes=100)
+        registry.register("b", lambda: "model_b", size_bytes=100)
+        registry.get("a")
+        factory = Mock(return_value="processor_a")
+        registry.get_processor("key", ("a",), factory)
+        registry.get("b")
+        registry.get_processor("key", ("a",), factory)
+        self.assertEqual(factory.call_count, 2)
+
+    def test_replace_swaps_resident_model(self):
+        registry = ModelRegistry()
+        registry.register("a", lambda: ["model_a"], size_bytes=1)
+        old = registry.get("a")
+        registry.replace(old, "recycled_a")
+        self.assertEqual(registry.get("a"), "recycled_a")
+
+    def test_loading_does_not_block_other_models(self):
+        registry = ModelRegistry()
+        release = threading.Event()
+        loads = []
+
+        def slow():
+            loads.append("slow")
+            release.wait(5)
+            return "model_slow"
+
+        registry.register("slow", slow, size_bytes=1)
+        registry.register("fast", lambda: "model_fast", size_bytes=1)
+        threads = [threading.Thread(target=registry.get, args=("slow",)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while not loads:
+            time.sleep(0.001)
+        # Another model loads, and is served, while "slow" is loading
+        self.assertEqual(registry.get("fast"), "model_fast")
+        self.assertEqual(registry.get_processor("key", ("fast",), lambda: "processor"), "processor")
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(registry.get("slow"), "model_slow")
+        self.assertEqual(loads, ["slow"])
+
+    @patch('l8e_beam.redactor.time.monotonic')
+    def test_idle_timeout(self, mock_monotonic):
+        registry = ModelRegistry(idle_timeout=60)
+        registry.register("a", lambda: "model_a", size_bytes=1)
+        mock_monotonic.return_value = 1000.0
+        registry.get("a")
+        mock_monotonic.return_value = 1061.0
+        registry.evict_idle()
+        self.assertNotIn("a", registry)
+
+
 class TestRedactPiiDecorator(unittest.TestCase):
     """Tests the decorator's logic of handling args, kwargs, and return values."""
 
@@ -53,4 +132,66 @@ class TestRedactPiiDecorator(unittest.TestCase):
         get_user_data(123)
 
         # Verify that the backend was created with the ANONYMIZE action
-        MockBackend.assert_called_with(model=ModelType.SM, action=PiiAction.ANONYMIZE)
\ No newline at end of file
+        MockBackend.assert_called_with(model=ModelType.SM, action=PiiAction.ANONYMIZE, escalate_to=None)
+
+
+def _make_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+    ])
+    return nlp
+
+
+class TestRedactPiiGenerators(unittest.TestCase):
+    """Tests lazy sanitization of generator return values."""
+
+    def setUp(self):
+        MODEL_REGISTRY.clear()
+        patcher = patch('l8e_beam.redactor._get_model', return_value=_make_nlp())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(MODEL_REGISTRY.clear)
+
+    def test_generator_items_are_sanitized_lazily(self):
+        consumed = []
+
+        @redact_pii()
+        def stream():
+            for item in ["Hello Jane Doe", {"mail": "jane@example.com"}, "bye"]:
+                consumed.append(item)
+                yield item
+
+        gen = stream()
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(gen), "Hello [REDACTED PERSON]")
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(list(gen), [{"mail": "[REDACTED EMAIL]"}, "bye"])
+
+    def test_generator_micro_batching_uses_pipe(self):
+        @redact_pii(stream_batch_size=3)
+        def stream():
+            yield from ["Jane Doe 1", "Jane Doe 2", "Jane Doe 3", 4, "Jane Doe 5"]
+
+        processor = PiiDecoratorBackend(model=ModelType.SM, action=PiiAction.REDACT).processor
+        with patch.object(processor.nlp, 'pipe', wraps=processor.nlp.pipe) as mock_pipe:
+            result = list(stream())
+        self.assertEqual(result, [
+            "[REDACTED PERSON] 1", "[REDACTED PERSON] 2", "[REDACTED PERSON] 3",
+            4, "[REDACTED PERSON] 5"
+        ])
+        mock_pipe.assert_called_once()
+
+    def test_async_generator(self):
+        @redact_pii(stream_batch_size=2)
+        async def stream():
+            for item in ["Jane Doe", "call 555-867-5309", "done"]:
+                yield item
+
+        async def collect():
+            return [item async for item in stream()]
+
+        self.assertEqual(
+            asyncio.run(collect()),
+            ["[REDACTED PERSON]", "call [REDACTED PHONE]", "done"]
+        )
@@ -0,0 +1,117 @@
+# src/l8e_beam/tests/test_server.py
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.api import sanitize_pii
+from l8e_beam.client import JSON, SidecarClient, SidecarError
+from l8e_beam.cli import build_parser
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.enums import DEFAULT_RECOGNIZERS
+from l8e_beam.recognizers.pii_processor import PathFilter
+from l8e_beam.server import SidecarServer
+
+
+def _make_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+    ])
+    return nlp
+
+
+class TestSidecar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, "beam.sock")
+        patcher = patch("l8e_beam.api._get_model", return_value=_make_nlp())
+        self.get_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = SidecarServer(self.socket_path, max_wait_ms=20).start()
+        self.client = SidecarClient(self.socket_path, codec=JSON)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        shutil.rmtree(self.tmpdir)
+
+    def test_sanitize_round_trip(self):
+        data = {"user": "Jane Doe", "contact": ["jane@example.com", 42]}
+        self.assertTrue(self.client.ping())
+        self.assertEqual(
+            self.client.sanitize(data),
+            {"user": "[REDACTED PERSON]", "contact": ["[REDACTED EMAIL]", 42]}
+        )
+
+    def test_policy_is_applied(self):
+        result = self.client.sanitize(
+            "Jane Doe, jane@example.com",
+            action=PiiAction.REDACT,
+            disabled_recognizers=[DEFAULT_RECOGNIZERS.EMAIL]
+        )
+        self.assertEqual(result, "[REDACTED PERSON], jane@example.com")
+
+    def test_paths_are_sent(self):
+        data = {"user": "Jane Doe", "note": "Jane Doe"}
+        result = sanitize_pii(data, client=self.client, paths=PathFilter(exclude=["user"]))
+        self.assertEqual(result, {"user": "Jane Doe", "note": "[REDACTED PERSON]"})
+
+    def test_one_processor_per_policy_shared_by_clients(self):
+        other = SidecarClient(self.socket_path, codec=JSON)
+        self.addCleanup(other.close)
+        results = []
+
+        def call(client):
+            results.append(client.sanitize("Ask Jane Doe."))
+
+        threads = [threading.Thread(target=call, args=(c,)) for c in [self.client, other] * 5]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["Ask [REDACTED PERSON]."] * 10)
+        policies = self.client.stats()["policies"]
+        self.assertEqual(len(policies), 1)
+        self.assertLessEqual(policies[0]["texts"], 10)
+        self.assertEqual(self.get_model.call_count, 1)
+
+    def test_errors_are_reported(self):
+        with self.assertRaises(SidecarError):
+            self.client.request({"op": "unknown"})
+        # The connection stays usable after an error.
+        self.assertTrue(self.client.ping())
+
+    def test_sanitize_pii_with_client(self):
+        self.assertEqual(sanitize_pii("Jane Doe", client=self.client), "[REDACTED PERSON]")
+        with self.assertRaises(ValueError):
+            sanitize_pii("Jane Doe", client=self.client, recycler=object())
+
+    def test_refuses_to_replace_a_live_socket(self):
+        with self.assertRaises(RuntimeError):
+            SidecarServer(self.socket_path).start()
+
+    def test_socket_permissions(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+
+class TestCli(unittest.TestCase):
+
+    def test_serve_arguments(self):
+        args = build_parser().parse_args(
+            ["serve", "--socket", "/tmp/x.sock", "--max-wait-ms", "2", "--preload", "en_core_web_sm-3.7.1"]
+        )
+        self.assertEqual(args.socket, "/tmp/x.sock")
+        self.assertEqual(args.max_wait_ms, 2.0)
+        self.assertEqual(args.preload, ["en_core_web_sm-3.7.1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
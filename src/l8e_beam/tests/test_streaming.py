@@ -0,0 +1,110 @@
+# src/l8e_beam/tests/test_streaming.py
+
+import asyncio
+import unittest
+import spacy
+
+from l8e_beam.recognizers.base import DictionaryRecognizer
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.phone import PhoneRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.streaming import StreamSanitizer, sanitize_stream, asanitize_stream
+
+class CodenameRecognizer(DictionaryRecognizer):
+    name = "CODENAME"
+    terms = ["Project Bluebird"]
+
+
+TEXT = (
+    "Hi there. Please call 555-867-5309 or write to jane.doe@example.com today! "
+    "Jane Doe will answer. Thanks a lot for waiting, really.\n"
+    "Regards, the support team"
+)
+
+
+def chunked(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamSanitizer(unittest.TestCase):
+
+    def setUp(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]}
+        ])
+        self.ner_processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer(), PhoneRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=nlp
+        )
+        self.regex_processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer(), PhoneRecognizer()],
+            spacy_recognizers=[],
+            nlp=nlp
+        )
+
+    def test_regex_only_stream_matches_batch_result(self):
+        expected = self.regex_processor.process(TEXT)
+        output = list(sanitize_stream(chunked(TEXT), self.regex_processor, max_match_length=40))
+        self.assertEqual("".join(output), expected)
+        # Safe prefixes are released before the stream ends.
+        self.assertGreater(len(output), 1)
+
+    def test_ner_stream_matches_batch_result(self):
+        expected = self.ner_processor.process(TEXT)
+        self.assertIn("[REDACTED PERSON]", expected)
+        output = list(sanitize_stream(chunked(TEXT, 2), self.ner_processor))
+        self.assertEqual("".join(output), expected)
+        self.assertGreater(len(output), 1)
+
+    def test_holds_back_incomplete_sentences(self):
+        sanitizer = StreamSanitizer(self.ner_processor)
+        self.assertEqual(sanitizer.feed("Ask Jane"), "")
+        self.assertEqual(sanitizer.feed(" Doe. Then"), "Ask [REDACTED PERSON]. ")
+        self.assertEqual(sanitizer.flush(), "Then")
+
+    def test_buffer_is_bounded_without_sentence_boundaries(self):
+        sanitizer = StreamSanitizer(self.ner_processor, max_match_length=10, max_buffer_chars=50)
+        released = "".join(sanitizer.feed("word ") for _ in range(40))
+        self.assertTrue(released)
+        self.assertLessEqual(len(sanitizer._buffer), 55)
+
+    def test_buffer_is_bounded_without_whitespace(self):
+        for processor in (self.regex_processor, self.ner_processor):
+            sanitizer = StreamSanitizer(processor, max_match_length=10, max_buffer_chars=50)
+            released = "".join(sanitizer.feed("x" * 100) for _ in range(200))
+            self.assertEqual(len(released) + len(sanitizer._buffer), 20_000)
+            self.assertLessEqual(len(sanitizer._buffer), 150)
+            self.assertEqual(released + sanitizer.flush(), "x" * 20_000)
+
+        # A hard cut still never splits a regex match
+        sanitizer = StreamSanitizer(self.regex_processor, max_match_length=40)
+        text = "x" * 50 + "<jane@example.com>" + "x" * 50
+        output = "".join(sanitizer.feed(c) for c in chunked(text, 7)) + sanitizer.flush()
+        self.assertEqual(output, self.regex_processor.process(text))
+
+    def test_dictionary_terms_are_never_split(self):
+        processor = PiiProcessor(
+            regex_recognizers=[CodenameRecognizer()], spacy_recognizers=[], nlp=spacy.blank("en")
+        )
+        text = "a " * 100 + "Project Bluebird is secret " + "b " * 100
+        output = "".join(sanitize_stream(iter(text), processor))
+        self.assertEqual(output, processor.process(text))
+        self.assertNotIn("Bluebird", output)
+
+    def test_async_stream(self):
+        async def source():
+            for chunk in chunked(TEXT, 4):
+                yield chunk
+
+        async def collect():
+            return [c async for c in asanitize_stream(source(), self.ner_processor)]
+
+        output = asyncio.run(collect())
+        self.assertEqual("".join(output), self.ner_processor.process(TEXT))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# src/l8e_beam/tests/test_vault.py
+
+import time
+import unittest
+from unittest.mock import patch
+
+import spacy
+
+from l8e_beam.api import sanitize_pii
+from l8e_beam.enums import PiiAction
+from l8e_beam.recognizers.pii_processor import PiiProcessor
+from l8e_beam.recognizers.email import EmailRecognizer
+from l8e_beam.recognizers.person import PersonRecognizer
+from l8e_beam.vault import Fernet, TokenVault
+
+
+def _make_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": [{"LOWER": "jane"}, {"LOWER": "doe"}]},
+        {"label": "PERSON", "pattern": [{"LOWER": "john"}, {"LOWER": "smith"}]},
+    ])
+    return nlp
+
+
+class TestTokenVault(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = PiiProcessor(
+            regex_recognizers=[EmailRecognizer()],
+            spacy_recognizers=[PersonRecognizer()],
+            nlp=_make_nlp()
+        )
+
+    def test_tokenize_and_restore(self):
+        vault = TokenVault()
+        text = "Jane Doe (jane@example.com) met John Smith and Jane Doe again."
+        tokenized = self.processor.process(text, PiiAction.TOKENIZE, surrogates=vault)
+        self.assertEqual(tokenized, "[PERSON_1] ([EMAIL_1]) met [PERSON_2] and [PERSON_1] again.")
+        self.assertEqual(len(vault), 3)
+        self.assertEqual(vault.restore(tokenized), text)
+        self.assertEqual(vault.lookup("[EMAIL_1]"), "jane@example.com")
+
+    def test_restore_nested_structures(self):
+        vault = TokenVault()
+        data = {"messages": [{"content": "Hi Jane Doe"}, ("John Smith", 3)], "meta": {"id": "x"}}
+        tokenized = self.processor.process_recursive(data, PiiAction.TOKENIZE, surrogates=vault)
+        self.assertEqual(tokenized["messages"][0]["content"], "Hi [PERSON_1]")
+        response = {"answer": "[PERSON_2] and [PERSON_1] agree.", "meta": tokenized["meta"]}
+        restored = vault.restore(response)
+        self.assertEqual(restored["answer"], "John Smith and Jane Doe agree.")
+        self.assertIs(restored["meta"], data["meta"])
+        self.assertEqual(vault.restore(tokenized), data)
+
+    def test_unknown_placeholders_are_kept(self):
+        vault = TokenVault()
+        vault.tokenize("PERSON", "Jane Doe")
+        self.assertEqual(vault.restore("[PERSON_1] [PERSON_9] [REDACTED PERSON]"),
+                         "Jane Doe [PERSON_9] [REDACTED PERSON]")
+
+    def test_restore_many_placeholders(self):
+        vault = TokenVault()
+        tokens = [vault.tokenize("EMAIL", f"user{i}@example.com") for i in range(5000)]
+        response = " ".join(tokens * 4)
+        started = time.perf_counter()
+        restored = vault.restore(response)
+        self.assertLess(time.perf_counter() - started, 2.0)
+        self.assertEqual(restored.split(" ")[4999], "user4999@example.com")
+        self.assertEqual(restored.count("@example.com"), 20000)
+
+    def test_bounded(self):
+        vault = TokenVault(max_entries=2)
+        vault.tokenize("PERSON", "A")
+        vault.tokenize("PERSON", "B")
+        vault.tokenize("PERSON", "A")  # refreshes A
+        vault.tokenize("PERSON", "C")  # evicts B
+        self.assertEqual(len(vault), 2)
+        self.assertEqual(vault.evictions, 1)
+        self.assertEqual(vault.restore("[PERSON_1] [PERSON_2] [PERSON_3]"), "A [PERSON_2] C")
+        # Numbers are never reused, so an evicted placeholder is never restored wrongly
+        self.assertEqual(vault.tokenize("PERSON", "B"), "[PERSON_4]")
+        self.assertEqual(vault.tokenize("PERSON", "C"), "[PERSON_3]")
+
+    @unittest.skipIf(Fernet is None, "cryptography is not installed")
+    def test_encrypted(self):
+        vault = TokenVault(key=TokenVault.generate_key())
+        token = vault.tokenize("PERSON", "Jane Doe")
+        self.assertEqual(vault.tokenize("PERSON", "Jane Doe"), token)
+        self.assertEqual(vault.restore(f"Hello {token}"), "Hello Jane Doe")
+        self.assertNotIn("Jane Doe", repr(vault._entries) + repr(vault._tokens))
+
+    @unittest.skipIf(Fernet is None, "cryptography is not installed")
+    def test_index_key_is_derived_from_the_vault_key(self):
+        key = TokenVault.generate_key()
+        vault = TokenVault(key=key)
+        self.assertNotEqual(vault._hash_key, key)
+        self.assertEqual(vault._hash_key, TokenVault(key=key)._hash_key)
+
+    def test_tokenize_requires_a_vault(self):
+        with self.assertRaises(ValueError):
+            self.processor.process("Jane Doe", PiiAction.TOKENIZE)
+        with patch("l8e_beam.api._get_model", return_value=_make_nlp()):
+            with self.assertRaises(ValueError):
+                sanitize_pii("Jane Doe", action=PiiAction.TOKENIZE)
+            vault = TokenVault()
+            result = sanitize_pii({"q": "Ask Jane Doe"}, action=PiiAction.TOKENIZE, vault=vault)
+        self.assertEqual(result, {"q": "Ask [PERSON_1]"})
+        self.assertEqual(vault.restore(result), {"q": "Ask Jane Doe"})
+
+    def test_vault_is_only_accepted_for_tokenize(self):
+        vault = TokenVault()
+        with self.assertRaises(ValueError):
+            self.processor.process("Jane Doe", PiiAction.ANONYMIZE, surrogates=vault)
+        with patch("l8e_beam.api._get_model", return_value=_make_nlp()):
+            for action in (PiiAction.REDACT, PiiAction.ANONYMIZE, PiiAction.IGNORE):
+                with self.assertRaises(ValueError):
+                    sanitize_pii("Jane Doe", action=action, vault=vault)
+
+
+if __name__ == '__main__':
+    unittest.main()
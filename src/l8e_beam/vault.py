@@ -0,0 +1,214 @@
+# src/l8e_beam/vault.py
+
+"""
+Reversible tokenization of PII.
+
+`PiiAction.REDACT` is one-way: once `Jane Doe` became `[REDACTED PERSON]`,
+an LLM's answer that mentions the person cannot be turned back into
+something useful for the user. `PiiAction.TOKENIZE` instead replaces each
+distinct PII value with a unique placeholder such as `[PERSON_1]` and
+records the placeholder in a `TokenVault`; `TokenVault.restore` then puts
+the original values back into the model's response.
+
+- A vault belongs to one session (conversation, request, user). Tokens
+  are only unique within their vault, so do not share vaults across
+  sessions.
+- The vault is bounded: beyond `max_entries`, the least recently used
+  mappings are evicted and their placeholders are no longer restored.
+  Placeholder numbers are never reused, so an evicted placeholder can
+  never be restored to the wrong value.
+- With a `key`, originals are kept encrypted (Fernet, from the optional
+  `cryptography` package) and indexed by a keyed hash, so no PII is held
+  in memory in plain text outside of the calls that use it.
+- `restore` finds all placeholders in one linear regex scan and looks
+  each one up in a dict, so its cost does not grow with the number of
+  placeholders in the vault or in the response.
+
+Example:
+    ```python
+    from l8e_beam import PiiAction, sanitize_pii
+    from l8e_beam.vault import TokenVault
+
+    vault = TokenVault()
+    prompt = sanitize_pii("Draft a reply to Jane Doe.", action=PiiAction.TOKENIZE, vault=vault)
+    # 'Draft a reply to [PERSON_1].'
+    answer = vault.restore("Dear [PERSON_1], thank you ...")
+    # 'Dear Jane Doe, thank you ...'
+    ```
+"""
+import hashlib
+import hmac
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from l8e_beam.recognizers.pii_processor import _walk
+
+# Domain separation for the HMAC key of the index, derived from the vault key.
+_INDEX_KEY_LABEL = b"l8e_beam.vault index v1"
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:  # pragma: no cover - depends on the environment
+    Fernet = None
+
+# The shape of every placeholder, e.g. `[PERSON_12]`
+TOKEN_PATTERN = re.compile(r"\[[A-Z0-9_]+_[0-9]+\]")
+_NON_WORD = re.compile(r"[^A-Z0-9_]+")
+
+
+class _BoundedSurrogates(OrderedDict):
+    """
+    Surrogates for `PiiAction.ANONYMIZE` that forget the least recently used
+    values, the default `surrogates` of the streaming sanitizers.
+    """
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+class TokenVault:
+    """
+    A bounded, per-session store of placeholder-to-original mappings.
+
+    Pass the vault as `surrogates` (or as `vault` to `sanitize_pii`) together
+    with `PiiAction.TOKENIZE`. The same value always gets the same
+    placeholder while its mapping is in the vault. The vault is thread-safe.
+
+    Attributes:
+        max_entries (int): The maximum number of mappings kept.
+        evictions (int): Number of mappings evicted so far.
+    """
+    def __init__(self, max_entries: int = 100_000, key: Optional[bytes] = None):
+        """
+        Initializes the vault.
+
+        Args:
+            max_entries: The maximum number of mappings kept; the least
+                recently used ones are evicted beyond that.
+            key: An optional Fernet key (see `generate_key`). When given,
+                originals are stored encrypted.
+
+        Raises:
+            ImportError: If `key` is given but `cryptography` is not installed.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        if key is not None and Fernet is None:
+            raise ImportError("An encrypted TokenVault requires the 'cryptography' package.")
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._fernet = Fernet(key) if key is not None else None
+        # The index is keyed with a key derived from, not equal to, the Fernet key
+        self._hash_key = (
+            hmac.new(key, _INDEX_KEY_LABEL, hashlib.sha256).digest() if key is not None else None
+        )
+        # token -> (index key, original or its ciphertext)
+        self._entries: "OrderedDict[str, Tuple[Any, Union[str, bytes]]]" = OrderedDict()
+        # index key -> token
+        self._tokens: Dict[Any, str] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def generate_key() -> bytes:
+        """Returns a new random key for an encrypted vault."""
+        if Fernet is None:
+            raise ImportError("An encrypted TokenVault requires the 'cryptography' package.")
+        return Fernet.generate_key()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _index_key(self, pii_type: str, original: str) -> Any:
+        if self._hash_key is None:
+            return (pii_type, original)
+        message = pii_type.encode("utf-8") + b"\0" + original.encode("utf-8", "surrogatepass")
+        return hmac.new(self._hash_key, message, hashlib.sha256).digest()
+
+    def tokenize(self, pii_type: str, original: str) -> str:
+        """
+        Returns the placeholder of a PII value, creating it if needed.
+
+        Args:
+            pii_type: The type of the value, e.g. `PERSON`.
+            original: The original text.
+
+        Returns:
+            The placeholder, e.g. `[PERSON_1]`.
+        """
+        index_key = self._index_key(pii_type, original)
+        with self._lock:
+            token = self._tokens.get(index_key)
+            if token is not None:
+                self._entries.move_to_end(token)
+                return token
+            label = _NON_WORD.sub("_", pii_type.upper()) or "PII"
+            number = self._counters.get(label, 0) + 1
+            self._counters[label] = number
+            token = f"[{label}_{number}]"
+            stored = self._fernet.encrypt(original.encode("utf-8")) if self._fernet else original
+            self._entries[token] = (index_key, stored)
+            self._tokens[index_key] = token
+            while len(self._entries) > self.max_entries:
+                _, (evicted_key, _) = self._entries.popitem(last=False)
+                del self._tokens[evicted_key]
+                self.evictions += 1
+            return token
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Returns the original value of a placeholder, or `None` if it is unknown."""
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        stored = entry[1]
+        return self._fernet.decrypt(stored).decode("utf-8") if self._fernet else stored
+
+    def restore_text(self, text: str) -> str:
+        """
+        Replaces all known placeholders in a string with their originals.
+
+        Unknown or evicted placeholders are left as they are.
+        """
+        if "[" not in text:
+            return text
+
+        def replace(match: "re.Match") -> str:
+            original = self.lookup(match.group(0))
+            return match.group(0) if original is None else original
+
+        return TOKEN_PATTERN.sub(replace, text)
+
+    def restore(self, data: Any) -> Any:
+        """
+        Puts the original values back into a string or nested data structure.
+
+        Structures are traversed like `PiiProcessor.process_recursive`:
+        dicts, lists, tuples and objects with a `.dict()` method. Containers
+        without placeholders are returned as is.
+
+        Args:
+            data: The text or data to restore, e.g. an LLM response.
+
+        Returns:
+            The data with placeholders replaced by the original values.
+        """
+        return _walk(data, self.restore_text)
+
+    def clear(self):
+        """Forgets all mappings, e.g. at the end of a session."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens.clear()